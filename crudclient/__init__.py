@@ -1,22 +1,132 @@
-from .api import API
-from .client import Client, ClientConfig
-from .crud import Crud
-from .exceptions import APIError, ClientInitializationError, InvalidClientError
-from .models import ApiResponse
-from .types import JSONDict, JSONList, RawResponse
+"""
+The public API of crudclient.
+
+The names below are loaded on first access (PEP 562), so that `from crudclient import ClientConfig`
+does not import `requests` or `pydantic`. Import-heavy modules are only loaded when one of their
+names is used.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .api import API
+    from .auth import ClientCredentialsTokenProvider, OAuth2TokenProvider, RefreshTokenProvider
+    from .batch import BatchEncoder, JSONBatchEncoder
+    from .cache import EntityCache
+    from .client import Client
+    from .columnar import Columns
+    from .config import ClientConfig
+    from .crud import Crud
+    from .exceptions import APIError, BatchItemError, ClientInitializationError, ConflictError, InvalidClientError, OperationGraphError
+    from .graph import OperationGraph
+    from .models import ApiResponse
+    from .multipart import MultipartEncoder
+    from .spill import SpilledBody
+    from .store import SQLiteStore
+    from .sync import FileSyncStateStore, MemorySyncStateStore, SQLiteSyncStateStore, SyncStateStore
+    from .transport import ASGITransport, RecordingTransport, ReplayTransport, WSGITransport
+    from .types import JSONDict, JSONList, RawResponse
+    from .upload import MultipartUploadProtocol, ResumableUpload, TusUploadProtocol, UploadProtocol
+    from .validation_pool import ProcessValidationPool
+    from .write_behind import WriteBehindQueue
+
+# Module defining each public name
+_LAZY_ATTRIBUTES = {
+    "API": ".api",
+    "Client": ".client",
+    "ClientConfig": ".config",
+    "Columns": ".columnar",
+    "Crud": ".crud",
+    "EntityCache": ".cache",
+    "APIError": ".exceptions",
+    "InvalidClientError": ".exceptions",
+    "ClientInitializationError": ".exceptions",
+    "ConflictError": ".exceptions",
+    "BatchItemError": ".exceptions",
+    "OperationGraphError": ".exceptions",
+    "OperationGraph": ".graph",
+    "BatchEncoder": ".batch",
+    "JSONBatchEncoder": ".batch",
+    "OAuth2TokenProvider": ".auth",
+    "ClientCredentialsTokenProvider": ".auth",
+    "RefreshTokenProvider": ".auth",
+    "ApiResponse": ".models",
+    "JSONDict": ".types",
+    "JSONList": ".types",
+    "RawResponse": ".types",
+    "SQLiteStore": ".store",
+    "SyncStateStore": ".sync",
+    "MemorySyncStateStore": ".sync",
+    "FileSyncStateStore": ".sync",
+    "SQLiteSyncStateStore": ".sync",
+    "RecordingTransport": ".transport",
+    "ReplayTransport": ".transport",
+    "WSGITransport": ".transport",
+    "ASGITransport": ".transport",
+    "WriteBehindQueue": ".write_behind",
+    "ProcessValidationPool": ".validation_pool",
+    "SpilledBody": ".spill",
+    "MultipartEncoder": ".multipart",
+    "ResumableUpload": ".upload",
+    "UploadProtocol": ".upload",
+    "MultipartUploadProtocol": ".upload",
+    "TusUploadProtocol": ".upload",
+}
 
 __all__ = [
     "API",
     "Client",
     "ClientConfig",
+    "Columns",
     "Crud",
+    "EntityCache",
     "APIError",
     "InvalidClientError",
     "ClientInitializationError",
+    "ConflictError",
+    "BatchItemError",
+    "OperationGraphError",
+    "OperationGraph",
+    "BatchEncoder",
+    "JSONBatchEncoder",
+    "OAuth2TokenProvider",
+    "ClientCredentialsTokenProvider",
+    "RefreshTokenProvider",
     "ApiResponse",
     "JSONDict",
     "JSONList",
     "RawResponse",
+    "SQLiteStore",
+    "SyncStateStore",
+    "MemorySyncStateStore",
+    "FileSyncStateStore",
+    "SQLiteSyncStateStore",
+    "RecordingTransport",
+    "ReplayTransport",
+    "WSGITransport",
+    "ASGITransport",
+    "WriteBehindQueue",
+    "ProcessValidationPool",
+    "SpilledBody",
+    "MultipartEncoder",
+    "ResumableUpload",
+    "UploadProtocol",
+    "MultipartUploadProtocol",
+    "TusUploadProtocol",
 ]
 
 __version__ = "0.4.1"
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
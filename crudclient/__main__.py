@@ -1,31 +1,28 @@
-print("running package crudclient from __main__.py")
+"""
+Command line interface of crudclient.
 
+Usage:
+    python -m crudclient bench TARGET [options]
+"""
 
-class DualUseMethod:
-    def __init__(self, func):
-        self.func = func
+import argparse
+import sys
+from typing import List, Optional
 
-    def __get__(self, obj, cls=None):
-        if obj is None:
-            # Called on the class, behave like a class method
-            return lambda *args, **kwargs: self.func(cls, *args, **kwargs)
-        else:
-            # Called on an instance, behave like an instance method
-            return lambda *args, **kwargs: self.func(obj, *args, **kwargs)
+from . import bench
 
 
-class MyClass:
-    @DualUseMethod
-    def my_method(self, *args):
-        # You can define your function logic here
-        # self will be either the class or the instance, depending on the call
-        if isinstance(self, type):
-            return f"Called from class, args: {args}"
-        else:
-            return f"Called from instance, args: {args}"
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m crudclient")
+    subparsers = parser.add_subparsers(dest="command", required=True)
 
+    bench_parser = subparsers.add_parser("bench", help="drive a read/write workload against a target and report latencies")
+    bench.add_arguments(bench_parser)
+    bench_parser.set_defaults(func=bench.main)
 
-# Usage examples
-print(MyClass.my_method())  # As a class method
-obj = MyClass()
-print(obj.my_method(1, 2, 3))  # As an instance method
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -41,10 +41,13 @@ import logging
 from abc import ABC, abstractmethod
 from typing import Optional, Type
 
+from .cache import EntityCache
 from .client import Client, ClientConfig
 from .crud import Crud
 from .exceptions import ClientInitializationError, InvalidClientError
 from .runtime_type_checkers import assert_type
+from .store import SQLiteStore
+from .validation_pool import ProcessValidationPool
 
 # Get a logger for this module
 logger = logging.getLogger(__name__)
@@ -81,7 +84,15 @@ class API(ABC):
         except TypeError as e:
             raise InvalidClientError(message=str(e))
 
-    def __init__(self, client: Optional[Client] = None, client_config: Optional[ClientConfig] = None, **kwargs) -> None:
+    def __init__(
+        self,
+        client: Optional[Client] = None,
+        client_config: Optional[ClientConfig] = None,
+        entity_cache: Optional[EntityCache] = None,
+        persistent_store: Optional[SQLiteStore] = None,
+        validation_pool: Optional[ProcessValidationPool] = None,
+        **kwargs,
+    ) -> None:
         """
         Initializes the API class.
 
@@ -89,6 +100,12 @@ class API(ABC):
         @type client: Optional[Client]
         @param client_config: A configuration object for initializing the client. If None, default configuration will be used.
         @type client_config: Optional[ClientConfig]
+        @param entity_cache: An entity cache shared by all CRUD resources registered on this API. If None, caching is disabled.
+        @type entity_cache: Optional[EntityCache]
+        @param persistent_store: A persistent store shared by all CRUD resources registered on this API. If None, it is disabled.
+        @type persistent_store: Optional[SQLiteStore]
+        @param validation_pool: A process pool validating large lists for all CRUD resources registered on this API. If None, validation runs inline.
+        @type validation_pool: Optional[ProcessValidationPool]
         @param args: Additional positional arguments for the API class. These are stored for potential use in API subclasses.
         @type args: tuple
         @param kwargs: Additional keyword arguments for the API class. These are stored for potential use in API subclasses.
@@ -118,6 +135,17 @@ class API(ABC):
         if self.client is None:
             self._initialize_client()
 
+        # Share the entity cache, persistent store and validation pool with the CRUD resources through the client
+        if entity_cache is not None:
+            assert self.client is not None  # for mypy
+            self.client.entity_cache = entity_cache
+        if persistent_store is not None:
+            assert self.client is not None  # for mypy
+            self.client.persistent_store = persistent_store
+        if validation_pool is not None:
+            assert self.client is not None  # for mypy
+            self.client.validation_pool = validation_pool
+
         # Register CRUD resources
         self._register_endpoints()
 
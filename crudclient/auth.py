@@ -0,0 +1,249 @@
+"""
+Module `auth.py`
+================
+
+This module defines OAuth2 token providers, which fetch, cache and refresh bearer tokens for
+a `Client`. They are `requests` auth objects, so they can be returned from `ClientConfig.auth`
+or passed to `Client.with_auth`.
+
+Class `OAuth2TokenProvider`
+---------------------------
+
+The `OAuth2TokenProvider` class caches the access token in memory and refreshes it
+proactively, `refresh_margin` seconds before it expires. Refreshes are single-flight: while
+one thread requests a new token, threads holding a still valid token keep using it, and
+threads without a valid token wait for the refresh instead of requesting their own. A 401
+response invalidates the token and the request is retried once with a fresh token.
+
+Example:
+    class MyConfig(ClientConfig):
+        hostname = "https://api.example.com"
+        token_provider = ClientCredentialsTokenProvider("https://auth.example.com/token", "id", "secret")
+
+        def auth(self):
+            return self.token_provider
+
+Classes:
+    - OAuth2TokenProvider: Base class for cached, self-refreshing bearer tokens.
+    - ClientCredentialsTokenProvider: Tokens from the client credentials grant.
+    - RefreshTokenProvider: Tokens from the refresh token grant.
+"""
+
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, cast
+
+import requests
+from requests.auth import AuthBase
+
+# Get a logger for this module
+logger = logging.getLogger(__name__)
+
+
+class OAuth2TokenProvider(AuthBase, ABC):
+    """
+    Base class for OAuth2 token providers.
+
+    Subclasses implement `_grant_data` to build the token request of their grant type.
+
+    :ivar token_url: str The URL of the token endpoint.
+    :ivar client_id: Optional[str] The OAuth2 client ID.
+    :ivar client_secret: Optional[str] The OAuth2 client secret.
+    :ivar scope: Optional[str] The requested scope.
+    :ivar refresh_margin: float The number of seconds before expiry at which the token is refreshed.
+    :ivar default_expires_in: float The token lifetime assumed when the token response has no `expires_in`.
+
+    Methods:
+        token: Return a valid access token, refreshing it if needed.
+        invalidate: Discard the cached access token.
+    """
+
+    def __init__(
+        self,
+        token_url: str,
+        client_id: Optional[str] = None,
+        client_secret: Optional[str] = None,
+        scope: Optional[str] = None,
+        refresh_margin: float = 60.0,
+        default_expires_in: float = 3600.0,
+        timeout: float = 10.0,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        """
+        Initialize the token provider.
+
+        :param token_url: str The URL of the token endpoint.
+        :param client_id: Optional[str] The OAuth2 client ID.
+        :param client_secret: Optional[str] The OAuth2 client secret.
+        :param scope: Optional[str] The requested scope.
+        :param refresh_margin: float The number of seconds before expiry at which the token is refreshed.
+        :param default_expires_in: float The token lifetime assumed when the token response has no `expires_in`.
+        :param timeout: float The timeout of token requests in seconds.
+        :param session: Optional[requests.Session] The session used for token requests. Defaults to a new session.
+        """
+        self.token_url = token_url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.scope = scope
+        self.refresh_margin = refresh_margin
+        self.default_expires_in = default_expires_in
+        self.timeout = timeout
+        self._session = session or requests.Session()
+        self._lock = threading.Lock()
+        self._access_token: Optional[str] = None
+        self._expires_at = 0.0
+
+    @abstractmethod
+    def _grant_data(self) -> Dict[str, str]:
+        """
+        Build the form data of the token request.
+
+        :return: Dict[str, str] The grant type and its parameters.
+        """
+
+    def _handle_token_response(self, data: Dict[str, Any]) -> None:
+        """
+        Store the token from a token response.
+
+        :param data: Dict[str, Any] The decoded token response.
+        """
+        self._access_token = data["access_token"]
+        self._expires_at = time.monotonic() + float(data.get("expires_in") or self.default_expires_in)
+
+    def _refresh(self) -> None:
+        """
+        Request a new token. Must be called with the lock held.
+
+        :raises requests.HTTPError: If the token endpoint returns an error.
+        """
+        data = self._grant_data()
+        if self.scope:
+            data["scope"] = self.scope
+        auth = (self.client_id, self.client_secret) if self.client_id and self.client_secret else None
+        if self.client_id and not self.client_secret:
+            data["client_id"] = self.client_id
+
+        logger.debug(f"Requesting OAuth2 token from {self.token_url}")
+        response = self._session.post(self.token_url, data=data, auth=auth, timeout=self.timeout)
+        response.raise_for_status()
+        self._handle_token_response(response.json())
+
+    def token(self) -> str:
+        """
+        Return a valid access token.
+
+        Within `refresh_margin` of expiry, one caller refreshes the token while the others keep
+        using the current one. Once the token has expired, callers wait for a single refresh.
+
+        :return: str The access token.
+        :raises requests.HTTPError: If the token endpoint returns an error.
+        """
+        token, remaining = self._access_token, self._expires_at - time.monotonic()
+        if token is not None and remaining > self.refresh_margin:
+            return token
+
+        if token is not None and remaining > 0:
+            if self._lock.acquire(blocking=False):
+                try:
+                    if self._access_token == token:
+                        self._refresh()
+                except requests.RequestException as e:
+                    logger.warning(f"Proactive OAuth2 token refresh failed, using current token: {e}")
+                finally:
+                    self._lock.release()
+            return self._access_token or token
+
+        with self._lock:
+            if self._access_token is None or self._expires_at <= time.monotonic():
+                self._refresh()
+            return cast(str, self._access_token)
+
+    def invalidate(self, token: Optional[str] = None) -> None:
+        """
+        Discard the cached access token.
+
+        :param token: Optional[str] Only discard the token if it is still this one, so that a token
+            refreshed by another thread in the meantime is kept.
+        """
+        with self._lock:
+            if token is None or self._access_token == token:
+                self._access_token = None
+                self._expires_at = 0.0
+
+    def _retry_on_401(self, response: requests.Response, **kwargs: Any) -> requests.Response:
+        """
+        Response hook retrying a request once with a fresh token after a 401 response.
+        """
+        request = response.request
+        if response.status_code != 401 or getattr(request, "_oauth2_retried", False):
+            return response
+
+        self.invalidate(getattr(request, "_oauth2_token", None))
+        response.content  # consume the body so the connection can be reused
+        response.close()
+
+        retry = request.copy()
+        retry.headers["Authorization"] = f"Bearer {self.token()}"
+        retry._oauth2_retried = True  # type: ignore[attr-defined]
+        new_response = response.connection.send(retry, **kwargs)
+        new_response.history.append(response)
+        new_response.request = retry
+        return new_response
+
+    def __call__(self, request: requests.PreparedRequest) -> requests.PreparedRequest:
+        token = self.token()
+        request.headers["Authorization"] = f"Bearer {token}"
+        request._oauth2_token = token  # type: ignore[attr-defined]
+        request.register_hook("response", self._retry_on_401)
+        return request
+
+
+class ClientCredentialsTokenProvider(OAuth2TokenProvider):
+    """
+    Token provider for the OAuth2 client credentials grant.
+    """
+
+    def __init__(self, token_url: str, client_id: str, client_secret: str, **kwargs: Any) -> None:
+        """
+        Initialize the token provider.
+
+        :param token_url: str The URL of the token endpoint.
+        :param client_id: str The OAuth2 client ID.
+        :param client_secret: str The OAuth2 client secret.
+        :param kwargs: Further options of `OAuth2TokenProvider`.
+        """
+        super().__init__(token_url, client_id=client_id, client_secret=client_secret, **kwargs)
+
+    def _grant_data(self) -> Dict[str, str]:
+        return {"grant_type": "client_credentials"}
+
+
+class RefreshTokenProvider(OAuth2TokenProvider):
+    """
+    Token provider for the OAuth2 refresh token grant.
+
+    If the token endpoint rotates refresh tokens, the new refresh token is used for the next refresh.
+
+    :ivar refresh_token: str The current refresh token.
+    """
+
+    def __init__(self, token_url: str, refresh_token: str, **kwargs: Any) -> None:
+        """
+        Initialize the token provider.
+
+        :param token_url: str The URL of the token endpoint.
+        :param refresh_token: str The refresh token.
+        :param kwargs: Further options of `OAuth2TokenProvider`, e.g. client_id and client_secret.
+        """
+        super().__init__(token_url, **kwargs)
+        self.refresh_token = refresh_token
+
+    def _grant_data(self) -> Dict[str, str]:
+        return {"grant_type": "refresh_token", "refresh_token": self.refresh_token}
+
+    def _handle_token_response(self, data: Dict[str, Any]) -> None:
+        super()._handle_token_response(data)
+        if data.get("refresh_token"):
+            self.refresh_token = data["refresh_token"]
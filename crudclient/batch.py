@@ -0,0 +1,279 @@
+"""
+Module `batch.py`
+=================
+
+This module defines the batching facility of `Crud`, which packs `create`, `update` and
+`destroy` calls into size-bounded batch requests for APIs that accept several operations in
+one HTTP call.
+
+Class `Batch`
+-------------
+
+The `Batch` class collects operations, returns a `concurrent.futures.Future` for each of them
+and sends them in chunks of at most `max_size` operations when the batch is full, when
+`flush` is called and when the `with` block exits. Each future receives the result of its own
+operation, or the error the API reported for it.
+
+Class `BatchEncoder`
+--------------------
+
+The `BatchEncoder` class defines the request of a batch: its method and endpoint, how the
+operations are encoded into the request body and how the response is split back into
+per-operation results. `JSONBatchEncoder` implements a common `{"operations": [...]}` format;
+subclass `BatchEncoder` for other APIs and set it as `_batch_encoder` on the `Crud` subclass.
+
+Example:
+    with contacts_crud.batch(max_size=50) as batch:
+        futures = [batch.create(contact) for contact in incoming]
+        batch.destroy("42")
+    created = [future.result() for future in futures]
+
+Classes:
+    - BatchOperation: A single operation of a batch.
+    - BatchEncoder: Abstract base class for batch request formats.
+    - JSONBatchEncoder: Encoder for `{"operations": [...]}` batch endpoints.
+    - Batch: Collector of batched operations.
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, FrozenSet, List, Optional
+
+from .exceptions import BatchItemError
+from .types import JSONDict, RawResponse
+
+if TYPE_CHECKING:
+    from .crud import Crud
+
+# Get a logger for this module
+logger = logging.getLogger(__name__)
+
+
+class BatchOperation:
+    """
+    A single operation of a batch.
+
+    :ivar op: str The operation: "create", "update" or "destroy".
+    :ivar data: Optional[JSONDict] The dumped request data, for creates and updates.
+    :ivar resource_id: Optional[str] The resource ID, for updates and destroys.
+    :ivar future: Future The future receiving the result of the operation.
+    """
+
+    __slots__ = ("op", "data", "resource_id", "future")
+
+    def __init__(self, op: str, data: Optional[JSONDict] = None, resource_id: Optional[str] = None) -> None:
+        self.op = op
+        self.data = data
+        self.resource_id = resource_id
+        self.future: Future = Future()
+
+    def __repr__(self) -> str:
+        return f"BatchOperation(op={self.op!r}, resource_id={self.resource_id!r})"
+
+
+class BatchEncoder(ABC):
+    """
+    Abstract base class for batch request formats.
+
+    :ivar method: str The HTTP method of batch requests.
+    :ivar operations: FrozenSet[str] The operations the batch endpoint supports.
+
+    Methods:
+        endpoint: Return the endpoint of batch requests.
+        encode: Encode operations into a request body.
+        decode: Split a response into per-operation results.
+    """
+
+    method: str = "post"
+    operations: FrozenSet[str] = frozenset({"create", "update", "destroy"})
+
+    def endpoint(self, crud: "Crud", parent_id: Optional[str] = None) -> str:
+        """
+        Return the endpoint of batch requests. Defaults to the `batch` action of the resource.
+
+        :param crud: Crud The batched resource.
+        :param parent_id: Optional[str] ID of the parent resource for nested resources.
+        :return: str The endpoint path.
+        """
+        return crud._get_endpoint(parent_id, "batch")
+
+    @abstractmethod
+    def encode(self, operations: List[BatchOperation]) -> JSONDict:
+        """
+        Encode operations into a request body.
+
+        :param operations: List[BatchOperation] The operations of one request.
+        :return: JSONDict The request body.
+        """
+
+    @abstractmethod
+    def decode(self, response: RawResponse, operations: List[BatchOperation]) -> List[Any]:
+        """
+        Split a response into per-operation results.
+
+        :param response: RawResponse The response of the batch request.
+        :param operations: List[BatchOperation] The operations of the request.
+        :return: List[Any] One raw result per operation, in order. Failed operations are represented by an exception.
+        :raises ValueError: If the response does not match the operations.
+        """
+
+
+class JSONBatchEncoder(BatchEncoder):
+    """
+    Encoder for batch endpoints taking `{"operations": [{"op", "id", "data"}, ...]}` and returning
+    one result per operation, as a list or under `"results"`. Results with an `"error"` key are failures.
+    """
+
+    def encode(self, operations: List[BatchOperation]) -> JSONDict:
+        encoded = []
+        for operation in operations:
+            item: JSONDict = {"op": operation.op}
+            if operation.resource_id is not None:
+                item["id"] = operation.resource_id
+            if operation.data is not None:
+                item["data"] = operation.data
+            encoded.append(item)
+        return {"operations": encoded}
+
+    def decode(self, response: RawResponse, operations: List[BatchOperation]) -> List[Any]:
+        results = response.get("results") if isinstance(response, dict) else response
+        if not isinstance(results, list) or len(results) != len(operations):
+            raise ValueError(f"Expected {len(operations)} batch results, got: {response!r}")
+        return [
+            (
+                BatchItemError(f"Batch {operation.op} failed: {result['error']}", index=index, error=result["error"])
+                if isinstance(result, dict) and result.get("error") is not None
+                else result
+            )
+            for index, (operation, result) in enumerate(zip(operations, results))
+        ]
+
+
+class Batch:
+    """
+    Collector of batched `create`, `update` and `destroy` calls of a resource.
+
+    A batch is not thread-safe; use one batch per thread.
+
+    :ivar crud: Crud The batched resource.
+    :ivar parent_id: Optional[str] ID of the parent resource for nested resources.
+    :ivar max_size: int The maximum number of operations per request.
+    :ivar encoder: BatchEncoder The batch request format.
+
+    Methods:
+        create: Add a create operation.
+        update: Add an update operation.
+        destroy: Add a destroy operation.
+        flush: Send all pending operations.
+    """
+
+    def __init__(self, crud: "Crud", parent_id: Optional[str] = None, max_size: int = 100, encoder: Optional[BatchEncoder] = None) -> None:
+        """
+        Initialize the Batch.
+
+        :param crud: Crud The batched resource.
+        :param parent_id: Optional[str] ID of the parent resource for nested resources.
+        :param max_size: int The maximum number of operations per request.
+        :param encoder: Optional[BatchEncoder] The batch request format. Defaults to JSONBatchEncoder.
+        :raises ValueError: If max_size is smaller than 1.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self.crud = crud
+        self.parent_id = parent_id
+        self.max_size = max_size
+        self.encoder = encoder or JSONBatchEncoder()
+        self._pending: List[BatchOperation] = []
+
+    def _add(self, operation: BatchOperation) -> Future:
+        if operation.op not in self.encoder.operations:
+            raise ValueError(f"{type(self.encoder).__name__} does not support {operation.op!r}")
+        self._pending.append(operation)
+        if len(self._pending) >= self.max_size:
+            self.flush()
+        return operation.future
+
+    def create(self, data: Any) -> Future:
+        """
+        Add a create operation.
+
+        :param data: Union[JSONDict, T] The data for the new resource.
+        :return: Future The future receiving the created resource.
+        """
+        return self._add(BatchOperation("create", data=self.crud._dump_data(data)))
+
+    def update(self, resource_id: str, data: Any) -> Future:
+        """
+        Add an update operation.
+
+        :param resource_id: str The ID of the resource to update.
+        :param data: Union[JSONDict, T] The updated data.
+        :return: Future The future receiving the updated resource.
+        """
+        return self._add(BatchOperation("update", data=self.crud._dump_data(data), resource_id=resource_id))
+
+    def destroy(self, resource_id: str) -> Future:
+        """
+        Add a destroy operation.
+
+        :param resource_id: str The ID of the resource to delete.
+        :return: Future The future receiving the raw result of the deletion.
+        """
+        return self._add(BatchOperation("destroy", resource_id=resource_id))
+
+    def _resolve(self, operation: BatchOperation, result: Any) -> None:
+        if isinstance(result, BaseException):
+            operation.future.set_exception(result)
+            return
+
+        if operation.resource_id is not None:
+            self.crud._invalidate(self.crud._get_endpoint(self.parent_id, operation.resource_id), self.parent_id)
+        if operation.op == "destroy" or not isinstance(result, dict):
+            operation.future.set_result(result)
+            return
+        try:
+            model = self.crud._convert_to_model(result)
+        except Exception as e:
+            operation.future.set_exception(e)
+        else:
+            self.crud._cache_items([model], self.parent_id)
+            operation.future.set_result(model)
+
+    def flush(self) -> None:
+        """
+        Send all pending operations, in requests of at most `max_size` operations.
+
+        A failed request fails the futures of all its operations; the other requests are still sent.
+        """
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        endpoint = self.encoder.endpoint(self.crud, self.parent_id)
+        if self.crud.store is not None:
+            self.crud.store.invalidate_prefix(f"{self.crud._get_endpoint(self.parent_id)}?")
+        for start in range(0, len(pending), self.max_size):
+            operations = pending[start : start + self.max_size]
+            logger.debug(f"Sending batch of {len(operations)} operations to {endpoint}")
+            try:
+                response = getattr(self.crud.client, self.encoder.method.lower())(endpoint, json=self.encoder.encode(operations))
+                results = self.encoder.decode(response, operations)
+            except Exception as e:
+                for operation in operations:
+                    operation.future.set_exception(e)
+                continue
+            for operation, result in zip(operations, results):
+                self._resolve(operation, result)
+
+    def __enter__(self) -> "Batch":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.flush()
+            return
+        for operation in self._pending:
+            operation.future.cancel()
+        self._pending = []
@@ -0,0 +1,257 @@
+"""
+Module `bench.py`
+=================
+
+This module implements `python -m crudclient bench`, a load generator that drives a read/write
+workload against a target for a fixed duration and reports throughput, latency percentiles and
+error rates.
+
+The target is either a collection URL, e.g. `https://api.example.com/v1/contacts`, or the import
+path of a `Crud` subclass, e.g. `myapp.fiken:FikenContacts`, together with the import path of
+its `ClientConfig` subclass. Reads list the collection, following up to `--pages` pages; writes
+create the `--payload` resource. With `--replay`, responses are served from a recording made by
+`RecordingTransport`, so workloads can be benchmarked without network.
+
+Example:
+    python -m crudclient bench myapp.fiken:FikenContacts --config myapp.fiken:FikenConfig \\
+        --bind company_slug=acme-as --concurrency 16 --duration 30 --write-ratio 0.1
+
+Classes:
+    - BenchResult: Latencies and errors collected by a run.
+
+Functions:
+    - run_bench: Run a workload against a Crud resource.
+    - add_arguments: Add the bench options to an argument parser.
+    - main: Run the bench command from parsed arguments.
+"""
+
+import argparse
+import importlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from itertools import islice
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+from .client import Client
+from .config import ClientConfig
+from .crud import Crud
+from .transport import ReplayTransport
+
+
+class BenchResult:
+    """
+    Latencies and errors collected by a bench run.
+
+    :ivar duration: float The wall-clock duration of the run in seconds.
+    :ivar latencies: Dict[str, List[float]] Latencies in seconds of the successful operations, per operation.
+    :ivar errors: Counter Number of failed operations per operation and exception type.
+
+    Methods:
+        percentile: Return a latency percentile.
+        report: Format the result as a text report.
+    """
+
+    def __init__(self) -> None:
+        self.duration = 0.0
+        self.latencies: Dict[str, List[float]] = {"read": [], "write": []}
+        self.errors: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def _record(self, operation: str, latency: float, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            if error is None:
+                self.latencies[operation].append(latency)
+            else:
+                self.errors[(operation, type(error).__name__)] += 1
+
+    @property
+    def total(self) -> int:
+        """The number of operations, including failed ones."""
+        return sum(len(latencies) for latencies in self.latencies.values()) + sum(self.errors.values())
+
+    @staticmethod
+    def percentile(latencies: Sequence[float], percent: float) -> float:
+        """
+        Return a latency percentile, using the nearest-rank method.
+
+        :param latencies: Sequence[float] The latencies.
+        :param percent: float The percentile, between 0 and 100.
+        :return: float The percentile, or 0.0 if there are no latencies.
+        """
+        if not latencies:
+            return 0.0
+        ordered = sorted(latencies)
+        rank = max(1, -(-len(ordered) * percent // 100))
+        return ordered[int(rank) - 1]
+
+    def report(self) -> str:
+        """
+        Format the result as a text report.
+
+        :return: str The report.
+        """
+        total = self.total
+        error_count = sum(self.errors.values())
+        lines = [
+            f"duration     {self.duration:.1f} s",
+            f"operations   {total}",
+            f"throughput   {total / self.duration if self.duration else 0.0:.1f} ops/s",
+            f"errors       {error_count} ({100 * error_count / total if total else 0.0:.2f}%)",
+            "",
+            f"{'operation':<10}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}",
+        ]
+        all_latencies = [latency for latencies in self.latencies.values() for latency in latencies]
+        for name, latencies in [*self.latencies.items(), ("all", all_latencies)]:
+            p50, p95, p99 = (1000 * self.percentile(latencies, percent) for percent in (50, 95, 99))
+            lines.append(f"{name:<10}{len(latencies):>8}{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}")
+        for (operation, error_type), count in sorted(self.errors.items()):
+            lines.append(f"error: {operation} {error_type} x{count}")
+        return "\n".join(lines)
+
+
+def run_bench(
+    crud: Crud,
+    concurrency: int = 4,
+    duration: float = 10.0,
+    write_ratio: float = 0.0,
+    pages: int = 1,
+    params: Optional[Dict[str, Any]] = None,
+    payload: Optional[Dict[str, Any]] = None,
+    seed: Optional[int] = None,
+) -> BenchResult:
+    """
+    Run a read/write workload against a Crud resource.
+
+    :param crud: Crud The resource under test. It is shared by all worker threads.
+    :param concurrency: int The number of worker threads.
+    :param duration: float The duration of the run in seconds.
+    :param write_ratio: float The share of operations that are writes, between 0 and 1.
+    :param pages: int The number of pages each read follows.
+    :param params: Optional[Dict[str, Any]] Query parameters of the reads, e.g. the page size.
+    :param payload: Optional[Dict[str, Any]] The resource created by writes.
+    :param seed: Optional[int] Seed of the read/write mix, for reproducible runs.
+    :return: BenchResult The collected latencies and errors.
+    :raises ValueError: If write_ratio is not between 0 and 1, or writes are requested without payload.
+    """
+    if not 0 <= write_ratio <= 1:
+        raise ValueError("write_ratio must be between 0 and 1")
+    if write_ratio and payload is None:
+        raise ValueError("A payload is required for writes")
+
+    result = BenchResult()
+    deadline = time.perf_counter() + duration
+
+    def read() -> None:
+        for _ in islice(crud._iter_pages(params=params), pages):
+            pass
+
+    def write() -> None:
+        crud.create(dict(payload or {}))
+
+    def work(index: int) -> None:
+        rng = random.Random(None if seed is None else seed + index)
+        while time.perf_counter() < deadline:
+            operation, func = ("write", write) if rng.random() < write_ratio else ("read", read)
+            start = time.perf_counter()
+            try:
+                func()
+            except Exception as e:
+                result._record(operation, time.perf_counter() - start, e)
+            else:
+                result._record(operation, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=work, args=(index,), name=f"crudclient-bench-{index}") for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    result.duration = time.perf_counter() - start
+    return result
+
+
+def _import(path: str) -> Any:
+    """
+    Import an object from a `module:name` path.
+    """
+    module_name, _, name = path.partition(":")
+    if not name:
+        raise ValueError(f"Expected an import path like 'package.module:Name', got {path!r}")
+    return getattr(importlib.import_module(module_name), name)
+
+
+def _build_crud(args: argparse.Namespace) -> Crud:
+    """
+    Build the resource under test from the command line arguments.
+    """
+    transport = ReplayTransport(args.replay, latency=args.latency, jitter=args.jitter, seed=args.seed) if args.replay else None
+
+    if "://" in args.target:
+        url = urlsplit(args.target)
+        client = Client(ClientConfig(hostname=f"{url.scheme}://{url.netloc}", headers=dict(args.header)), transport=transport)
+        crud_class = type("BenchCrud", (Crud,), {"_resource_path": url.path.strip("/")})
+        return crud_class(client)
+
+    crud_class = _import(args.target)
+    if not (isinstance(crud_class, type) and issubclass(crud_class, Crud)):
+        raise ValueError(f"{args.target} is not a Crud subclass")
+    config = _import(args.config)() if args.config else ClientConfig()
+    if args.header:
+        config.headers = {**(config.headers or {}), **dict(args.header)}
+    crud = crud_class(Client(config, transport=transport))
+    return crud.bind(**dict(args.bind)) if args.bind else crud
+
+
+def _key_value(text: str) -> tuple[str, str]:
+    key, separator, value = text.partition("=")
+    if not separator:
+        raise argparse.ArgumentTypeError(f"Expected key=value, got {text!r}")
+    return key, value
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the bench options to an argument parser.
+
+    :param parser: argparse.ArgumentParser The parser of the bench command.
+    """
+    parser.add_argument("target", help="collection URL, or import path of a Crud subclass (package.module:Class)")
+    parser.add_argument("--config", help="import path of the ClientConfig subclass for a Crud target")
+    parser.add_argument("--bind", action="append", type=_key_value, default=[], metavar="NAME=VALUE", help="endpoint prefix variable")
+    parser.add_argument("--header", action="append", type=_key_value, default=[], metavar="NAME=VALUE", help="extra request header")
+    parser.add_argument("--concurrency", type=int, default=4, help="number of worker threads (default: 4)")
+    parser.add_argument("--duration", type=float, default=10.0, help="duration of the run in seconds (default: 10)")
+    parser.add_argument("--write-ratio", type=float, default=0.0, help="share of operations that are creates (default: 0)")
+    parser.add_argument("--pages", type=int, default=1, help="pages followed by each read (default: 1)")
+    parser.add_argument("--param", action="append", type=_key_value, default=[], metavar="NAME=VALUE", help="query parameter of reads")
+    parser.add_argument("--payload", type=json.loads, help="JSON body of creates")
+    parser.add_argument("--replay", metavar="PATH", help="serve responses from a RecordingTransport recording")
+    parser.add_argument("--latency", type=float, default=0.0, help="injected latency in seconds with --replay")
+    parser.add_argument("--jitter", type=float, default=0.0, help="injected jitter in seconds with --replay")
+    parser.add_argument("--seed", type=int, help="seed of the workload mix and jitter")
+
+
+def main(args: argparse.Namespace) -> int:
+    """
+    Run the bench command from parsed arguments and print the report.
+
+    :param args: argparse.Namespace The arguments added by `add_arguments`.
+    :return: int The exit code: 0 if no operation failed, 1 otherwise.
+    """
+    crud = _build_crud(args)
+    result = run_bench(
+        crud,
+        concurrency=args.concurrency,
+        duration=args.duration,
+        write_ratio=args.write_ratio,
+        pages=args.pages,
+        params=dict(args.param) or None,
+        payload=args.payload,
+        seed=args.seed,
+    )
+    print(result.report())
+    return 1 if result.errors else 0
@@ -0,0 +1,129 @@
+"""
+Module `cache.py`
+=================
+
+This module defines the EntityCache class, an in-memory identity map used by `Crud`
+to serve repeated reads of the same resource without a round trip.
+
+Class `EntityCache`
+-------------------
+
+The `EntityCache` class is a thread-safe mapping with least-recently-used eviction and
+an optional time-to-live per entry. Entries are keyed by the resource endpoint path,
+e.g. `/companies/acme/contacts/42`.
+
+Example:
+    cache = EntityCache(maxsize=10_000, ttl=300)
+    contacts = ContactsCrud(client, cache=cache)
+    contacts.read("42")  # fetched from the API
+    contacts.read("42")  # served from the cache
+
+Classes:
+    - EntityCache: LRU + TTL cache for API resources.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+
+class EntityCache:
+    """
+    Thread-safe LRU cache with optional time-to-live for API resources.
+
+    :ivar maxsize: int The maximum number of entries kept in the cache.
+    :ivar ttl: Optional[float] The number of seconds an entry stays fresh, or None for no expiry.
+
+    Methods:
+        get: Return a cached entry, or None if it is missing or expired.
+        get_etag: Return the ETag stored with a cached entry.
+        set: Store an entry, evicting the least recently used entry when full.
+        invalidate: Remove an entry.
+        clear: Remove all entries.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None) -> None:
+        """
+        Initialize the EntityCache.
+
+        :param maxsize: int The maximum number of entries kept in the cache.
+        :param ttl: Optional[float] The number of seconds an entry stays fresh, or None for no expiry.
+        :raises ValueError: If maxsize is smaller than 1.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Any, Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: str) -> Any:
+        """
+        Return a cached entry and mark it as recently used.
+
+        :param key: str The resource endpoint path.
+        :return: Any The cached entry, or None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value, _ = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def get_etag(self, key: str) -> Optional[str]:
+        """
+        Return the ETag stored with a cached entry.
+
+        :param key: str The resource endpoint path.
+        :return: Optional[str] The ETag, or None if it is unknown or the entry is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (entry[0] is not None and entry[0] <= time.monotonic()):
+                return None
+            return entry[2]
+
+    def set(self, key: str, value: Any, etag: Optional[str] = None) -> None:
+        """
+        Store an entry, evicting the least recently used entry when the cache is full.
+
+        :param key: str The resource endpoint path.
+        :param value: Any The resource to cache. None is not stored.
+        :param etag: Optional[str] The ETag of the resource, restored for conditional updates when the entry is read.
+        """
+        if value is None:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value, etag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        """
+        Remove an entry, if present.
+
+        :param key: str The resource endpoint path.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Remove all entries.
+        """
+        with self._lock:
+            self._entries.clear()
@@ -30,20 +30,41 @@ Exceptions:
     - HTTPError: Raised when an HTTP error occurs.
 """
 
+import copy
+import itertools
 import logging
-from typing import Any, Dict, Optional
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
 import requests
-from requests.adapters import HTTPAdapter
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.auth import AuthBase
 
+from .cache import EntityCache
 from .config import ClientConfig
+from .multipart import MultipartEncoder
 from .runtime_type_checkers import assert_type
-from .types import RawResponseSimple
+from .types import RawResponse, RawResponseSimple
+
+if TYPE_CHECKING:
+    # Only needed for annotations; importing them here would pull in sqlite3, multiprocessing and pydantic on every client import
+    from .spill import SpilledBody
+    from .store import SQLiteStore
+    from .upload import UploadProtocol
+    from .validation_pool import ProcessValidationPool
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 
+def _no_auth(request: requests.PreparedRequest) -> requests.PreparedRequest:
+    """Request auth that leaves the request untouched, overriding the session auth."""
+    return request
+
+
 class Client:
     """
     Client class for making API requests.
@@ -56,30 +77,41 @@ class Client:
         session (requests.Session): The HTTP session used for making requests.
         base_url (str): The base URL for the API.
         timeout (float): The timeout for requests in seconds.
+        entity_cache (Optional[EntityCache]): Entity cache shared by the Crud resources using this client, if any.
+        persistent_store (Optional[SQLiteStore]): Persistent store shared by the Crud resources using this client, if any.
+        validation_pool (Optional[ProcessValidationPool]): Process pool validating large lists for the Crud resources using this client, if any.
+        last_response (Optional[requests.Response]): The last response received by the current thread.
 
     Methods:
         _setup_auth: Sets up authentication for the requests session.
         _setup_retries_and_timeouts: Sets up retries and timeouts for the requests session.
         _set_content_type_header: Sets the 'Content-Type' header for the request.
         _prepare_data: Prepares the data for the request based on the content type.
+        _spill: Streams a large response body to a temporary file.
         _handle_response: Handles the response from the API based on the content type.
         _handle_error_response: Handles error responses from the API.
-        _request: Makes a request to the API using the requests session.
+        _request: Makes a request to the API using the requests session, retrying idempotent requests.
         get: Makes a GET request to the API.
         post: Makes a POST request to the API.
         put: Makes a PUT request to the API.
         delete: Makes a DELETE request to the API.
         patch: Makes a PATCH request to the API.
+        upload: Uploads a large file in parallel parts, resuming from a checkpoint.
+        with_auth: Returns a view of the client with its own credentials, sharing the HTTP session.
         close: Closes the HTTP session.
     """
 
-    def __init__(self, config: ClientConfig | Dict[str, Any]) -> None:
+    _retry_status_codes = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(self, config: ClientConfig | Dict[str, Any], transport: Optional[BaseAdapter] = None) -> None:
         """
         Initialize the Client.
 
         Args:
             config (Union[ClientConfig, Dict[str, Any]]): Configuration for the client.
                 Can be a ClientConfig object or a dictionary of configuration parameters.
+            transport (Optional[BaseAdapter]): Adapter sending the requests instead of the default HTTPAdapter,
+                e.g. a RecordingTransport or ReplayTransport.
 
         Raises:
             TypeError: If the provided config is neither a ClientConfig object nor a dict.
@@ -95,6 +127,12 @@ class Client:
 
         # Set up the requests session
         self.session = requests.Session()
+        self._owns_session = True
+
+        # Per-request headers and auth, set on views created by with_auth
+        self._auth_headers: Tuple[str, ...] = ()
+        self._request_headers: Dict[str, Optional[str]] = {}
+        self._request_auth: Any = None
 
         # Set up authentication
         self._setup_auth()
@@ -107,7 +145,72 @@ class Client:
         self.base_url = self.config.base_url
 
         # Set up retries and timeouts
-        self._setup_retries_and_timeouts()
+        self._setup_retries_and_timeouts(transport)
+
+        # Entity cache and persistent store shared by Crud resources, disabled by default
+        self.entity_cache: Optional[EntityCache] = None
+        self.persistent_store: Optional["SQLiteStore"] = None
+        self.validation_pool: Optional["ProcessValidationPool"] = None
+
+        # Last response per thread, for callers that need response headers such as ETag
+        self._local = threading.local()
+
+        # Thread pools for concurrent requests, created on first use and shared with views
+        self._thread_pools: Dict[str, ThreadPoolExecutor] = {}
+        self._thread_pools_lock = threading.Lock()
+
+    @property
+    def last_response(self) -> Optional[requests.Response]:
+        """
+        The last response received by the current thread, including error responses.
+        Returns:
+        - Optional[requests.Response]: The response, or None if this thread has not made a request yet.
+        """
+        return getattr(self._local, "response", None)
+
+    def with_auth(self, auth: Dict[str, str] | Tuple[str, str] | AuthBase | None = None, headers: Optional[Dict[str, str]] = None) -> "Client":
+        """
+        Return a view of the client that sends its own credentials and headers.
+
+        The view shares the HTTP session, and with it the connection pools and adapters, of this
+        client; the credentials are injected per request instead of being stored on the session.
+        Creating a view per tenant therefore keeps memory and open sockets flat as tenants grow.
+        The auth headers set up from `config.auth()` are not sent by the view. The view has no
+        entity cache or persistent store, as those are keyed by endpoint and not by tenant, and
+        closing it does not close the shared session.
+
+        Example:
+        ```python
+            tenant_client = client.with_auth({"Authorization": f"Bearer {tenant_token}"})
+            contacts = ContactsCrud(tenant_client).list()
+        ```
+
+        Parameters:
+        - auth (Union[Dict[str, str], Tuple[str, str], AuthBase, None]): Auth headers, a basic auth tuple or a requests auth object.
+        - headers (Optional[Dict[str, str]]): Additional headers for every request of the view.
+        Raises:
+        - TypeError: If auth is not a dict, a tuple of two strings or a requests auth object.
+        Returns:
+        - Client: The client view.
+        """
+        view = copy.copy(self)
+        view._owns_session = False
+        view._local = threading.local()
+        view.entity_cache = None
+        view.persistent_store = None
+        view._request_headers = {**dict.fromkeys(self._auth_headers), **self._request_headers}
+        view._request_auth = _no_auth
+
+        if isinstance(auth, dict):
+            view._request_headers.update(auth)
+        elif (isinstance(auth, tuple) and len(auth) == 2) or isinstance(auth, AuthBase):
+            view._request_auth = auth
+        elif auth is not None:
+            raise TypeError(f"Unsupported auth for a client view: {type(auth).__name__}")
+
+        if headers:
+            view._request_headers.update(headers)
+        return view
 
     # Temporary function to do auth setup
     def _setup_auth(self) -> None:
@@ -123,17 +226,20 @@ class Client:
         if auth is not None:
             if isinstance(auth, dict):
                 self.session.headers.update(auth)
+                self._auth_headers = tuple(auth)
             elif isinstance(auth, tuple) and len(auth) == 2:
                 self.session.auth = auth
+            elif isinstance(auth, AuthBase):
+                self.session.auth = auth
             elif callable(auth):
                 auth(self.session)
 
-    def _setup_retries_and_timeouts(self) -> None:
+    def _setup_retries_and_timeouts(self, transport: Optional[BaseAdapter] = None) -> None:
         """
         This function sets up the retries and timeouts for the requests session. It retrieves the number of retries and timeout duration from the config. If the number of retries is not specified in the config, it defaults to 3. If the timeout duration is not specified in the config, it defaults to 5.
-        The function creates an HTTPAdapter with the specified number of retries and mounts it to both 'http://' and 'https://' URLs in the session. It also sets the timeout duration for the session.
+        The function creates an HTTPAdapter with the specified number of retries, or uses the given transport, and mounts it to both 'http://' and 'https://' URLs in the session. It also sets the timeout duration for the session.
         Parameters:
-        - None
+        - transport (Optional[BaseAdapter]): Adapter to mount instead of the HTTPAdapter.
         Returns:
         - None
 
@@ -141,7 +247,7 @@ class Client:
         retries = self.config.retries or 3
         timeout = self.config.timeout or 5
 
-        adapter = HTTPAdapter(max_retries=retries)
+        adapter = transport if transport is not None else HTTPAdapter(max_retries=retries)
 
         # Mount the adapter to both 'http://' and 'https://' URLs in the session
         self.session.mount("http://", adapter)
@@ -166,10 +272,11 @@ class Client:
     ) -> Dict[str, Any]:
         """
         This function prepares the data for the request based on the content type. It checks if the data is JSON, files, or form data, and sets the appropriate 'Content-Type' header for the request session.
+        Files are streamed with a MultipartEncoder, whose Content-Type carries the boundary of the body and is therefore set on the request instead of the session.
         Parameters:
         - data (Optional[Dict[str, Any]]): The data to send in the request body.
         - json (Optional[Any]): The JSON data to send in the request body.
-        - files (Optional[Dict[str, Any]]): The files to send in the request body.
+        - files (Optional[Dict[str, Any]]): The files to send in the request body, as contents or (filename, content[, content_type[, headers]]) tuples. Contents may be bytes, paths, file objects or iterables of bytes.
         Returns:
         - Dict[str, Any]: A dictionary containing the data, json, or files to send in the request body.
 
@@ -178,16 +285,49 @@ class Client:
             self._set_content_type_header("application/json")
             return {"json": json}
         elif files is not None:
-            self._set_content_type_header("multipart/form-data")
-            return {"files": files, "data": data}
+            encoder = MultipartEncoder(files, data)
+            return {"data": encoder, "headers": {"Content-Type": encoder.content_type}}
         elif data is not None:
             self._set_content_type_header("application/x-www-form-urlencoded")
             return {"data": data}
         return {}
 
+    def _spill(self, response: requests.Response) -> Optional["SpilledBody"]:
+        """
+        This function reads a streamed response body. Bodies up to `config.spill_threshold` bytes are kept in memory as usual; larger bodies are written to a temporary file while they are received.
+        Parameters:
+        - response (requests.Response): The streamed response object from the API.
+        Returns:
+        - Optional[SpilledBody]: The spilled body, or None if the body was kept in memory.
+
+        """
+        threshold = self.config.spill_threshold
+        if not threshold or getattr(response, "_content_consumed", True):
+            return None
+
+        chunks = response.iter_content(chunk_size=1024 * 1024)
+        buffered = []
+        size = 0
+        for chunk in chunks:
+            buffered.append(chunk)
+            size += len(chunk)
+            if size > threshold:
+                from .spill import SpilledBody
+
+                logger.debug(f"Spilling response body of {response.url} to disk after {size} bytes")
+                return SpilledBody.from_chunks(
+                    itertools.chain(buffered, chunks),
+                    directory=self.config.spill_directory,
+                    content_type=response.headers.get("Content-Type", ""),
+                    encoding=response.encoding,
+                )
+        response._content = b"".join(buffered)
+        return None
+
     def _handle_response(self, response: requests.Response) -> RawResponseSimple:
         """
         This function handles the response from the API based on the content type. It checks the 'Content-Type' header in the response and parses the response content accordingly.
+        With `config.spill_threshold` set, larger bodies are streamed to a temporary file: JSON is parsed incrementally from the mapped file, other content is returned as a memory-mapped SpilledBody.
         Parameters:
         - response (requests.Response): The response object from the API.
         Returns:
@@ -199,6 +339,13 @@ class Client:
 
         content_type = response.headers.get("Content-Type", "")
 
+        spilled = self._spill(response)
+        if spilled is not None:
+            if "application/json" in content_type:
+                with spilled:
+                    return spilled.json()
+            return spilled
+
         if "application/json" in content_type:
             return response.json()
         elif "application/octet-stream" in content_type or "multipart/form-data" in content_type:
@@ -233,13 +380,18 @@ class Client:
 
         raise requests.RequestException(f"Request failed with status code {response.status_code}, {error_data}")
 
-    def _request(self, method: str, endpoint: str | None = None, url: str | None = None, **kwargs) -> Any:
+    def _request(
+        self, method: str, endpoint: str | None = None, url: str | None = None, idempotent: bool = False, decode: bool = True, **kwargs
+    ) -> Any:
         """
         This function makes a request to the API using the requests session. It constructs the URL for the request based on the endpoint or URL provided. It logs the request details and returns the parsed response from the API.
+        Idempotent requests (e.g. a POST carrying an idempotency key) are retried up to `config.retries` times on connection errors, timeouts and the status codes in `_retry_status_codes`, with exponential backoff starting at `config.retry_backoff`.
         Parameters:
         - method (str): The HTTP method for the request (GET, POST, PUT, DELETE, PATCH).
         - endpoint (Optional[str]): The endpoint for the request.
         - url (Optional[str]): The full URL for the request (alternative to endpoint).
+        - idempotent (bool): Whether the request is safe to retry regardless of its method.
+        - decode (bool): Whether to parse the response content. If False, the raw body is returned as bytes, e.g. for the validation pool.
         - kwargs: Additional keyword arguments for the request.
         Raises:
         - ValueError: If neither 'endpoint' nor 'url' is provided
@@ -255,8 +407,34 @@ class Client:
             url = f"{self.config.base_url}/{endpoint.lstrip('/')}"
 
         logger.debug(f"Making {method} request to {url} with params: {kwargs}")
-        response: requests.Response = self.session.request(method, url, **kwargs)
-        return self._handle_response(response)
+
+        # Credentials of views are added after logging, to keep them out of the logs
+        if self._request_headers:
+            kwargs["headers"] = {**self._request_headers, **(kwargs.get("headers") or {})}
+        if self._request_auth is not None:
+            kwargs.setdefault("auth", self._request_auth)
+        if self.config.spill_threshold:
+            kwargs.setdefault("stream", True)
+
+        attempts = (self.config.retries or 0) + 1 if idempotent else 1
+        for attempt in range(1, attempts + 1):
+            try:
+                response: requests.Response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == attempts:
+                    raise
+                logger.warning(f"Retrying idempotent {method} request to {url} after error (attempt {attempt}/{attempts}): {e}")
+            else:
+                if attempt == attempts or response.status_code not in self._retry_status_codes:
+                    self._local.response = response
+                    if decode:
+                        return self._handle_response(response)
+                    if not response.ok:
+                        self._handle_error_response(response)
+                    return response.content
+                logger.warning(f"Retrying idempotent {method} request to {url} after status {response.status_code} (attempt {attempt}/{attempts})")
+                response.close()
+            time.sleep((self.config.retry_backoff or 0) * 2 ** (attempt - 1))
 
     def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> RawResponseSimple:
         """
@@ -280,6 +458,8 @@ class Client:
         data: Optional[Dict[str, Any]] = None,
         json: Optional[Any] = None,
         files: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        idempotent: bool = False,
     ) -> RawResponseSimple:
         """
         Make a POST request to the API.
@@ -287,7 +467,9 @@ class Client:
         - endpoint (str): The endpoint for the request.
         - data (Optional[Dict[str, Any]]): The form data to send in the request body.
         - json (Optional[Any]): The JSON data to send in the request body.
-        - files (Optional[Dict[str, Any]]): The files to send in the request body.
+        - files (Optional[Dict[str, Any]]): The files to send in the request body, streamed as multipart/form-data.
+        - headers (Optional[Dict[str, str]]): Additional headers for this request, e.g. an idempotency key.
+        - idempotent (bool): Whether the request is safe to retry, e.g. because it carries an idempotency key.
         Raises:
         - ValueError: If neither 'data' nor 'json' is provided.
         - requests.RequestException: If the request fails with an error response.
@@ -297,7 +479,9 @@ class Client:
         """
 
         prepared_data = self._prepare_data(data, json, files)
-        return self._request("POST", endpoint, **prepared_data)
+        if headers:
+            prepared_data["headers"] = {**prepared_data.get("headers", {}), **headers}
+        return self._request("POST", endpoint, idempotent=idempotent, **prepared_data)
 
     def put(
         self,
@@ -305,6 +489,7 @@ class Client:
         data: Optional[Dict[str, Any]] = None,
         json: Optional[Any] = None,
         files: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
     ) -> RawResponseSimple:
         """
         Make a PUT request to the API.
@@ -312,7 +497,8 @@ class Client:
         - endpoint (str): The endpoint for the request.
         - data (Optional[Dict[str, Any]]): The form data to send in the request body.
         - json (Optional[Any]): The JSON data to send in the request body.
-        - files (Optional[Dict[str, Any]]): The files to send in the request body.
+        - files (Optional[Dict[str, Any]]): The files to send in the request body, streamed as multipart/form-data.
+        - headers (Optional[Dict[str, str]]): Additional headers for this request, e.g. If-Match.
         Raises:
         - ValueError: If neither 'data' nor 'json' is provided.
         - requests.RequestException: If the request fails with an error response.
@@ -321,6 +507,8 @@ class Client:
         - RawResponseSimple: The parsed response content from the API.
         """
         prepared_data = self._prepare_data(data, json, files)
+        if headers:
+            prepared_data["headers"] = {**prepared_data.get("headers", {}), **headers}
         return self._request("PUT", endpoint, **prepared_data)
 
     def delete(self, endpoint: str, **kwargs: Any) -> RawResponseSimple:
@@ -343,6 +531,7 @@ class Client:
         data: Optional[Dict[str, Any]] = None,
         json: Optional[Any] = None,
         files: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
     ) -> RawResponseSimple:
         """
         Make a PATCH request to the API.
@@ -350,7 +539,8 @@ class Client:
         - endpoint (str): The endpoint for the request.
         - data (Optional[Dict[str, Any]]): The form data to send in the request body.
         - json (Optional[Any]): The JSON data to send in the request body.
-        - files (Optional[Dict[str, Any]]): The files to send in the request body.
+        - files (Optional[Dict[str, Any]]): The files to send in the request body, streamed as multipart/form-data.
+        - headers (Optional[Dict[str, str]]): Additional headers for this request, e.g. If-Match.
         Raises:
         - ValueError: If neither 'data' nor 'json' is provided.
         - requests.RequestException: If the request fails with an error response.
@@ -359,15 +549,64 @@ class Client:
         - RawResponseSimple: The parsed response content from the API.
         """
         prepared_data = self._prepare_data(data, json, files)
+        if headers:
+            prepared_data["headers"] = {**prepared_data.get("headers", {}), **headers}
         return self._request("PATCH", endpoint, **prepared_data)
 
+    def upload(
+        self,
+        endpoint: str,
+        path: str | os.PathLike,
+        protocol: Optional["UploadProtocol"] = None,
+        checkpoint: Optional[str | os.PathLike] = None,
+        **kwargs: Any,
+    ) -> RawResponse:
+        """
+        Upload a large file in parts, uploaded in parallel and retried on transient failures.
+        Parameters:
+        - endpoint (str): The endpoint of uploads.
+        - path (Union[str, os.PathLike]): The path of the file.
+        - protocol (Optional[UploadProtocol]): The upload protocol. Defaults to MultipartUploadProtocol.
+        - checkpoint (Optional[Union[str, os.PathLike]]): The path of a checkpoint file recording the progress. An interrupted upload resumes when it is run again with the same checkpoint.
+        - kwargs: Further arguments of ResumableUpload, e.g. part_size and max_workers.
+        Raises:
+        - requests.RequestException: If a part fails after its retries, or the upload cannot be started or completed.
+        Returns:
+        - RawResponse: The response of the API to completing the upload.
+        """
+        from .upload import ResumableUpload
+
+        return ResumableUpload(self, endpoint, path, protocol=protocol, checkpoint=checkpoint, **kwargs).run()
+
+    def _thread_pool(self, name: str, max_workers: int) -> ThreadPoolExecutor:
+        """
+        This function returns a thread pool for concurrent requests, e.g. the child requests of `Crud.list(include=...)`. The pool is created on first use, reused by later calls and shared with views created by `with_auth`.
+        Parameters:
+        - name (str): The purpose of the pool, used in the thread names.
+        - max_workers (int): The maximum number of threads of the pool.
+        Returns:
+        - ThreadPoolExecutor: The thread pool.
+        """
+        key = f"{name}-{max_workers}"
+        with self._thread_pools_lock:
+            pool = self._thread_pools.get(key)
+            if pool is None:
+                pool = self._thread_pools[key] = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"crudclient-{name}")
+            return pool
+
     def close(self) -> None:
         """
-        Close the HTTP session.
+        Close the HTTP session and shut down the thread pools. Closing a view created by `with_auth` does nothing, as the session is shared.
         Parameters:
         - None
         Returns:
         - None
         """
+        if not self._owns_session:
+            return
+        with self._thread_pools_lock:
+            for pool in self._thread_pools.values():
+                pool.shutdown(wait=False)
+            self._thread_pools.clear()
         self.session.close()
         logger.debug("Session closed.")
@@ -0,0 +1,272 @@
+"""
+Module `columnar.py`
+====================
+
+This module defines the Columns class, a column-oriented container for list responses.
+Rows are decoded straight into one list per field, typed from the datamodel field
+annotations, without building a pydantic object per row.
+
+Class `Columns`
+---------------
+
+The `Columns` class maps field names to column values and converts cheaply to NumPy
+arrays or an Arrow table. NumPy and PyArrow are optional; they are only imported
+when the matching conversion is requested.
+
+Example:
+    columns = users_crud.list_columns()
+    frame = pandas.DataFrame(columns.to_dict())
+    table = columns.to_arrow()
+
+Classes:
+    - Columns: Column-oriented list response.
+
+Functions:
+    - build_columns: Decode a list of JSON rows into Columns.
+"""
+
+import datetime
+import decimal
+from functools import lru_cache
+from types import UnionType
+from typing import Annotated, Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter
+
+from .types import JSONList
+
+
+class Columns:
+    """
+    Column-oriented container for list responses.
+
+    :ivar columns: Dict[str, List[Any]] The column values, keyed by field name.
+    :ivar types: Dict[str, Any] The field annotation of each column, or `Any` when untyped.
+
+    Methods:
+        to_dict: Return the columns as a plain dictionary of lists.
+        to_numpy: Convert the columns to NumPy arrays.
+        to_arrow: Convert the columns to a PyArrow table.
+        concat: Concatenate several Columns with the same fields.
+    """
+
+    def __init__(self, columns: Dict[str, List[Any]], types: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Initialize the Columns.
+
+        :param columns: Dict[str, List[Any]] The column values, keyed by field name.
+        :param types: Optional[Dict[str, Any]] The field annotation of each column.
+        """
+        self.columns = columns
+        self.types = types if types is not None else {name: Any for name in columns}
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), []))
+
+    def __getitem__(self, name: str) -> List[Any]:
+        return self.columns[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.columns)
+
+    def __repr__(self) -> str:
+        return f"Columns(fields={list(self.columns)!r}, rows={len(self)})"
+
+    def to_dict(self) -> Dict[str, List[Any]]:
+        """
+        Return the columns as a plain dictionary of lists.
+
+        The result can be passed directly to `pandas.DataFrame`.
+
+        :return: Dict[str, List[Any]] The column values, keyed by field name.
+        """
+        return dict(self.columns)
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        Convert the columns to NumPy arrays.
+
+        Columns annotated as int, float or bool without missing values get a native dtype;
+        all other columns are stored as object arrays.
+
+        :return: Dict[str, numpy.ndarray] One array per field.
+        :raises ImportError: If NumPy is not installed.
+        """
+        try:
+            import numpy
+        except ImportError as e:
+            raise ImportError("Columns.to_numpy requires numpy to be installed.") from e
+
+        arrays = {}
+        for name, values in self.columns.items():
+            dtype: str | type | None = _NUMPY_DTYPES.get(_unwrap_optional(self.types.get(name, Any)))
+            if dtype is None or any(value is None for value in values):
+                dtype = object
+            arrays[name] = numpy.array(values, dtype=dtype)
+        return arrays
+
+    def to_arrow(self) -> Any:
+        """
+        Convert the columns to a PyArrow table.
+
+        Columns with a known scalar annotation get an explicit Arrow type, other columns are inferred.
+
+        :return: pyarrow.Table The columns as an Arrow table.
+        :raises ImportError: If PyArrow is not installed.
+        """
+        try:
+            import pyarrow
+        except ImportError as e:
+            raise ImportError("Columns.to_arrow requires pyarrow to be installed.") from e
+
+        arrow_types = {
+            int: pyarrow.int64(),
+            float: pyarrow.float64(),
+            bool: pyarrow.bool_(),
+            str: pyarrow.string(),
+            bytes: pyarrow.binary(),
+            datetime.datetime: pyarrow.timestamp("us"),
+            datetime.date: pyarrow.date32(),
+        }
+        arrays = []
+        for name, values in self.columns.items():
+            arrow_type = arrow_types.get(_unwrap_optional(self.types.get(name, Any)))
+            arrays.append(pyarrow.array(values, type=arrow_type))
+        return pyarrow.Table.from_arrays(arrays, names=list(self.columns))
+
+    @classmethod
+    def concat(cls, batches: Iterable["Columns"]) -> "Columns":
+        """
+        Concatenate several Columns with the same fields.
+
+        :param batches: Iterable[Columns] The batches to concatenate, e.g. the pages from `Crud.iter_all_columns`.
+        :return: Columns The concatenated columns.
+        """
+        columns: Dict[str, List[Any]] = {}
+        types: Dict[str, Any] = {}
+        for batch in batches:
+            for name, values in batch.columns.items():
+                columns.setdefault(name, []).extend(values)
+            types.update(batch.types)
+        return cls(columns, types)
+
+
+_NUMPY_DTYPES: Dict[Any, str] = {int: "int64", float: "float64", bool: "bool"}
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    """
+    Return the inner type of `Optional[X]` / `X | None`, or the annotation unchanged.
+    """
+    if get_origin(annotation) in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+_PLAIN_TYPES = (int, float, bool, str, bytes, decimal.Decimal)
+
+
+def _is_plain_column(annotation: Any, values: List[Any]) -> bool:
+    """
+    Check whether a column already holds exactly the annotated JSON scalar type, so validation can be skipped.
+    """
+    plain = _unwrap_optional(annotation)
+    if plain not in _PLAIN_TYPES:
+        return False
+    nullable = plain is not annotation
+    return all(type(value) is plain or (nullable and value is None) for value in values)
+
+
+class _ColumnSpec(NamedTuple):
+    """
+    The compiled layout of one column.
+    """
+
+    name: str
+    key: str
+    default: Any
+    default_factory: Optional[Callable[..., Any]]
+    annotation: Any
+    adapter: TypeAdapter
+    constrained: bool
+
+    def value(self, row: Dict[str, Any]) -> Any:
+        if self.key in row:
+            return row[self.key]
+        # A new default per row, so rows never share a mutable default
+        return self.default_factory() if self.default_factory is not None else self.default
+
+
+@lru_cache(maxsize=None)
+def _column_specs(datamodel: Type[BaseModel]) -> Tuple[_ColumnSpec, ...]:
+    """
+    Compile the column layout of a datamodel once.
+
+    The list adapter of each column keeps the constraints and validators of the field
+    (`Field(gt=...)`, `Annotated` metadata), so columns accept exactly what `list` accepts.
+    """
+    specs = []
+    for name, field in datamodel.model_fields.items():
+        key = field.validation_alias if isinstance(field.validation_alias, str) else field.alias or name
+        default_factory = None if field.is_required() else field.default_factory
+        default = None if field.is_required() or default_factory is not None else field.default
+        annotation = Annotated[(field.annotation, *field.metadata)] if field.metadata else field.annotation
+        adapter: TypeAdapter = TypeAdapter(List[annotation])  # type: ignore[valid-type]
+        specs.append(_ColumnSpec(name, key, default, default_factory, field.annotation, adapter, bool(field.metadata)))
+    return tuple(specs)
+
+
+@lru_cache(maxsize=None)
+def _row_adapter(datamodel: Type[BaseModel]) -> Optional[TypeAdapter]:
+    """
+    Return a list adapter of the datamodel if it has field or model validators, or default factories
+    taking the validated data, which only work on whole rows.
+    """
+    decorators = datamodel.__pydantic_decorators__
+    takes_data = any(getattr(field, "default_factory_takes_data", False) for field in datamodel.model_fields.values())
+    if not (decorators.field_validators or decorators.model_validators or takes_data):
+        return None
+    return TypeAdapter(List[datamodel])  # type: ignore[valid-type]
+
+
+def build_columns(datamodel: Optional[Type[Any]], rows: JSONList) -> Columns:
+    """
+    Decode a list of JSON rows into Columns.
+
+    With a pydantic datamodel, one column is built per model field and validated as a whole
+    against the field annotation and constraints; unconstrained columns of plain JSON scalars
+    that already have the annotated type skip validation. Datamodels with `field_validator`s or
+    `model_validator`s are validated row by row, as `list` does, and then split into columns.
+    Without a datamodel, the columns are the union of the row keys.
+
+    :param datamodel: Optional[Type] The datamodel describing the rows.
+    :param rows: JSONList The rows from the API response.
+    :return: Columns The decoded columns.
+    :raises pydantic.ValidationError: If a column does not match its annotation.
+    """
+    if datamodel is None or not (isinstance(datamodel, type) and issubclass(datamodel, BaseModel)):
+        columns: Dict[str, List[Any]] = {}
+        for index, row in enumerate(rows):
+            for key in row:
+                if key not in columns:
+                    columns[key] = [None] * index
+            for key, values in columns.items():
+                values.append(row.get(key))
+        return Columns(columns)
+
+    specs = _column_specs(datamodel)
+    annotations = {spec.name: spec.annotation for spec in specs}
+    row_adapter = _row_adapter(datamodel)
+    if row_adapter is not None:
+        models = row_adapter.validate_python(rows)
+        return Columns({spec.name: [getattr(model, spec.name) for model in models] for spec in specs}, annotations)
+
+    columns = {}
+    for spec in specs:
+        values = [spec.value(row) for row in rows]
+        if spec.constrained or not _is_plain_column(spec.annotation, values):
+            values = spec.adapter.validate_python(values)
+        columns[spec.name] = values
+    return Columns(columns, annotations)
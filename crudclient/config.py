@@ -27,6 +27,10 @@ class ClientConfig:
     :ivar headers: Optional[Dict[str, str]] Additional headers to include in the requests.
     :ivar timeout: Optional[float] The timeout duration for requests.
     :ivar retries: Optional[int] The number of retries to attempt for requests.
+    :ivar retry_backoff: Optional[float] The base delay in seconds between retries of idempotent requests, doubled on every attempt.
+    :ivar spill_threshold: Optional[int] Response bodies larger than this many bytes are streamed to a temporary file instead of memory.
+    :ivar spill_directory: Optional[str] The directory of spilled response bodies. Defaults to the system temp directory.
+    :ivar sync_state_path: Optional[str] The SQLite database of the default `Crud.sync` state store. Defaults to `crudclient/sync_state.db` in the user state directory.
 
     Methods:
         base_url: Returns the base URL for the API.
@@ -40,6 +44,10 @@ class ClientConfig:
     headers: Optional[Dict[str, str]] = None
     timeout: Optional[float] = 10.0
     retries: Optional[int] = 3
+    retry_backoff: Optional[float] = 0.5
+    spill_threshold: Optional[int] = None
+    spill_directory: Optional[str] = None
+    sync_state_path: Optional[str] = None
 
     @property
     def base_url(self) -> str:
@@ -60,6 +68,10 @@ class ClientConfig:
         headers: Optional[Dict[str, str]] = None,
         timeout: Optional[float] = None,
         retries: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+        spill_threshold: Optional[int] = None,
+        spill_directory: Optional[str] = None,
+        sync_state_path: Optional[str] = None,
     ) -> None:
         """
         Initializes the ClientConfig object with the provided values.
@@ -70,6 +82,10 @@ class ClientConfig:
         :param headers: Optional[Dict[str, str]] Additional headers to include in the requests.
         :param timeout: Optional[float] The timeout duration for requests.
         :param retries: Optional[int] The number of retries to attempt for requests.
+        :param retry_backoff: Optional[float] The base delay in seconds between retries of idempotent requests.
+        :param spill_threshold: Optional[int] Response bodies larger than this many bytes are streamed to a temporary file. None disables spilling.
+        :param spill_directory: Optional[str] The directory of spilled response bodies. Defaults to the system temp directory.
+        :param sync_state_path: Optional[str] The SQLite database of the default `Crud.sync` state store.
         :return: None
         """
         self.hostname = hostname or self.hostname
@@ -78,13 +94,18 @@ class ClientConfig:
         self.headers = headers or self.headers or {}
         self.timeout = timeout or self.timeout
         self.retries = retries or self.retries
+        self.retry_backoff = retry_backoff if retry_backoff is not None else self.retry_backoff
+        self.spill_threshold = spill_threshold or self.spill_threshold
+        self.spill_directory = spill_directory or self.spill_directory
+        self.sync_state_path = sync_state_path or self.sync_state_path
 
     def auth(self) -> Dict[str, Any]:
         """
         Returns the authentication header.
 
         By default, this method returns a Bearer token authentication header.
-        Overwrite this method if a different authentication method is needed.
+        Overwrite this method if a different authentication method is needed, e.g. to return
+        an `OAuth2TokenProvider` for expiring tokens.
 
         :return: Dict[str, Any] The authentication header.
         """
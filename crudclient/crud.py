@@ -32,21 +32,41 @@ Type Variables:
     - T: The type of the data model used for the resource.
 """
 
+import copy
+import datetime
 import logging
-from typing import Any, Generic, List, Literal, Optional, Protocol, Type, TypeAlias, TypeVar, cast
-from urllib.parse import urljoin
-
+import os
+import uuid
+from concurrent.futures import Future
+from string import Formatter
+from types import MappingProxyType
+from typing import Any, Dict, Generic, Iterable, Iterator, List, Literal, Mapping, Optional, Protocol, Type, TypeAlias, TypeVar, cast
+from urllib.parse import urlencode, urljoin
+
+import requests
+from pydantic import BaseModel, TypeAdapter
+
+from .batch import Batch, BatchEncoder
+from .cache import EntityCache
 from .client import Client
-from .models import ApiResponse
+from .columnar import Columns, build_columns
+from .exceptions import ConflictError
+from .models import ApiResponse, partial_model
 from .runtime_type_checkers import assert_type
+from .spill import SpilledBody
+from .store import SQLiteStore
+from .sync import SQLiteSyncStateStore, SyncStateStore
 from .types import JSONDict, JSONList, RawResponse
+from .upload import MultipartUploadProtocol, ResumableUpload, UploadProtocol
+from .validation_pool import ProcessValidationPool
+from .write_behind import WriteBehindQueue
 
 # Get a logger for this module
 logger = logging.getLogger(__name__)
 
 
 class ModelDumpable(Protocol):
-    def model_dump(self) -> dict: ...  # noqa: E704
+    def model_dump(self, *, exclude_unset: bool = ...) -> dict: ...  # noqa: E704
 
 
 T = TypeVar("T", bound=ModelDumpable)
@@ -56,6 +76,26 @@ CrudType: TypeAlias = Type[CrudInstance]
 ApiResponseInstance: TypeAlias = "ApiResponse[Any]"
 ApiResponseType: TypeAlias = Type[ApiResponseInstance]
 PathArgs: TypeAlias = str | int | None
+CRUD_METHODS = ("list", "create", "read", "update", "partial_update", "destroy")
+
+
+def _mark_value(mark: str) -> Any:
+    """
+    Parse a sync high-water mark into a comparable value: a number, a UTC-aware datetime, or the string itself.
+    """
+    try:
+        return int(mark)
+    except ValueError:
+        pass
+    try:
+        return float(mark)
+    except ValueError:
+        pass
+    try:
+        parsed = datetime.datetime.fromisoformat(mark.replace("Z", "+00:00"))
+    except ValueError:
+        return mark
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=datetime.timezone.utc)
 
 
 class Crud(Generic[T]):
@@ -70,16 +110,38 @@ class Crud(Generic[T]):
     :ivar _methods: List[str] List of allowed methods for this resource.
     :ivar _api_response_model: Optional[Type[ApiResponse]] Custom API response model, if any.
     :ivar _list_return_keys: List[str] Possible keys for list data in API responses.
+    :ivar _id_field: str The field holding the resource ID, used to key the entity cache.
+    :ivar _fields_param: str The query parameter used to request a subset of fields.
+    :ivar _sync_param: str The query parameter used by `sync` to request changes since the high-water mark.
+    :ivar _sync_field: str The item field holding the timestamp or cursor tracked by `sync`.
+    :ivar _sync_state_store: Optional[SyncStateStore] Default state store for `sync`. Falls back to an SQLite store at `config.sync_state_path`.
+    :ivar _idempotency_keys: bool Send a generated idempotency key with every `create` and POST `custom_action`.
+    :ivar _idempotency_key_header: str The header carrying the idempotency key.
+    :ivar _etag_cache_size: int The maximum number of ETags remembered for `If-Match` on updates.
+    :ivar _include_max_workers: int The maximum number of concurrent child requests made by `list(include=...)`.
+    :ivar _batch_encoder: Optional[BatchEncoder] The batch request format used by `batch`. Defaults to JSONBatchEncoder.
+    :ivar _batch_size: int The default maximum number of operations per batch request.
+    :ivar _upload_protocol: Optional[UploadProtocol] The upload protocol used by `upload`. Defaults to MultipartUploadProtocol.
+    :ivar _endpoint_prefix_template: Optional[tuple[str, ...]] Endpoint prefix segments with `{name}` placeholders filled by `bind`.
 
     Methods:
         __init__: Initialize the CRUD resource.
+        bind: Return a view of the resource with endpoint prefix variables bound.
         list: Retrieve a list of resources.
+        iter_all: Iterate over all resources, following pagination links.
+        list_columns: Retrieve a list of resources as columns.
+        iter_all_columns: Iterate over all pages of resources as columns.
+        sync: Iterate over the resources changed since the last sync.
         create: Create a new resource.
         read: Retrieve a specific resource.
+        get_etag: Get the ETag captured for a resource.
         update: Update a specific resource.
         partial_update: Partially update a specific resource.
         destroy: Delete a specific resource.
         custom_action: Perform a custom action on the resource.
+        write_behind: Create a background queue for writes to the resource.
+        batch: Collect writes into batch requests.
+        upload: Upload a large file in parallel, resumable parts.
     """
 
     _resource_path: str = ""
@@ -88,16 +150,85 @@ class Crud(Generic[T]):
     _methods: List[str] = ["list", "create", "read", "update", "partial_update", "destroy"]
     _api_response_model: Optional[ApiResponseType] = None
     _list_return_keys: List[str] = ["data", "results", "items"]
+    _id_field: str = "id"
+    _fields_param: str = "fields"
+    _sync_param: str = "updated_since"
+    _sync_field: str = "updated_at"
+    _sync_state_store: Optional[SyncStateStore] = None
+    _idempotency_keys: bool = False
+    _idempotency_key_header: str = "Idempotency-Key"
+    _etag_cache_size: int = 1024
+    _include_max_workers: int = 8
+    _batch_encoder: Optional[BatchEncoder] = None
+    _batch_size: int = 100
+    _upload_protocol: Optional[UploadProtocol] = None
+    _endpoint_prefix_template: Optional[tuple[str, ...]] = None
+    _bindings: Mapping[str, Any] = MappingProxyType({})
+
+    # Compiled per class by __init_subclass__
+    _allowed_methods: frozenset = frozenset(CRUD_METHODS)
+    _endpoint_prefix_fields: frozenset = frozenset()
+    _list_keys: tuple[str, ...] = ("data", "results", "items")
+    _list_adapter: Optional[TypeAdapter] = None
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """
+        Compile the resource metadata once per class.
+
+        Disallowed methods are set to None on the class, and methods allowed again by a subclass
+        are restored from the nearest base class that implements them, so that constructing an
+        instance does no per-method work.
+        """
+        super().__init_subclass__(**kwargs)
+
+        cls._allowed_methods = frozenset(CRUD_METHODS if cls._methods == ["*"] else cls._methods)
+        for method in CRUD_METHODS:
+            if method not in cls._allowed_methods:
+                setattr(cls, method, None)
+            elif getattr(cls, method) is None:
+                setattr(cls, method, next(vars(base)[method] for base in cls.__mro__ if vars(base).get(method) is not None))
+
+        cls._list_keys = tuple(cls._list_return_keys)
+        cls._endpoint_prefix_fields = frozenset(
+            name for segment in cls._endpoint_prefix_template or () for _, name, _, _ in Formatter().parse(segment) if name
+        )
+        if isinstance(cls._datamodel, type) and issubclass(cls._datamodel, BaseModel):
+            cls._list_adapter = TypeAdapter(List[cls._datamodel])  # type: ignore[name-defined]
+        else:
+            cls._list_adapter = None
+
+        logger.debug(
+            (
+                f"Compiled CRUD resource {cls.__name__} for {cls._datamodel.__name__ if cls._datamodel else None} "
+                f"with parent: {cls._parent_resource.__name__ if cls._parent_resource else None} "
+                f"and methods: {cls._methods}"
+            )
+        )
 
-    def __init__(self, client: Client, parent: Optional["Crud"] = None):
+    def __init__(
+        self,
+        client: Client,
+        parent: Optional["Crud"] = None,
+        cache: Optional[EntityCache] = None,
+        store: Optional[SQLiteStore] = None,
+        validation_pool: Optional[ProcessValidationPool] = None,
+    ):
         """
         Initialize the CRUD resource.
 
         :param client: Client An instance of the API client.
         :param parent: Optional[Crud] Optional parent Crud instance for nested resources.
+        :param cache: Optional[EntityCache] Entity cache for this resource. Defaults to the client's entity cache, if any.
+        :param store: Optional[SQLiteStore] Persistent store for this resource. Defaults to the client's persistent store, if any.
+        :param validation_pool: Optional[ProcessValidationPool] Process pool validating large lists. Defaults to the client's pool, if any.
         """
 
         self.client = client
+        self.cache: Optional[EntityCache] = cache if cache is not None else client.entity_cache
+        self.store: Optional[SQLiteStore] = store if store is not None else client.persistent_store
+        self.validation_pool = validation_pool if validation_pool is not None else client.validation_pool
+        # Created here, not on first use, so that views made by `bind` share it with this resource
+        self._etags = EntityCache(maxsize=self._etag_cache_size)
         self._parent = None
 
         # makes parent obligatory if _parent_resource is set, and sets the parent
@@ -109,25 +240,12 @@ class Crud(Generic[T]):
         else:
             assert parent is None, "Parent must be None, as _parent_resource is not set"
 
-        # Remove methods that are not allowed
-        if self._methods != ["*"]:
-            for method in ["list", "create", "read", "update", "partial_update", "destroy"]:
-                if method not in self._methods:
-                    setattr(self, method, None)
-
-        logger.debug(
-            (
-                f"Initializing CRUD resource for {self._datamodel.__name__ if self._datamodel else None} "
-                f"with parent: {self._parent_resource.__name__ if self._parent_resource else None} "
-                f"and methods: {self._methods}"
-            )
-        )
-
     def _endpoint_prefix(self) -> tuple[str | None] | List[str | None]:
         """
         Construct the endpoint prefix.
 
-        This method can be overridden in subclasses to provide a custom endpoint prefix.
+        By default, the segments of `_endpoint_prefix_template` are filled with the variables bound
+        by `bind`. This method can be overridden in subclasses to provide a custom endpoint prefix.
 
         Example:
         ```python
@@ -137,8 +255,78 @@ class Crud(Generic[T]):
         ```
 
         :return: List[str] The endpoint prefix segments.
+        :raises ValueError: If a variable of the template is not bound.
+        """
+        if self._endpoint_prefix_template is None:
+            return [""]
+        try:
+            return [segment.format_map(self._bindings) for segment in self._endpoint_prefix_template]
+        except KeyError as e:
+            raise ValueError(f"{type(self).__name__} is not bound to {e.args[0]!r}, use bind({e.args[0]}=...)") from None
+
+    def bind(self, **bindings: Any) -> "Crud[T]":
+        """
+        Return a view of the resource with endpoint prefix variables bound.
+
+        The view shares the client, caches and compiled class metadata of this resource and is
+        never mutated afterwards, so views for different tenants can be used from concurrent
+        threads. Binding a view again returns a new view with the variables merged. The parent
+        resource chain is bound too, so nested resources can be bound through the child alone,
+        and child resources attached as attributes are rebound to the view, so
+        `list(include=...)` works on it.
+
+        Example:
+        ```python
+            class FikenCrud(Crud[T]):
+                _endpoint_prefix_template = ("companies", "{company_slug}")
+
+            contacts = api.contacts.bind(company_slug="acme-as").list()
+        ```
+
+        :param bindings: The values of the `{name}` placeholders of `_endpoint_prefix_template`.
+        :return: Crud[T] The bound view.
+        :raises ValueError: If a variable is not a placeholder of the template of this resource or its parents.
+        """
+        unknown = set(bindings) - self._bindable_fields()
+        if unknown:
+            raise ValueError(f"{type(self).__name__} has no endpoint prefix variables {sorted(unknown)}")
+
+        view = self._bound_view(bindings)
+        if self._parent is not None:
+            parent_bindings = {name: value for name, value in bindings.items() if name in self._parent._bindable_fields()}
+            if parent_bindings:
+                view._parent = self._parent.bind(**parent_bindings)
+                # Let the parent view hold this view as its child, not a second copy of it
+                for name, value in vars(self._parent).items():
+                    if value is self:
+                        setattr(view._parent, name, view)
+        return view
+
+    def _bound_view(self, bindings: Mapping[str, Any]) -> "Crud[T]":
+        """
+        Copy the resource with the variables bound, along with the child resources attached to it as attributes.
+
+        :param bindings: Mapping[str, Any] The variables to bind.
+        :return: Crud[T] The bound view.
+        """
+        view = copy.copy(self)
+        view._bindings = MappingProxyType({**self._bindings, **bindings})
+        for name, value in vars(self).items():
+            if isinstance(value, Crud) and value._parent is self:
+                child = value._bound_view(bindings)
+                child._parent = view
+                setattr(view, name, child)
+        return view
+
+    def _bindable_fields(self) -> frozenset:
+        """
+        Collect the endpoint prefix variables of this resource and its parent resource chain.
+
+        :return: frozenset The variable names `bind` accepts.
         """
-        return [""]
+        if self._parent is None:
+            return self._endpoint_prefix_fields
+        return self._endpoint_prefix_fields | self._parent._bindable_fields()
 
     def _get_endpoint(self, *args: Optional[str | int], parent_args: Optional[tuple] = None) -> str:
         """
@@ -182,17 +370,18 @@ class Crud(Generic[T]):
         :return: Union[JSONDict, JSONList] The validated data.
         :raises ValueError: If the response is an unexpected type.
         """
-        if isinstance(data, (bytes, str)):
+        if isinstance(data, (bytes, str, SpilledBody)):
             msg = f"Unexpected response type: {type(data)} response: {data!r}"
             logger.exception(msg)
             raise ValueError(msg)
         return data
 
-    def _convert_to_model(self, data: RawResponse) -> T | JSONDict:
+    def _convert_to_model(self, data: RawResponse, datamodel: Optional[Type[Any]] = None) -> T | JSONDict:
         """
         Convert the API response to the datamodel type.
 
         :param data: RawResponse The API response data.
+        :param datamodel: Optional[Type] The model to validate into. Defaults to `_datamodel`.
         :return: Union[T, JSONDict] An instance of the datamodel or a dictionary.
         :raises ValueError: If the response is an unexpected type.
         """
@@ -201,55 +390,274 @@ class Crud(Generic[T]):
         if not isinstance(validated_data, dict):
             raise ValueError(f"Unexpected response type: {type(validated_data)}")
 
-        return self._datamodel(**validated_data) if self._datamodel else validated_data
+        datamodel = datamodel or self._datamodel
+        return datamodel(**validated_data) if datamodel else validated_data
 
-    def _convert_to_list_model(self, data: JSONList) -> List[T] | JSONList:
+    def _convert_to_list_model(self, data: JSONList, datamodel: Optional[Type[Any]] = None) -> List[T] | JSONList:
         """
         Convert the API response to a list of datamodel types.
 
         :param data: JSONList The API response data.
+        :param datamodel: Optional[Type] The model to validate into. Defaults to `_datamodel`.
         :return: Union[List[T], JSONList] A list of instances of the datamodel or the original list.
         :raises ValueError: If the response is an unexpected type.
         """
-        if not self._datamodel:
+        if datamodel is None and self._list_adapter is not None and isinstance(data, list):
+            return self._list_adapter.validate_python(data)
+
+        datamodel = datamodel or self._datamodel
+        if not datamodel:
             return data
 
         if isinstance(data, list):
-            return [self._datamodel(**item) for item in data]
+            return [datamodel(**item) for item in data]
 
         raise ValueError(f"Unexpected response type: {type(data)}")
 
-    def _validate_list_return(self, data: RawResponse) -> JSONList | List[T] | ApiResponse:
+    def _fields_datamodel(self, fields: Optional[List[str]]) -> Optional[Type[Any]]:
+        """
+        Get the model to validate into when only a subset of fields is requested.
+
+        :param fields: Optional[List[str]] The requested field names or aliases.
+        :return: Optional[Type] A cached partial model of `_datamodel`, or None if no subset is requested or no datamodel is set.
+        """
+        if not fields or self._datamodel is None or not issubclass(self._datamodel, BaseModel):
+            return None
+        return partial_model(self._datamodel, tuple(sorted(fields)))
+
+    def _fields_params(self, params: Optional[JSONDict], fields: Optional[List[str]]) -> Optional[JSONDict]:
+        """
+        Add the projection query parameter for the requested fields.
+
+        :param params: Optional[JSONDict] The query parameters.
+        :param fields: Optional[List[str]] The requested field names or aliases.
+        :return: Optional[JSONDict] The query parameters including the projection, if any.
+        """
+        if not fields:
+            return params
+        return {**(params or {}), self._fields_param: ",".join(fields)}
+
+    def _extract_list_data(self, data: JSONDict | JSONList) -> JSONList:
+        """
+        Extract the list of items from a validated list response.
+
+        :param data: Union[JSONDict, JSONList] The validated API response data.
+        :return: JSONList The raw list items.
+        :raises ValueError: If the response format is unexpected.
+        """
+        if isinstance(data, dict):
+            for key in self._list_keys:
+                if key in data:
+                    return data[key]
+            raise ValueError(f"Unexpected response format: {data}")
+
+        if isinstance(data, list):
+            return data
+
+        raise ValueError(f"Unexpected response format: {data}")
+
+    def _validate_list_return(self, data: RawResponse, datamodel: Optional[Type[Any]] = None) -> JSONList | List[T] | ApiResponse:
         """
         Validate and convert the list response data.
 
         :param data: RawResponse The API response data.
+        :param datamodel: Optional[Type] A partial model to validate the items into instead of `_datamodel`.
+            With `_api_response_model` set, the response is validated as `ApiResponse[datamodel]`.
         :return: Union[JSONList, List[T], ApiResponse] Validated and converted list data.
         :raises ValueError: If the response format is unexpected.
         """
         validated_data: JSONList | JSONDict = self._validate_response(data)
 
-        if isinstance(validated_data, dict):
-            if self._api_response_model:
-                value: ApiResponse = self._api_response_model(**validated_data)
-                return value
+        if isinstance(validated_data, dict) and self._api_response_model:
+            response_model = ApiResponse[datamodel] if datamodel else self._api_response_model  # type: ignore[valid-type]
+            value: ApiResponse = response_model(**validated_data)
+            return value
 
-            for key in self._list_return_keys:
-                if key in validated_data:
-                    return cast(JSONList | List[T], self._convert_to_list_model(validated_data[key]))
-            else:
-                raise ValueError(f"Unexpected response format: {validated_data}")
+        return cast(JSONList | List[T], self._convert_to_list_model(self._extract_list_data(validated_data), datamodel))
 
-        if isinstance(validated_data, list):
-            return cast(JSONList | List[T], self._convert_to_list_model(validated_data))
+    def _next_page_url(self, data: JSONDict | JSONList) -> Optional[str]:
+        """
+        Get the URL of the next page from a validated list response.
 
-        raise ValueError(f"Unexpected response format: {validated_data}")
+        Supports a `{"next": "<url>"}` key and `{"_links": {"next": {"href": "<url>"}}}` as used by `ApiResponse`.
+        Override this method in subclasses for other pagination schemes.
 
-    def _dump_data(self, data: JSONDict | T | None) -> JSONDict:
+        :param data: Union[JSONDict, JSONList] The validated API response data.
+        :return: Optional[str] The URL of the next page, or None if this is the last page.
+        """
+        if not isinstance(data, dict):
+            return None
+
+        next_link = data.get("next")
+        if next_link is None:
+            links = data.get("_links") or data.get("links")
+            next_link = links.get("next") if isinstance(links, dict) else None
+        if isinstance(next_link, dict):
+            next_link = next_link.get("href")
+        return next_link if isinstance(next_link, str) and next_link else None
+
+    def _iter_pages(self, parent_id: Optional[str] = None, params: Optional[JSONDict] = None) -> Iterator[JSONDict | JSONList]:
+        """
+        Iterate over the validated pages of a list response, following pagination links.
+
+        :param parent_id: Optional[str] ID of the parent resource for nested resources.
+        :param params: Optional[JSONDict] Optional query parameters for the first page.
+        :return: Iterator[Union[JSONDict, JSONList]] The validated pages.
+        """
+        endpoint = self._get_endpoint(parent_id)
+        response = self.client.get(endpoint, params=params)
+        while True:
+            page = self._validate_response(response)
+            yield page
+
+            next_url = self._next_page_url(page)
+            if next_url is None:
+                return
+            response = self.client._request("GET", url=urljoin(f"{self.client.base_url}/", next_url))
+
+    def _get_item_id(self, item: Any) -> Optional[str | int]:
+        """
+        Get the resource ID of an item, using `_id_field`.
+
+        :param item: Any A datamodel instance or dictionary.
+        :return: Optional[Union[str, int]] The resource ID, or None if the item has none.
+        """
+        if isinstance(item, dict):
+            return item.get(self._id_field)
+        return getattr(item, self._id_field, None)
+
+    def _cache_items(self, items: Iterable[Any], parent_id: Optional[str] = None, parent_args: Optional[tuple] = None) -> None:
+        """
+        Store items in the entity cache, keyed by their resource endpoint.
+
+        :param items: Iterable[Any] The datamodel instances or dictionaries to cache.
+        :param parent_id: Optional[str] ID of the parent resource for nested resources.
+        :param parent_args: Optional[tuple] Path segments for the parent resource.
+        """
+        if self.cache is None:
+            return
+        for item in items:
+            item_id = self._get_item_id(item)
+            if isinstance(item_id, (str, int)):
+                self.cache.set(self._get_endpoint(parent_id, item_id, parent_args=parent_args), item)
+
+    def _list_store_key(self, endpoint: str, params: Optional[JSONDict] = None) -> str:
+        """
+        Build the persistent store key of a list request.
+
+        :param endpoint: str The list endpoint path.
+        :param params: Optional[JSONDict] The query parameters.
+        :return: str The endpoint path followed by `?` and the sorted query string.
+        """
+        return f"{endpoint}?{urlencode(sorted((params or {}).items()), doseq=True)}"
+
+    def _store_items(self, items: JSONList, parent_id: Optional[str] = None, parent_args: Optional[tuple] = None) -> None:
+        """
+        Store raw items in the persistent store, keyed by their resource endpoint.
+
+        :param items: JSONList The raw items from an API response.
+        :param parent_id: Optional[str] ID of the parent resource for nested resources.
+        :param parent_args: Optional[tuple] Path segments for the parent resource.
+        """
+        if self.store is None:
+            return
+        for item in items:
+            item_id = item.get(self._id_field) if isinstance(item, dict) else None
+            if isinstance(item_id, (str, int)):
+                self.store.set(self._get_endpoint(parent_id, item_id, parent_args=parent_args), item)
+
+    def _invalidate(self, endpoint: str, parent_id: Optional[str] = None) -> None:
+        """
+        Remove a resource from the entity cache and the persistent store, along with the stored lists it may appear in.
+
+        :param endpoint: str The resource endpoint path.
+        :param parent_id: Optional[str] ID of the parent resource for nested resources.
+        """
+        if self.cache is not None:
+            self.cache.invalidate(endpoint)
+        if self.store is not None:
+            self.store.invalidate(endpoint)
+            self.store.invalidate_prefix(f"{self._get_endpoint(parent_id)}?")
+
+    def _idempotency_headers(self, idempotency_key: Optional[str] = None) -> Optional[Dict[str, str]]:
+        """
+        Build the idempotency key header for a POST request.
+
+        The key is generated once per call, so it stays the same for every retry of that call.
+
+        :param idempotency_key: Optional[str] An explicit key. If None, a key is generated when `_idempotency_keys` is set.
+        :return: Optional[Dict[str, str]] The header, or None if no key is used.
+        """
+        if idempotency_key is None:
+            if not self._idempotency_keys:
+                return None
+            idempotency_key = str(uuid.uuid4())
+        return {self._idempotency_key_header: idempotency_key}
+
+    def _remember_etag(self, endpoint: str) -> Optional[str]:
+        """
+        Remember the ETag of the last response for conditional updates of a resource.
+
+        :param endpoint: str The resource endpoint path.
+        :return: Optional[str] The ETag, or None if the response had none.
+        """
+        response = self.client.last_response
+        etag = response.headers.get("ETag") if response is not None else None
+        self._restore_etag(endpoint, etag)
+        return etag or None
+
+    def _restore_etag(self, endpoint: str, etag: Optional[str]) -> None:
+        """
+        Remember the ETag stored with a cached or stored resource, so updates of it are conditional too.
+
+        :param endpoint: str The resource endpoint path.
+        :param etag: Optional[str] The ETag, or None if it is unknown.
+        """
+        if etag:
+            self._etags.set(endpoint, etag)
+        else:
+            self._etags.invalidate(endpoint)
+
+    def _known_etag(self, endpoint: str) -> Optional[str]:
+        """
+        Get the remembered ETag of a resource.
+
+        :param endpoint: str The resource endpoint path.
+        :return: Optional[str] The ETag, or None if it is unknown.
+        """
+        return self._etags.get(endpoint)
+
+    def _conditional_write(self, method: str, endpoint: str, data: JSONDict, if_match: Optional[str] = None) -> RawResponse:
+        """
+        Send a PUT or PATCH request with `If-Match` set to the known ETag of the resource.
+
+        :param method: str The client method to use, "put" or "patch".
+        :param endpoint: str The resource endpoint path.
+        :param data: JSONDict The request body.
+        :param if_match: Optional[str] An explicit ETag. Defaults to the ETag captured by the last read or write.
+        :return: RawResponse The API response.
+        :raises ConflictError: If the API answers 412 Precondition Failed.
+        """
+        etag = if_match or self._known_etag(endpoint)
+        if etag is None:
+            response = getattr(self.client, method)(endpoint, json=data)
+        else:
+            try:
+                response = getattr(self.client, method)(endpoint, json=data, headers={"If-Match": etag})
+            except requests.HTTPError as e:
+                if e.response is not None and e.response.status_code == 412:
+                    self._restore_etag(endpoint, None)
+                    raise ConflictError(f"{endpoint} was modified since ETag {etag} was read", etag=etag) from e
+                raise
+        self._remember_etag(endpoint)
+        return response
+
+    def _dump_data(self, data: JSONDict | T | None, exclude_unset: bool = False) -> JSONDict:
         """
         Dump the data model to a JSON-serializable dictionary.
 
         :param data: JSONDict | T The data to dump.
+        :param exclude_unset: bool Leave out model fields that were not explicitly set. Ignored for dictionaries.
         :return: JSONDict The dumped data.
         """
         if data is None:
@@ -261,71 +669,476 @@ class Crud(Generic[T]):
         assert isinstance(data, self._datamodel), f"Data must be an instance of {self._datamodel}, dict or None"
         assert hasattr(data, "model_dump"), f"{self._datamodel} must have a model_dump method"
 
+        if exclude_unset:
+            return data.model_dump(exclude_unset=True)
         return data.model_dump()
 
-    def list(self, parent_id: Optional[str] = None, params: Optional[JSONDict] = None) -> JSONList | List[T] | ApiResponse:
+    def _diff_data(self, original: JSONDict, modified: JSONDict) -> JSONDict:
+        """
+        Compute the fields of `modified` that differ from `original`.
+
+        Nested values are compared as a whole, so a changed nested object is sent in full.
+
+        :param original: JSONDict The dumped original data.
+        :param modified: JSONDict The dumped modified data.
+        :return: JSONDict The changed fields and their new values.
+        """
+        return {key: value for key, value in modified.items() if key not in original or original[key] != value}
+
+    def _fetch_list(
+        self,
+        parent_id: Optional[str] = None,
+        params: Optional[JSONDict] = None,
+        fields: Optional[List[str]] = None,
+        parent_args: Optional[tuple] = None,
+    ) -> JSONList | List[T] | ApiResponse:
+        """
+        Fetch and convert a list of resources, using the persistent store and entity cache when set.
+
+        :param parent_id: Optional[str] ID of the parent resource for nested resources.
+        :param params: Optional[JSONDict] Optional query parameters.
+        :param fields: Optional[List[str]] Only request these fields, validating into a partial datamodel.
+        :param parent_args: Optional[tuple] Path segments for the parent resource.
+        :return: Union[JSONList, List[T], ApiResponse] List of resources.
+        """
+        endpoint = self._get_endpoint(parent_id, parent_args=parent_args)
+        if fields:
+            partial_response = self.client.get(endpoint, params=self._fields_params(params, fields))
+            return self._validate_list_return(partial_response, self._fields_datamodel(fields))
+
+        if self._uses_validation_pool():
+            assert self.validation_pool is not None  # for mypy
+            content = self.client._request("GET", endpoint, params=params, decode=False)
+            items = cast(List[T], self.validation_pool.validate(self._datamodel, content, self._list_keys))  # type: ignore[arg-type]
+            self._cache_items(items, parent_id, parent_args)
+            return items
+
+        store_key = self._list_store_key(endpoint, params)
+        stored: Optional[JSONDict | JSONList] = self.store.get(store_key) if self.store is not None else None
+        response: RawResponse = stored if stored is not None else self.client.get(endpoint, params=params)
+
+        result = self._validate_list_return(response)
+        self._cache_items(result.data if isinstance(result, ApiResponse) else result, parent_id, parent_args)
+        if self.store is not None and stored is None:
+            self.store.set(store_key, response)
+            self._store_items(self._extract_list_data(self._validate_response(response)), parent_id, parent_args)
+        return result
+
+    def _list_for_parent(self, parent_id: str | int) -> List[Any]:
+        """
+        List the children of one parent item, for `list(include=...)` on the parent resource.
+
+        Goes through the same persistent store and entity cache as `list`.
+
+        :param parent_id: Union[str, int] The ID of the parent item.
+        :return: List[Any] The child items.
+        """
+        result = self._fetch_list(parent_args=(parent_id,))
+        return result.data if isinstance(result, ApiResponse) else result
+
+    def _resolve_includes(self, include: List[str]) -> List[tuple[str, "Crud"]]:
+        """
+        Look up the child resources named in `include`.
+
+        :param include: List[str] Attribute names of child Crud instances whose parent is this resource.
+        :return: List[tuple[str, Crud]] The names and child resources.
+        :raises ValueError: If a name is not a child resource of this resource, or its list method is not allowed.
+        """
+        children = []
+        for name in include:
+            child = getattr(self, name, None)
+            if not isinstance(child, Crud) or child._parent is not self:
+                raise ValueError(f"{name!r} is not a child resource of {type(self).__name__}")
+            if child.list is None:
+                raise ValueError(f"{type(child).__name__} does not allow list")
+            children.append((name, child))
+        return children
+
+    def _attach_include(self, item: Any, name: str, children: List[Any]) -> None:
+        """
+        Attach child items to a parent item.
+
+        :param item: Any The parent item, a dictionary or datamodel instance.
+        :param name: str The include name, used as key or attribute.
+        :param children: List[Any] The child items.
+        :raises ValueError: If the datamodel has no field for the children and does not allow extra fields.
+        """
+        if isinstance(item, dict):
+            item[name] = children
+        elif isinstance(item, BaseModel) and (name in type(item).model_fields or type(item).model_config.get("extra") == "allow"):
+            setattr(item, name, children)
+        else:
+            raise ValueError(f"Cannot attach {name!r} to {type(item).__name__}, add a {name!r} field to the datamodel")
+
+    def _load_includes(self, items: List[Any], children: List[tuple[str, "Crud"]]) -> List[Any]:
+        """
+        Fetch the children of every item concurrently and attach them to copies of the items.
+
+        The items are copied, as they may be shared through the entity cache. The requests run in
+        the client's include thread pool, which is reused across calls.
+
+        :param items: List[Any] The parent items.
+        :param children: List[tuple[str, Crud]] The names and child resources to load.
+        :return: List[Any] Shallow copies of the items with the children attached.
+        :raises ValueError: If an item has no ID.
+        """
+        item_ids = []
+        for item in items:
+            item_id = self._get_item_id(item)
+            if not isinstance(item_id, (str, int)):
+                raise ValueError(f"Cannot load includes for an item without {self._id_field!r}")
+            item_ids.append(item_id)
+        if not items:
+            return []
+
+        executor = self.client._thread_pool("include", self._include_max_workers)
+        futures = [[(name, executor.submit(child._list_for_parent, item_id)) for name, child in children] for item_id in item_ids]
+        copies = []
+        for item, item_futures in zip(items, futures):
+            copied = dict(item) if isinstance(item, dict) else item.model_copy() if isinstance(item, BaseModel) else item
+            for name, future in item_futures:
+                self._attach_include(copied, name, future.result())
+            copies.append(copied)
+        return copies
+
+    def list(
+        self,
+        parent_id: Optional[str] = None,
+        params: Optional[JSONDict] = None,
+        fields: Optional[List[str]] = None,
+        include: Optional[List[str]] = None,
+    ) -> JSONList | List[T] | ApiResponse:
         """
         Retrieve a list of resources.
 
+        With `include`, the children of every listed item are fetched concurrently (up to
+        `_include_max_workers` requests at a time) from the named child resources and attached
+        to copies of the items, as a key for dictionaries or as an attribute for datamodels.
+        Cached items are left unchanged.
+
+        Example:
+        ```python
+            template_types.data_fields = OneflowDataFields(client, parent=template_types)
+            types = template_types.list(include=["data_fields"])
+        ```
+
         :param parent_id: Optional[str] ID of the parent resource for nested resources.
         :param params: Optional[JSONDict] Optional query parameters.
+        :param fields: Optional[List[str]] Only request these fields, validating into a partial datamodel.
+        :param include: Optional[List[str]] Attribute names of child resources to load for every item.
         :return: Union[JSONList, List[T], ApiResponse] List of resources.
+        :raises ValueError: If an include is not a child resource of this resource.
+        """
+        children = self._resolve_includes(include) if include else []
+        result = self._fetch_list(parent_id, params, fields)
+        if not children:
+            return result
+        if isinstance(result, ApiResponse):
+            result.data = self._load_includes(result.data, children)
+            return result
+        return self._load_includes(result, children)
+
+    def iter_all(
+        self, parent_id: Optional[str] = None, params: Optional[JSONDict] = None, fields: Optional[List[str]] = None
+    ) -> Iterator[T | JSONDict]:
+        """
+        Iterate over all resources, following pagination links.
+
+        :param parent_id: Optional[str] ID of the parent resource for nested resources.
+        :param params: Optional[JSONDict] Optional query parameters for the first page.
+        :param fields: Optional[List[str]] Only request these fields, validating into a partial datamodel.
+        :return: Iterator[Union[T, JSONDict]] The resources of every page.
+        """
+        if self._uses_validation_pool() and not fields:
+            yield from self._iter_all_pooled(parent_id, params)
+            return
+
+        datamodel = self._fields_datamodel(fields)
+        for page in self._iter_pages(parent_id, self._fields_params(params, fields)):
+            items = self._convert_to_list_model(self._extract_list_data(page), datamodel)
+            if not fields:
+                self._cache_items(items, parent_id)
+            yield from items
+
+    def _uses_validation_pool(self) -> bool:
+        """
+        Check whether list responses are validated in the validation pool.
+
+        The pool receives the raw bodies, so it is not used with `_api_response_model` or a persistent
+        store, which need the decoded response.
+
+        :return: bool True if the pool is used.
+        """
+        return self.validation_pool is not None and self._list_adapter is not None and not self._api_response_model and self.store is None
+
+    def _iter_all_pooled(self, parent_id: Optional[str] = None, params: Optional[JSONDict] = None) -> Iterator[T]:
+        """
+        Iterate over all resources, validating every page in chunks in the validation pool.
+
+        The raw body of every page goes to the pool without being decoded in this thread. Once the
+        pagination links of a page are known, the next page is fetched while the rest of the page
+        is validated.
+
+        :param parent_id: Optional[str] ID of the parent resource for nested resources.
+        :param params: Optional[JSONDict] Optional query parameters for the first page.
+        :return: Iterator[T] The resources of every page.
+        """
+        assert self.validation_pool is not None  # for mypy
+        content = self.client._request("GET", self._get_endpoint(parent_id), params=params, decode=False)
+        while True:
+            futures = self.validation_pool.submit(self._datamodel, content, self._list_keys)  # type: ignore[arg-type]
+            envelope = ProcessValidationPool.envelope(futures)
+            next_url = self._next_page_url(envelope) if envelope is not None else None
+            if next_url is not None:
+                content = self.client._request("GET", url=urljoin(f"{self.client.base_url}/", next_url), decode=False)
+            yield from self._gather_page(futures, parent_id)
+            if next_url is None:
+                return
+
+    def _gather_page(self, futures: List[Future], parent_id: Optional[str] = None) -> List[T]:
+        """
+        Wait for a page validated in the validation pool and cache its items.
+
+        :param futures: List[Future] The futures returned by the validation pool.
+        :param parent_id: Optional[str] ID of the parent resource for nested resources.
+        :return: List[T] The resources of the page.
+        """
+        items = cast(List[T], ProcessValidationPool.gather(futures))
+        self._cache_items(items, parent_id)
+        return items
+
+    def list_columns(self, parent_id: Optional[str] = None, params: Optional[JSONDict] = None) -> Columns:
+        """
+        Retrieve a list of resources as columns, without building a datamodel instance per row.
+
+        :param parent_id: Optional[str] ID of the parent resource for nested resources.
+        :param params: Optional[JSONDict] Optional query parameters.
+        :return: Columns One column per datamodel field.
         """
         endpoint = self._get_endpoint(parent_id)
         response = self.client.get(endpoint, params=params)
-        return self._validate_list_return(response)
+        return build_columns(self._datamodel, self._extract_list_data(self._validate_response(response)))
+
+    def iter_all_columns(self, parent_id: Optional[str] = None, params: Optional[JSONDict] = None) -> Iterator[Columns]:
+        """
+        Iterate over all pages of resources as columns, following pagination links.
+
+        Use `Columns.concat` to merge the pages into a single Columns.
+
+        :param parent_id: Optional[str] ID of the parent resource for nested resources.
+        :param params: Optional[JSONDict] Optional query parameters for the first page.
+        :return: Iterator[Columns] One Columns per page.
+        """
+        for page in self._iter_pages(parent_id, params):
+            yield build_columns(self._datamodel, self._extract_list_data(page))
+
+    def _sync_high_water_mark(self, item: T | JSONDict, current: Optional[str]) -> Optional[str]:
+        """
+        Compute the high-water mark after seeing an item.
+
+        The default implementation keeps the largest value of `_sync_field`, in its original representation.
+        Numbers, numeric strings and ISO 8601 timestamps are compared as values, so `"10"` follows `"9"`
+        and timestamps with different offsets or fraction precision are ordered in time.
+        Override this method in subclasses to track a cursor or another ordering.
+
+        :param item: Union[T, JSONDict] The item returned by the API.
+        :param current: Optional[str] The mark before this item.
+        :return: Optional[str] The mark after this item.
+        """
+        value = item.get(self._sync_field) if isinstance(item, dict) else getattr(item, self._sync_field, None)
+        if value is None:
+            return current
+        mark = value.isoformat() if hasattr(value, "isoformat") else str(value)
+        if current is None:
+            return mark
+        new_value, current_value = _mark_value(mark), _mark_value(current)
+        try:
+            newer = new_value > current_value
+        except TypeError:
+            # Marks of different kinds, e.g. a number and a timestamp
+            newer = mark > current
+        return mark if newer else current
 
-    def create(self, data: JSONDict | T, parent_id: Optional[str] = None) -> T | JSONDict:
+    def _default_sync_state_store(self) -> SyncStateStore:
+        """
+        Return the SQLite state store used by `sync` when none is given or configured.
+        """
+        path = self.client.config.sync_state_path
+        if path is None:
+            state_home = os.environ.get("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+            path = os.path.join(state_home, "crudclient", "sync_state.db")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        return SQLiteSyncStateStore(path)
+
+    def sync(
+        self, state_store: Optional[SyncStateStore] = None, parent_id: Optional[str] = None, params: Optional[JSONDict] = None
+    ) -> Iterator[T | JSONDict]:
+        """
+        Iterate over the resources changed since the last sync, to be applied as upserts.
+
+        The stored high-water mark is sent as the `_sync_param` query parameter. The new mark is
+        only stored once every page has been consumed, so an interrupted sync is repeated in full.
+
+        :param state_store: Optional[SyncStateStore] Where to keep the high-water mark. Defaults to `_sync_state_store`, then to an
+            SQLite store at `config.sync_state_path`, whose marks are keyed by the full URL so several APIs can share it.
+        :param parent_id: Optional[str] ID of the parent resource for nested resources.
+        :param params: Optional[JSONDict] Optional additional query parameters.
+        :return: Iterator[Union[T, JSONDict]] The changed resources.
+        """
+        key = self._get_endpoint(parent_id)
+        state_store = state_store or self._sync_state_store
+        if state_store is None:
+            state_store = self._default_sync_state_store()
+            key = f"{self.client.base_url}{key}"
+
+        mark = state_store.get(key)
+        sync_params = dict(params or {})
+        if mark is not None:
+            sync_params[self._sync_param] = mark
+
+        new_mark = mark
+        for item in self.iter_all(parent_id, sync_params):
+            new_mark = self._sync_high_water_mark(item, new_mark)
+            yield item
+
+        if new_mark is not None and new_mark != mark:
+            logger.debug(f"Storing sync high-water mark for {key}: {new_mark}")
+            state_store.set(key, new_mark)
+
+    def create(self, data: JSONDict | T, parent_id: Optional[str] = None, idempotency_key: Optional[str] = None) -> T | JSONDict:
         """
         Create a new resource.
 
+        Requests carrying an idempotency key are retried on transient failures.
+
         :param data: JSONDict The data for the new resource.
         :param parent_id: Optional[str] ID of the parent resource for nested resources.
+        :param idempotency_key: Optional[str] Idempotency key for this call. Generated if None and `_idempotency_keys` is set.
         :return: Union[T, JSONDict] The created resource.
         """
         endpoint = self._get_endpoint(parent_id)
         converted_data: JSONDict = self._dump_data(data)
-        response = self.client.post(endpoint, json=converted_data)
-        return self._convert_to_model(response)
-
-    def read(self, resource_id: str, parent_id: Optional[str] = None) -> T | JSONDict:
+        headers = self._idempotency_headers(idempotency_key)
+        if headers:
+            response = self.client.post(endpoint, json=converted_data, headers=headers, idempotent=True)
+        else:
+            response = self.client.post(endpoint, json=converted_data)
+        result = self._convert_to_model(response)
+        self._cache_items([result], parent_id)
+        if self.store is not None:
+            self.store.invalidate_prefix(f"{endpoint}?")
+            self._store_items([cast(JSONDict, response)], parent_id)
+        return result
+
+    def read(self, resource_id: str, parent_id: Optional[str] = None, fields: Optional[List[str]] = None) -> T | JSONDict:
         """
         Retrieve a specific resource.
 
+        Requests for a subset of fields bypass the entity cache.
+
         :param resource_id: str The ID of the resource to retrieve.
         :param parent_id: Optional[str] ID of the parent resource for nested resources.
+        :param fields: Optional[List[str]] Only request these fields, validating into a partial datamodel.
         :return: Union[T, JSONDict] The retrieved resource.
         """
         endpoint = self._get_endpoint(parent_id, resource_id)
-        response = self.client.get(endpoint)
-        return self._convert_to_model(response)
+        if fields:
+            partial_response = self.client.get(endpoint, params=self._fields_params(None, fields))
+            return self._convert_to_model(partial_response, self._fields_datamodel(fields))
+
+        if self.cache is not None:
+            cached = self.cache.get(endpoint)
+            if cached is not None:
+                self._restore_etag(endpoint, self.cache.get_etag(endpoint))
+                return cached
+
+        stored: Optional[JSONDict] = self.store.get(endpoint) if self.store is not None else None
+        if self.store is not None and stored is not None:
+            response: RawResponse = stored
+            etag = self.store.get_etag(endpoint)
+            self._restore_etag(endpoint, etag)
+        else:
+            response = self.client.get(endpoint)
+            etag = self._remember_etag(endpoint)
+            if self.store is not None and isinstance(response, dict):
+                self.store.set(endpoint, response, etag=etag)
 
-    def update(self, resource_id: str, data: JSONDict | T, parent_id: Optional[str] = None) -> T | JSONDict:
+        result = self._convert_to_model(response)
+        if self.cache is not None:
+            self.cache.set(endpoint, result, etag=etag)
+        return result
+
+    def get_etag(self, resource_id: str, parent_id: Optional[str] = None) -> Optional[str]:
+        """
+        Get the ETag captured for a resource by the last `read` or write.
+
+        :param resource_id: str The ID of the resource.
+        :param parent_id: Optional[str] ID of the parent resource for nested resources.
+        :return: Optional[str] The ETag, or None if it is unknown.
+        """
+        return self._known_etag(self._get_endpoint(parent_id, resource_id))
+
+    def update(self, resource_id: str, data: JSONDict | T, parent_id: Optional[str] = None, if_match: Optional[str] = None) -> T | JSONDict:
         """
         Update a specific resource.
 
+        If the resource's ETag is known from an earlier `read` or write, it is sent as `If-Match`. ETags are
+        kept with cached and stored entities, so reads served from the entity cache or the persistent store count.
+
         :param resource_id: str The ID of the resource to update.
         :param data: JSONDict The updated data for the resource.
         :param parent_id: Optional[str] ID of the parent resource for nested resources.
+        :param if_match: Optional[str] An explicit ETag to send as `If-Match`.
         :return: Union[T, JSONDict] The updated resource.
+        :raises ConflictError: If the resource was modified since its ETag was read.
         """
         endpoint = self._get_endpoint(parent_id, resource_id)
         converted_data: JSONDict = self._dump_data(data)
-        response = self.client.put(endpoint, json=converted_data)
-        return self._convert_to_model(response)
-
-    def partial_update(self, resource_id: str, data: JSONDict | T, parent_id: Optional[str] = None) -> T | JSONDict:
+        self._invalidate(endpoint, parent_id)
+        response = self._conditional_write("put", endpoint, converted_data, if_match)
+        result = self._convert_to_model(response)
+        etag = self._known_etag(endpoint)
+        if self.cache is not None:
+            self.cache.set(endpoint, result, etag=etag)
+        if self.store is not None:
+            self.store.set(endpoint, response, etag=etag)
+        return result
+
+    def partial_update(
+        self,
+        resource_id: str,
+        data: JSONDict | T,
+        parent_id: Optional[str] = None,
+        original: Optional[JSONDict | T] = None,
+        exclude_unset: bool = False,
+        if_match: Optional[str] = None,
+    ) -> T | JSONDict:
         """
         Partially update a specific resource.
 
+        If `original` is given, only the fields that differ from it are sent, and no request
+        is made at all when nothing changed. If the resource's ETag is known from an earlier
+        `read` or write, it is sent as `If-Match`.
+
         :param resource_id: str The ID of the resource to update.
         :param data: JSONDict The partial updated data for the resource.
         :param parent_id: Optional[str] ID of the parent resource for nested resources.
-        :return: Union[T, JSONDict] The updated resource.
+        :param original: Optional[Union[JSONDict, T]] The resource as it was before the modification.
+        :param exclude_unset: bool Leave out model fields that were not explicitly set on `data`.
+        :param if_match: Optional[str] An explicit ETag to send as `If-Match`.
+        :return: Union[T, JSONDict] The updated resource, or `original` if nothing changed.
+        :raises ConflictError: If the resource was modified since its ETag was read.
         """
         endpoint = self._get_endpoint(parent_id, resource_id)
-        converted_data: JSONDict = self._dump_data(data)
-        response = self.client.patch(endpoint, json=converted_data)
+        converted_data: JSONDict = self._dump_data(data, exclude_unset=exclude_unset)
+        if original is not None:
+            converted_data = self._diff_data(self._dump_data(original), converted_data)
+            if not converted_data:
+                logger.debug(f"Skipping partial update of {endpoint}: no fields changed")
+                return original
+
+        self._invalidate(endpoint, parent_id)
+        response = self._conditional_write("patch", endpoint, converted_data, if_match)
         return self._convert_to_model(response)
 
     def destroy(self, resource_id: str, parent_id: Optional[str] = None) -> None:
@@ -336,6 +1149,8 @@ class Crud(Generic[T]):
         :param parent_id: Optional[str] ID of the parent resource for nested resources.
         """
         endpoint = self._get_endpoint(parent_id, resource_id)
+        self._invalidate(endpoint, parent_id)
+        self._restore_etag(endpoint, None)
         self.client.delete(endpoint)
 
     def custom_action(
@@ -346,29 +1161,115 @@ class Crud(Generic[T]):
         parent_id: Optional[str] = None,
         data: Optional[JSONDict | T] = None,
         params: Optional[JSONDict] = None,
+        idempotency_key: Optional[str] = None,
     ) -> T | JSONDict:
         """
         Perform a custom action on the resource.
 
+        POST actions carrying an idempotency key are retried on transient failures.
+
         :param action: str The name of the custom action.
         :param method: str The HTTP method to use. Defaults to "post".
         :param resource_id: Optional[str] Optional resource ID if the action is for a specific resource.
         :param parent_id: Optional[str] ID of the parent resource for nested resources.
         :param data: Optional[JSONDict] Optional data to send with the request.
         :param params: Optional[JSONDict] Optional query parameters.
+        :param idempotency_key: Optional[str] Idempotency key for a POST action. Generated if None and `_idempotency_keys` is set.
         :return: T | JSONDict The API response.
         """
         endpoint = self._get_endpoint(parent_id, resource_id, action)
 
-        kwargs = {}
+        kwargs: Dict[str, Any] = {}
         if params:
             kwargs["params"] = params
         if data:
             converted_data: JSONDict = self._dump_data(data)
             kwargs["json"] = converted_data
+        if method.lower() == "post":
+            headers = self._idempotency_headers(idempotency_key)
+            if headers:
+                kwargs["headers"] = headers
+                kwargs["idempotent"] = True
 
         response = getattr(self.client, method.lower())(endpoint, **kwargs)
         try:
             return self._convert_to_model(response)
         except ValueError:
             return response
+
+    def write_behind(self, max_pending: int = 1000, workers: int = 4) -> WriteBehindQueue:
+        """
+        Create a background queue for writes to the resource.
+
+        Writes return futures immediately and are sent by worker threads. Use the queue as a
+        context manager, or call `flush`, to wait for every write to be sent.
+
+        Example:
+        ```python
+            with contacts.write_behind(workers=8) as writes:
+                futures = [writes.create(contact) for contact in incoming]
+        ```
+
+        :param max_pending: int The maximum number of queued writes before producers block.
+        :param workers: int The number of worker threads.
+        :return: WriteBehindQueue The queue, with its workers started.
+        """
+        return WriteBehindQueue(self, max_pending=max_pending, workers=workers)
+
+    def batch(self, parent_id: Optional[str] = None, max_size: Optional[int] = None, encoder: Optional[BatchEncoder] = None) -> Batch:
+        """
+        Collect `create`, `update` and `destroy` calls into batch requests.
+
+        The operations are sent in requests of at most `max_size` operations when the batch is full
+        and when the `with` block exits. Each call returns a future receiving its own result.
+
+        Example:
+        ```python
+            with contacts.batch() as batch:
+                futures = [batch.create(contact) for contact in incoming]
+            created = [future.result() for future in futures]
+        ```
+
+        :param parent_id: Optional[str] ID of the parent resource for nested resources.
+        :param max_size: Optional[int] The maximum number of operations per request. Defaults to `_batch_size`.
+        :param encoder: Optional[BatchEncoder] The batch request format. Defaults to `_batch_encoder`.
+        :return: Batch The batch, to be used as a context manager.
+        """
+        return Batch(self, parent_id, max_size=max_size if max_size is not None else self._batch_size, encoder=encoder or self._batch_encoder)
+
+    def upload(
+        self,
+        path: str | os.PathLike,
+        parent_id: Optional[str] = None,
+        checkpoint: Optional[str | os.PathLike] = None,
+        protocol: Optional[UploadProtocol] = None,
+        **kwargs: Any,
+    ) -> T | RawResponse:
+        """
+        Upload a large file in parts, uploaded in parallel and retried on transient failures.
+
+        With a checkpoint, the progress is recorded after every part and an interrupted upload
+        resumes when it is run again with the same checkpoint.
+
+        Example:
+        ```python
+            document = documents.upload("/data/scan.pdf", checkpoint="/tmp/scan.pdf.upload")
+        ```
+
+        :param path: Union[str, os.PathLike] The path of the file.
+        :param parent_id: Optional[str] ID of the parent resource for nested resources.
+        :param checkpoint: Optional[Union[str, os.PathLike]] The path of the checkpoint file, or None to not persist progress.
+        :param protocol: Optional[UploadProtocol] The upload protocol. Defaults to `_upload_protocol`.
+        :param kwargs: Further arguments of ResumableUpload, e.g. part_size and max_workers.
+        :return: Union[T, RawResponse] The created resource, or the raw response if it is not a JSON object.
+        """
+        protocol = protocol or self._upload_protocol or MultipartUploadProtocol()
+        endpoint = protocol.endpoint(self, parent_id)
+        result = ResumableUpload(self.client, endpoint, path, protocol=protocol, checkpoint=checkpoint, **kwargs).run()
+        if self.store is not None:
+            self.store.invalidate_prefix(f"{self._get_endpoint(parent_id)}?")
+        if not isinstance(result, dict):
+            return result
+        model = self._convert_to_model(result)
+        self._cache_items([model], parent_id)
+        return model
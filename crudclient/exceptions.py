@@ -21,3 +21,40 @@ class InvalidClientError(APIError):
 class ClientInitializationError(APIError):
 
     pass
+
+
+class ConflictError(APIError):
+    """Raised when a conditional write is rejected because the resource changed (HTTP 412 Precondition Failed)."""
+
+    def __init__(self, message: str = "Resource was modified by another client", etag: str | None = None):
+        self.message = message
+        self.etag = etag
+        super().__init__(message)
+
+    def __repr__(self):
+        return f"ConflictError(message={self.message!r}, etag={self.etag!r})"
+
+
+class BatchItemError(APIError):
+    """Raised for a single operation of a batch request that the API reported as failed."""
+
+    def __init__(self, message: str = "Batch operation failed", index: int | None = None, error: object = None):
+        self.message = message
+        self.index = index
+        self.error = error
+        super().__init__(message)
+
+    def __repr__(self):
+        return f"BatchItemError(message={self.message!r}, index={self.index!r}, error={self.error!r})"
+
+
+class OperationGraphError(APIError):
+    """Raised when operations of an operation graph failed, or were skipped because an operation they depend on failed."""
+
+    def __init__(self, message: str = "Operation graph failed", failures: dict | None = None):
+        self.message = message
+        self.failures = failures or {}
+        super().__init__(message)
+
+    def __repr__(self):
+        return f"OperationGraphError(message={self.message!r}, failures={self.failures!r})"
@@ -0,0 +1,288 @@
+"""
+Module `graph.py`
+=================
+
+This module defines the OperationGraph class, which runs `Crud` operations that depend on each
+other's results, running independent operations concurrently and starting each operation as
+soon as the results it needs are available.
+
+Class `OperationGraph`
+----------------------
+
+Operations are added with `add`, naming a `Crud` resource, one of its methods and the call
+arguments. Arguments may contain references to the results of earlier operations, created with
+`Operation.ref`; they are replaced by the actual values before the call. `after` declares
+ordering without a data dependency. When an operation fails, the operations depending on it are
+skipped and `run` raises `OperationGraphError`.
+
+Example:
+    graph = OperationGraph(max_workers=8)
+    company = graph.add(companies, "create", {"name": "Acme"})
+    contacts = [graph.add(contacts_crud, "create", contact, parent_id=company.ref("id")) for contact in incoming]
+    graph.add(companies, "partial_update", company.ref("id"), {"status": "ready"}, after=contacts)
+    graph.run()
+    company.result()
+
+Classes:
+    - Ref: Reference to (a part of) the result of an operation.
+    - Operation: A Crud call in an operation graph.
+    - OperationGraph: Concurrent executor of dependent Crud calls.
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Set
+
+from .exceptions import OperationGraphError
+
+if TYPE_CHECKING:
+    from .crud import Crud
+
+# Get a logger for this module
+logger = logging.getLogger(__name__)
+
+
+class Ref:
+    """
+    Reference to the result of an operation, or to a key or attribute path inside it.
+
+    :ivar operation: Operation The referenced operation.
+    :ivar path: tuple The keys or attribute names followed into the result.
+    """
+
+    __slots__ = ("operation", "path")
+
+    def __init__(self, operation: "Operation", path: tuple = ()) -> None:
+        self.operation = operation
+        self.path = path
+
+    def resolve(self) -> Any:
+        """
+        Return the referenced value. The operation must have completed.
+
+        :return: Any The value.
+        :raises KeyError: If a key or attribute of the path is missing.
+        """
+        value = self.operation.future.result()
+        for key in self.path:
+            if isinstance(value, dict) or (isinstance(value, list) and isinstance(key, int)):
+                value = value[key]
+            elif hasattr(value, str(key)):
+                value = getattr(value, str(key))
+            else:
+                raise KeyError(f"{key!r} not found in the result of {self.operation!r}")
+        return value
+
+    def __repr__(self) -> str:
+        return f"Ref({self.operation!r}, path={self.path!r})"
+
+
+def _find_refs(value: Any, refs: List[Ref]) -> None:
+    if isinstance(value, Ref):
+        refs.append(value)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _find_refs(item, refs)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _find_refs(item, refs)
+
+
+def _failed(future: Future) -> bool:
+    return future.cancelled() or future.exception() is not None
+
+
+def _resolve_refs(value: Any) -> Any:
+    if isinstance(value, Ref):
+        return value.resolve()
+    if isinstance(value, dict):
+        return {key: _resolve_refs(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve_refs(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_resolve_refs(item) for item in value)
+    return value
+
+
+class Operation:
+    """
+    A Crud call in an operation graph.
+
+    :ivar crud: Crud The resource.
+    :ivar method: str The name of the Crud method.
+    :ivar args: tuple The positional arguments, possibly containing references.
+    :ivar kwargs: dict The keyword arguments, possibly containing references.
+    :ivar dependencies: Set[Operation] The operations that must complete first.
+    :ivar future: Future The future receiving the result of the call.
+
+    Methods:
+        ref: Return a reference to the result, or to a key or attribute path inside it.
+        result: Return the result of the call.
+    """
+
+    def __init__(self, index: int, crud: "Crud", method: str, args: tuple, kwargs: dict, after: Iterable["Operation"] = ()) -> None:
+        self.index = index
+        self.crud = crud
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.future: Future = Future()
+
+        refs: List[Ref] = []
+        _find_refs(args, refs)
+        _find_refs(kwargs, refs)
+        self.dependencies: Set[Operation] = {ref.operation for ref in refs} | set(after)
+        self._dependents: List[Operation] = []
+        self._waiting = len(self.dependencies)
+
+    def ref(self, *path: Any) -> Ref:
+        """
+        Return a reference to the result of this operation.
+
+        :param path: Keys or attribute names to follow into the result, e.g. `ref("id")`.
+        :return: Ref The reference.
+        """
+        return Ref(self, path)
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        """
+        Return the result of the call, waiting for it if needed.
+
+        :param timeout: Optional[float] The maximum number of seconds to wait.
+        :return: Any The result.
+        :raises Exception: The error of the call, or OperationGraphError if a dependency failed.
+        """
+        return self.future.result(timeout)
+
+    def __repr__(self) -> str:
+        return f"Operation(#{self.index} {type(self.crud).__name__}.{self.method})"
+
+
+class OperationGraph:
+    """
+    Concurrent executor of dependent Crud calls.
+
+    :ivar max_workers: int The maximum number of concurrent calls.
+    :ivar operations: List[Operation] The operations, in the order they were added.
+
+    Methods:
+        add: Add an operation.
+        run: Run all operations.
+    """
+
+    def __init__(self, max_workers: int = 8) -> None:
+        """
+        Initialize the OperationGraph.
+
+        :param max_workers: int The maximum number of concurrent calls.
+        """
+        self.max_workers = max_workers
+        self.operations: List[Operation] = []
+        self._lock = threading.Lock()
+        self._remaining = 0
+        self._done = threading.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def add(self, crud: "Crud", method: str, *args: Any, after: Iterable[Operation] = (), **kwargs: Any) -> Operation:
+        """
+        Add an operation. Operations must be added before `run` is called, not while it runs.
+
+        :param crud: Crud The resource.
+        :param method: str The name of the Crud method, e.g. "create".
+        :param args: Positional arguments for the method. May contain references to earlier operations.
+        :param after: Iterable[Operation] Operations that must complete first, without passing data.
+        :param kwargs: Keyword arguments for the method. May contain references to earlier operations.
+        :return: Operation The operation.
+        :raises ValueError: If the method is not allowed on the resource, or a dependency belongs to another graph.
+        """
+        if getattr(crud, method, None) is None:
+            raise ValueError(f"Method {method!r} is not allowed on {type(crud).__name__}")
+
+        operation = Operation(len(self.operations), crud, method, args, kwargs, after)
+        for dependency in operation.dependencies:
+            if dependency.index >= len(self.operations) or self.operations[dependency.index] is not dependency:
+                raise ValueError(f"{dependency!r} does not belong to this graph")
+        for dependency in operation.dependencies:
+            if dependency.future.done():
+                operation._waiting -= 1
+            else:
+                dependency._dependents.append(operation)
+        self.operations.append(operation)
+        return operation
+
+    def _submit(self, operation: Operation) -> None:
+        assert self._executor is not None  # for mypy
+        self._executor.submit(self._execute, operation)
+
+    def _execute(self, operation: Operation) -> None:
+        if not operation.future.set_running_or_notify_cancel():
+            self._finish(operation)
+            return
+        try:
+            args, kwargs = _resolve_refs(operation.args), _resolve_refs(operation.kwargs)
+            result = getattr(operation.crud, operation.method)(*args, **kwargs)
+        except BaseException as e:
+            logger.warning(f"{operation!r} failed: {e}")
+            operation.future.set_exception(e)
+        else:
+            operation.future.set_result(result)
+        self._finish(operation)
+
+    def _finish(self, operation: Operation) -> None:
+        """
+        Start or skip the dependents of a completed operation.
+        """
+        failed = _failed(operation.future)
+        ready: List[Operation] = []
+        skipped: List[Operation] = []
+        with self._lock:
+            self._remaining -= 1
+            for dependent in operation._dependents:
+                dependent._waiting -= 1
+                if failed and not dependent.future.done():
+                    dependent.future.set_exception(OperationGraphError(f"{dependent!r} skipped, as {operation!r} failed"))
+                    skipped.append(dependent)
+                elif dependent._waiting == 0 and not dependent.future.done():
+                    ready.append(dependent)
+            if self._remaining == 0:
+                self._done.set()
+        for dependent in skipped:
+            self._finish(dependent)
+        for dependent in ready:
+            self._submit(dependent)
+
+    def run(self, timeout: Optional[float] = None) -> List[Any]:
+        """
+        Run all operations and wait for them to complete.
+
+        :param timeout: Optional[float] The maximum number of seconds to wait.
+        :return: List[Any] The results, in the order the operations were added.
+        :raises OperationGraphError: If an operation failed; its `failures` map each failed operation to its error.
+        :raises TimeoutError: If the operations did not complete within the timeout.
+        """
+        pending = [operation for operation in self.operations if not operation.future.done()]
+        if pending:
+            self._remaining = len(pending)
+            self._done.clear()
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="crudclient-graph")
+            completed = False
+            try:
+                for operation in pending:
+                    if operation._waiting == 0:
+                        self._submit(operation)
+                completed = self._done.wait(timeout)
+            finally:
+                self._executor.shutdown(wait=completed)
+                self._executor = None
+            if not completed:
+                raise TimeoutError("Operation graph did not complete in time")
+
+        failures = {
+            operation: operation.future.exception() if not operation.future.cancelled() else OperationGraphError(f"{operation!r} was cancelled")
+            for operation in self.operations
+            if _failed(operation.future)
+        }
+        if failures:
+            raise OperationGraphError(f"{len(failures)} of {len(self.operations)} operations failed", failures=failures)
+        return [operation.future.result() for operation in self.operations]
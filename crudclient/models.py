@@ -1,23 +1,58 @@
-from typing import Generic, List, Optional, TypeVar
+from functools import lru_cache
+from typing import Any, ClassVar, Dict, Generic, List, Literal, Optional, Tuple, Type, TypeAlias, TypeVar, cast
 
-from pydantic import BaseModel, Field, HttpUrl, root_validator
+from pydantic import BaseModel, Field, HttpUrl, create_model, model_validator
+
+RoleRule: TypeAlias = Tuple[Tuple[str, ...], str, Literal["required", "unallowed"]]
 
 
 class RoleBasedModel(BaseModel):
+    """
+    Model whose fields can be required or unallowed per operation (role).
+
+    The rules are declared per field, e.g. `Field(None, json_schema_extra={"methods": {"create": "required"}})`,
+    and are checked when the input contains a `_role` key. They are compiled into a lookup table
+    once per class, so validation only visits the fields that have a rule for the role.
+    """
+
     _current_role: Optional[str] = None
+    _role_rules: ClassVar[Dict[str, Tuple[RoleRule, ...]]] = {}
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+
+        rules: Dict[str, List[RoleRule]] = {}
+        for name, field in cls.model_fields.items():
+            extra = field.json_schema_extra if isinstance(field.json_schema_extra, dict) else {}
+            methods = extra.get("methods") or {}
+            if not isinstance(methods, dict):
+                raise TypeError(f"{cls.__name__}.{name}: 'methods' must map roles to 'required' or 'unallowed', got {methods!r}")
+            keys = (name,) if field.alias is None or field.alias == name else (name, field.alias)
+            for role, rule in methods.items():
+                if rule not in ("required", "unallowed"):
+                    raise TypeError(f"{cls.__name__}.{name}: rule for {role!r} must be 'required' or 'unallowed', got {rule!r}")
+                rules.setdefault(role, []).append((keys, name, cast(Literal["required", "unallowed"], rule)))
+        cls._role_rules = {role: tuple(role_rules) for role, role_rules in rules.items()}
+
+    @model_validator(mode="before")
+    @classmethod
+    def check_fields_based_on_role(cls, values: Any) -> Any:
+        if not isinstance(values, dict) or "_role" not in values:
+            return values
 
-    @root_validator(pre=True)
-    def check_fields_based_on_role(cls, values):
-        role = values.pop("_role", None)  # API internally uses this
+        values = dict(values)
+        role = values.pop("_role")  # API internally uses this
         if not role:
             return values
 
-        for field_name, field_value in values.items():
-            field_config = cls.__fields__[field_name].field_info.extra.get("methods", {})
-            if role in field_config:
-                if field_config[role] == "required" and field_value is None:
+        for keys, field_name, rule in cls._role_rules.get(role, ()):
+            for key in keys:
+                if key not in values:
+                    continue
+                if rule == "required" and values[key] is None:
                     raise ValueError(f"Field '{field_name}' is required for '{role}' operation.")
-                if field_config[role] == "unallowed" and field_value is not None:
+                if rule == "unallowed" and values[key] is not None:
                     raise ValueError(f"Field '{field_name}' is not allowed in '{role}' operation.")
         return values
 
@@ -39,3 +74,29 @@ class ApiResponse(BaseModel, Generic[T]):
     links: PaginationLinks = Field(..., alias="_links")
     count: int
     data: List[T]
+
+
+@lru_cache(maxsize=None)
+def partial_model(model: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """
+    Derive a model holding only a subset of the fields of `model`.
+
+    Fields can be given by name or by alias. The derived model keeps the field definitions and the
+    model config, but not the validators of `model`. It is cached per model and field set.
+
+    :param model: Type[BaseModel] The full model.
+    :param fields: Tuple[str, ...] The field names or aliases to keep.
+    :return: Type[BaseModel] The derived model.
+    :raises ValueError: If a field is not defined on `model`.
+    """
+    definitions: Dict[str, Any] = {}
+    for name, field in model.model_fields.items():
+        if name in fields or (field.alias is not None and field.alias in fields):
+            definitions[name] = (field.annotation, field)
+
+    known = set(model.model_fields) | {field.alias for field in model.model_fields.values() if field.alias}
+    unknown = [name for name in fields if name not in known]
+    if unknown:
+        raise ValueError(f"Unknown fields for {model.__name__}: {unknown}")
+
+    return create_model(f"{model.__name__}Partial", __config__=model.model_config, **definitions)  # type: ignore[call-overload]
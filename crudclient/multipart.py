@@ -0,0 +1,237 @@
+"""
+Module `multipart.py`
+=====================
+
+This module defines the MultipartEncoder class, which streams a `multipart/form-data` request
+body instead of building it in memory.
+
+Class `MultipartEncoder`
+------------------------
+
+The `Client` encodes `files` uploads with a `MultipartEncoder`. It is passed to `requests` as
+the request body and produces the body in chunks while it is sent, reading files only as far
+as needed, so uploads use constant memory regardless of their size. File contents may be
+bytes, paths (`pathlib.Path` or other `os.PathLike`), file objects or iterables of bytes such
+as generators. When the sizes of all contents are known, the encoder has a `len` attribute and
+the request carries a Content-Length; otherwise it is sent with chunked transfer encoding.
+
+Files are given like the `files` argument of `requests`: a mapping or a list of pairs of a
+field name and either the content or a `(filename, content[, content_type[, headers]])` tuple.
+Unlike `requests`, a `str` content is the content itself; use a `pathlib.Path` to upload a
+file by path.
+
+Example:
+    encoder = MultipartEncoder(
+        files={"attachment": ("invoice.pdf", Path("/data/invoice.pdf"), "application/pdf")},
+        data={"description": "Invoice 2024-001"},
+    )
+    session.post(url, data=encoder, headers={"Content-Type": encoder.content_type})
+
+Classes:
+    - MultipartEncoder: Streaming encoder of multipart/form-data bodies.
+"""
+
+import mimetypes
+import os
+import uuid
+from typing import IO, Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+FieldsType = Union[Mapping[str, Any], Iterable[Tuple[str, Any]]]
+
+
+def _items(fields: Optional[FieldsType]) -> List[Tuple[str, Any]]:
+    if fields is None:
+        return []
+    if isinstance(fields, Mapping):
+        return list(fields.items())
+    return list(fields)
+
+
+def _quote(value: str) -> str:
+    """
+    Escape a name or filename for a Content-Disposition header, as browsers do.
+    """
+    return value.replace("\\", "\\\\").replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+
+
+class _Part:
+    """
+    A part of a multipart body: its encoded headers and its content.
+    """
+
+    def __init__(
+        self, name: str, content: Any, filename: Optional[str] = None, content_type: Optional[str] = None, headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        self.content = content
+        self._consumed = False
+        self._position: Optional[int] = None
+
+        if isinstance(content, os.PathLike):
+            self.length: Optional[int] = os.path.getsize(content)
+        elif isinstance(content, (bytes, bytearray, memoryview)):
+            self.length = len(content)
+        elif hasattr(content, "read"):
+            self.length = self._file_length(content)
+        else:
+            self.length = None
+
+        disposition = f'form-data; name="{_quote(name)}"'
+        if filename is not None:
+            disposition += f'; filename="{_quote(filename)}"'
+            content_type = content_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        lines = [f"Content-Disposition: {disposition}"]
+        if content_type:
+            lines.append(f"Content-Type: {content_type}")
+        lines.extend(f"{key}: {value}" for key, value in (headers or {}).items())
+        self.headers = ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8")
+
+    def _file_length(self, file: IO) -> Optional[int]:
+        """
+        Return the remaining size of a seekable binary file, remembering the position to rewind to.
+        """
+        if "b" not in getattr(file, "mode", "b"):
+            return None
+        try:
+            position = file.tell()
+        except (AttributeError, OSError, ValueError):
+            return None
+        try:
+            size = os.fstat(file.fileno()).st_size
+        except (AttributeError, OSError, ValueError):
+            try:
+                size = file.seek(0, os.SEEK_END)
+                file.seek(position)
+            except (AttributeError, OSError, ValueError):
+                return None
+        self._position = position
+        return max(0, size - position)
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]:
+        content = self.content
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            yield bytes(content)
+        elif isinstance(content, os.PathLike):
+            with open(content, "rb") as file:
+                yield from self._read(file, chunk_size)
+        elif hasattr(content, "read"):
+            if self._position is not None:
+                content.seek(self._position)
+            elif self._consumed:
+                raise RuntimeError(f"{content!r} cannot be read twice, e.g. to retry the request")
+            self._consumed = True
+            yield from self._read(content, chunk_size)
+        else:
+            if self._consumed:
+                raise RuntimeError(f"{content!r} cannot be iterated twice, e.g. to retry the request")
+            self._consumed = True
+            for chunk in content:
+                yield chunk.encode("utf-8") if isinstance(chunk, str) else bytes(chunk)
+
+    @staticmethod
+    def _read(file: IO, chunk_size: int) -> Iterator[bytes]:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+
+
+class MultipartEncoder:
+    """
+    Streaming encoder of multipart/form-data bodies.
+
+    The encoder can be iterated again, e.g. to retry a request, unless it holds generators or
+    unseekable file objects.
+
+    :ivar boundary: str The boundary between the parts.
+    :ivar content_type: str The Content-Type of the body, including the boundary.
+    :ivar len: Optional[int] The size of the body in bytes, or None if a content has an unknown size.
+    :ivar chunk_size: int The size of the chunks the body is produced in.
+    """
+
+    def __init__(
+        self, files: Optional[FieldsType] = None, data: Optional[FieldsType] = None, boundary: Optional[str] = None, chunk_size: int = 64 * 1024
+    ) -> None:
+        """
+        Initialize the MultipartEncoder.
+
+        :param files: Optional[FieldsType] The files, as field names mapped to contents or `(filename, content[, content_type[, headers]])` tuples.
+        :param data: Optional[FieldsType] Plain form fields. List values are sent as repeated fields.
+        :param boundary: Optional[str] The boundary between the parts. Defaults to a random boundary.
+        :param chunk_size: int The size of the chunks the body is produced in.
+        """
+        self.boundary = boundary or uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.chunk_size = chunk_size
+
+        self._parts: List[_Part] = []
+        for name, value in _items(data):
+            for item in value if isinstance(value, list) else [value]:
+                if item is None:
+                    continue
+                content = item if isinstance(item, bytes) else str(item).encode("utf-8")
+                self._parts.append(_Part(name, content))
+        for name, value in _items(files):
+            self._parts.append(self._file_part(name, value))
+
+        lengths = [part.length for part in self._parts if part.length is not None]
+        if len(lengths) < len(self._parts):
+            self.len: Optional[int] = None
+        else:
+            framing = len(self._delimiter()) * len(self._parts) + len(self._close_delimiter())
+            self.len = framing + sum(len(part.headers) + length + 2 for part, length in zip(self._parts, lengths))
+
+    @staticmethod
+    def _file_part(name: str, value: Any) -> _Part:
+        if isinstance(value, tuple):
+            filename, content, *rest = value
+            content_type = rest[0] if rest else None
+            headers = rest[1] if len(rest) > 1 else None
+        else:
+            content, content_type, headers = value, None, None
+            file_name = getattr(content, "name", None) if not isinstance(content, os.PathLike) else os.fspath(content)
+            filename = os.path.basename(file_name) if isinstance(file_name, str) else name
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        return _Part(name, content, filename=filename, content_type=content_type, headers=headers)
+
+    def _delimiter(self) -> bytes:
+        return f"--{self.boundary}\r\n".encode("ascii")
+
+    def _close_delimiter(self) -> bytes:
+        return f"--{self.boundary}--\r\n".encode("ascii")
+
+    def _pieces(self) -> Iterator[bytes]:
+        for part in self._parts:
+            yield self._delimiter()
+            yield part.headers
+            yield from part.iter_content(self.chunk_size)
+            yield b"\r\n"
+        yield self._close_delimiter()
+
+    def __iter__(self) -> Iterator[bytes]:
+        """
+        Produce the body, joining small pieces into chunks of about `chunk_size` bytes.
+        """
+        buffer = bytearray()
+        for piece in self._pieces():
+            if not buffer and len(piece) >= self.chunk_size:
+                yield piece
+                continue
+            buffer += piece
+            if len(buffer) >= self.chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+        if buffer:
+            yield bytes(buffer)
+
+    def to_bytes(self) -> bytes:
+        """
+        Return the whole body. This loads it into memory; meant for small bodies and tests.
+
+        :return: bytes The body.
+        """
+        return b"".join(self)
+
+    def __repr__(self) -> str:
+        return f"MultipartEncoder(parts={len(self._parts)}, len={self.len})"
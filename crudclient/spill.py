@@ -0,0 +1,271 @@
+"""
+Module `spill.py`
+=================
+
+This module defines the SpilledBody class, which holds a large response body in an anonymous
+temporary file instead of in memory and gives memory-mapped access to it.
+
+Class `SpilledBody`
+-------------------
+
+The `Client` returns a `SpilledBody` for non-JSON responses larger than
+`ClientConfig.spill_threshold`. The body is streamed to disk while it is received, so the
+resident memory of the process stays bounded; the operating system pages the mapped file in
+and out as it is read. The temporary file is deleted when the body is closed.
+
+Large JSON responses are spilled as well and parsed from the mapped file one leaf value at a
+time, descending into nested arrays and objects, so the body is never held in memory as a whole
+next to the parsed value.
+
+Example:
+    config = MyConfig(spill_threshold=64 * 1024 * 1024)
+    export = Client(config).get("exports/2024")
+    with export:
+        export.save("export-2024.zip")
+
+Classes:
+    - SpilledBody: Memory-mapped response body backed by a temporary file.
+"""
+
+import codecs
+import json
+import mmap
+import shutil
+import tempfile
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+_WHITESPACE = " \t\n\r"
+
+
+class _JSONStream:
+    """
+    Incremental JSON parser over text chunks.
+
+    Arrays and objects are walked recursively; only leaf values are parsed with
+    `json.JSONDecoder.raw_decode`, refilling the buffer when one is cut off, so only the leaf being
+    parsed is held as text.
+    """
+
+    def __init__(self, chunks: Iterator[str], chunk_size: int) -> None:
+        self._chunks = chunks
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size: int) -> None:
+        parts = [self._buffer[self._pos :]]
+        added = 0
+        while added < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._eof = True
+                break
+            parts.append(chunk)
+            added += len(chunk)
+        self._buffer = "".join(parts)
+        self._pos = 0
+
+    def _peek(self) -> str:
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer) or self._eof:
+                return self._buffer[self._pos : self._pos + 1]
+            self._fill(self._chunk_size)
+
+    def _expect(self, chars: str, message: str) -> str:
+        char = self._peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(message, self._buffer, self._pos)
+        self._pos += 1
+        return char
+
+    def _scalar(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill(max(self._chunk_size, len(self._buffer) - self._pos))
+
+    def _array(self) -> List[Any]:
+        self._expect("[", "Expecting '['")
+        items: List[Any] = []
+        if self._peek() == "]":
+            self._pos += 1
+            return items
+        while True:
+            items.append(self._value())
+            if self._expect(",]", "Expecting ',' delimiter") == "]":
+                return items
+
+    def _object(self) -> Dict[str, Any]:
+        self._expect("{", "Expecting '{'")
+        members: List[Tuple[str, Any]] = []
+        if self._peek() == "}":
+            self._pos += 1
+            return {}
+        while True:
+            if self._peek() != '"':
+                raise json.JSONDecodeError("Expecting property name enclosed in double quotes", self._buffer, self._pos)
+            key = self._scalar()
+            self._expect(":", "Expecting ':' delimiter")
+            members.append((key, self._value()))
+            if self._expect(",}", "Expecting ',' delimiter") == "}":
+                return dict(members)
+
+    def _value(self) -> Any:
+        char = self._peek()
+        if char == "[":
+            return self._array()
+        if char == "{":
+            return self._object()
+        return self._scalar()
+
+    def parse(self) -> Any:
+        value = self._value()
+        if self._peek():
+            raise json.JSONDecodeError("Extra data", self._buffer, self._pos)
+        return value
+
+
+class SpilledBody:
+    """
+    Memory-mapped response body backed by an anonymous temporary file.
+
+    :ivar content_type: str The Content-Type of the response.
+    :ivar encoding: Optional[str] The text encoding of the response, if known.
+
+    Methods:
+        buffer: Return a memoryview of the mapped body.
+        iter_chunks: Iterate over the body in chunks.
+        text: Decode the body as text.
+        json: Parse the body as JSON.
+        save: Copy the body to a file.
+        close: Unmap and delete the temporary file.
+    """
+
+    def __init__(self, file: IO[bytes], content_type: str = "", encoding: Optional[str] = None) -> None:
+        """
+        Initialize the SpilledBody from a temporary file holding the whole body.
+
+        :param file: IO[bytes] The temporary file. It is closed, and thereby deleted, by `close`.
+        :param content_type: str The Content-Type of the response.
+        :param encoding: Optional[str] The text encoding of the response, if known.
+        """
+        self.content_type = content_type
+        self.encoding = encoding
+        self._file = file
+        self._file.flush()
+        self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[bytes], directory: Optional[str] = None, **kwargs: Any) -> "SpilledBody":
+        """
+        Write chunks to a new temporary file and map it.
+
+        :param chunks: Iterable[bytes] The body, in chunks.
+        :param directory: Optional[str] The directory of the temporary file. Defaults to the system temp directory.
+        :param kwargs: Further arguments of `SpilledBody`.
+        :return: SpilledBody The body.
+        """
+        file = tempfile.TemporaryFile(dir=directory)
+        try:
+            for chunk in chunks:
+                file.write(chunk)
+            return cls(file, **kwargs)
+        except BaseException:
+            file.close()
+            raise
+
+    def __len__(self) -> int:
+        return len(self._mmap)
+
+    def __bytes__(self) -> bytes:
+        return self._mmap[:]
+
+    def buffer(self) -> memoryview:
+        """
+        Return a memoryview of the mapped body, without copying it.
+
+        Release the memoryview before calling `close`.
+
+        :return: memoryview The body.
+        """
+        return memoryview(self._mmap)
+
+    def iter_chunks(self, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+        """
+        Iterate over the body in chunks.
+
+        :param chunk_size: int The size of the chunks in bytes.
+        :return: Iterator[bytes] The chunks.
+        """
+        for start in range(0, len(self._mmap), chunk_size):
+            yield self._mmap[start : start + chunk_size]
+
+    def text(self) -> str:
+        """
+        Decode the body as text. This loads the whole body into memory.
+
+        :return: str The text.
+        """
+        return self._mmap[:].decode(self.encoding or "utf-8", errors="replace")
+
+    def json(self, chunk_size: int = 1024 * 1024) -> Any:
+        """
+        Parse the body as JSON, decoding it incrementally from the mapped file.
+
+        Arrays and objects are walked at every level and their leaf values parsed one at a time, so
+        apart from the parsed value only about `chunk_size` bytes of the body, or one large string, are
+        held as text.
+
+        :param chunk_size: int The size of the chunks read from the mapped file in bytes.
+        :return: Any The parsed JSON.
+        :raises json.JSONDecodeError: If the body is not valid JSON.
+        """
+        return _JSONStream(self._iter_text(chunk_size), chunk_size).parse()
+
+    def _iter_text(self, chunk_size: int) -> Iterator[str]:
+        """
+        Decode the body in chunks, keeping multi-byte characters split across chunks intact.
+        """
+        decoder = codecs.getincrementaldecoder(self.encoding or "utf-8")()
+        for chunk in self.iter_chunks(chunk_size):
+            yield decoder.decode(chunk)
+        yield decoder.decode(b"", final=True)
+
+    def save(self, path: str) -> None:
+        """
+        Copy the body to a file.
+
+        :param path: str The path of the file.
+        """
+        self._file.seek(0)
+        with open(path, "wb") as target:
+            shutil.copyfileobj(self._file, target, 1024 * 1024)
+
+    def close(self) -> None:
+        """
+        Unmap and delete the temporary file.
+        """
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> "SpilledBody":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"SpilledBody(content_type={self.content_type!r}, size={len(self) if not self._mmap.closed else 'closed'})"
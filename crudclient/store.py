@@ -0,0 +1,146 @@
+"""
+Module `store.py`
+=================
+
+This module defines the SQLiteStore class, a persistent read-through store used by `Crud`
+to serve `read` and `list` from local disk across process restarts.
+
+Class `SQLiteStore`
+-------------------
+
+The `SQLiteStore` class keeps JSON API responses in an SQLite database, keyed by the
+resource endpoint path (and query string for lists), each with an expiry time. The database
+runs in WAL mode and every operation opens its own connection, so one store file can be
+shared by several threads and processes on the same host.
+
+Example:
+    store = SQLiteStore("/var/cache/myapp/fiken.db", ttl=3600)
+    api = FikenAPI(client_config=FikenConfig(), persistent_store=store)
+    api.contacts.read("42")  # served from disk while fresh
+
+Classes:
+    - SQLiteStore: Persistent TTL store for API responses.
+"""
+
+import json
+import sqlite3
+import time
+from typing import Any, Optional
+
+
+class SQLiteStore:
+    """
+    Persistent store for JSON API responses, backed by SQLite.
+
+    :ivar path: str The path of the SQLite database.
+    :ivar ttl: float The default number of seconds an entry stays fresh.
+    :ivar table: str The name of the table holding the entries.
+
+    Methods:
+        get: Return a fresh entry, or None if it is missing or expired.
+        get_etag: Return the ETag stored with a fresh entry.
+        set: Store an entry.
+        invalidate: Remove an entry.
+        invalidate_prefix: Remove all entries whose key starts with a prefix.
+        purge_expired: Remove all expired entries.
+        clear: Remove all entries.
+    """
+
+    def __init__(self, path: str, ttl: float = 3600.0, table: str = "crudclient_store") -> None:
+        """
+        Initialize the SQLiteStore and create its table if needed.
+
+        :param path: str The path of the SQLite database.
+        :param ttl: float The default number of seconds an entry stays fresh.
+        :param table: str The name of the table holding the entries.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.table = table
+        connection = self._connect()
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            with connection:
+                connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {self.table} (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, etag TEXT)"
+                )
+                # Tables created before ETags were stored lack the column
+                columns = {row[1] for row in connection.execute(f"PRAGMA table_info({self.table})")}
+                if "etag" not in columns:
+                    connection.execute(f"ALTER TABLE {self.table} ADD COLUMN etag TEXT")
+        finally:
+            connection.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _execute(self, sql: str, parameters: tuple = ()) -> list:
+        connection = self._connect()
+        try:
+            with connection:
+                return connection.execute(sql, parameters).fetchall()
+        finally:
+            connection.close()
+
+    def get(self, key: str) -> Any:
+        """
+        Return a fresh entry.
+
+        :param key: str The resource endpoint path, with the query string for lists.
+        :return: Any The decoded JSON entry, or None if it is missing or expired.
+        """
+        rows = self._execute(f"SELECT value FROM {self.table} WHERE key = ? AND expires_at > ?", (key, time.time()))  # nosec B608
+        return json.loads(rows[0][0]) if rows else None
+
+    def get_etag(self, key: str) -> Optional[str]:
+        """
+        Return the ETag stored with a fresh entry.
+
+        :param key: str The resource endpoint path.
+        :return: Optional[str] The ETag, or None if it is unknown or the entry is missing or expired.
+        """
+        rows = self._execute(f"SELECT etag FROM {self.table} WHERE key = ? AND expires_at > ?", (key, time.time()))  # nosec B608
+        return rows[0][0] if rows else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, etag: Optional[str] = None) -> None:
+        """
+        Store an entry.
+
+        :param key: str The resource endpoint path, with the query string for lists.
+        :param value: Any The JSON-serializable entry.
+        :param ttl: Optional[float] The number of seconds the entry stays fresh. Defaults to the store ttl.
+        :param etag: Optional[str] The ETag of the resource, restored for conditional updates when the entry is read.
+        """
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        self._execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at, etag) VALUES (?, ?, ?, ?)",  # nosec B608
+            (key, json.dumps(value), expires_at, etag),
+        )
+
+    def invalidate(self, key: str) -> None:
+        """
+        Remove an entry, if present.
+
+        :param key: str The resource endpoint path, with the query string for lists.
+        """
+        self._execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))  # nosec B608
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        """
+        Remove all entries whose key starts with `prefix`, e.g. every cached page of a list.
+
+        :param prefix: str The key prefix.
+        """
+        self._execute(f"DELETE FROM {self.table} WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))  # nosec B608
+
+    def purge_expired(self) -> None:
+        """
+        Remove all expired entries.
+        """
+        self._execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (time.time(),))  # nosec B608
+
+    def clear(self) -> None:
+        """
+        Remove all entries.
+        """
+        self._execute(f"DELETE FROM {self.table}")  # nosec B608
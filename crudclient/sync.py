@@ -0,0 +1,167 @@
+"""
+Module `sync.py`
+================
+
+This module defines the state stores used by `Crud.sync` to remember the high-water mark
+(the last seen `updated_since` timestamp or cursor) of each resource between runs.
+
+Class `SyncStateStore`
+----------------------
+
+The `SyncStateStore` class is the abstract interface of a state store. Implement `get` and
+`set` to persist the marks somewhere else, e.g. in a database you already use.
+
+Example:
+    store = SQLiteSyncStateStore("sync_state.db")
+    for contact in contacts_crud.sync(store):
+        upsert(contact)
+
+Classes:
+    - SyncStateStore: Abstract base class for high-water mark stores.
+    - MemorySyncStateStore: In-memory store, mainly for tests.
+    - FileSyncStateStore: Store backed by a JSON file.
+    - SQLiteSyncStateStore: Store backed by an SQLite database.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+
+class SyncStateStore(ABC):
+    """
+    Abstract base class for stores of sync high-water marks.
+
+    Marks are keyed by the resource endpoint path, e.g. `/companies/acme/contacts`.
+
+    Methods:
+        get: Return the stored mark for a resource.
+        set: Store the mark for a resource.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return the stored mark for a resource.
+
+        :param key: str The resource endpoint path.
+        :return: Optional[str] The stored mark, or None if the resource was never synced.
+        """
+
+    @abstractmethod
+    def set(self, key: str, value: str) -> None:
+        """
+        Store the mark for a resource.
+
+        :param key: str The resource endpoint path.
+        :param value: str The new mark.
+        """
+
+
+class MemorySyncStateStore(SyncStateStore):
+    """
+    In-memory sync state store. The marks are lost when the process exits.
+    """
+
+    def __init__(self) -> None:
+        self._marks: Dict[str, str] = {}
+
+    def get(self, key: str) -> Optional[str]:
+        return self._marks.get(key)
+
+    def set(self, key: str, value: str) -> None:
+        self._marks[key] = value
+
+
+class FileSyncStateStore(SyncStateStore):
+    """
+    Sync state store backed by a JSON file.
+
+    The file is rewritten atomically on every `set`, so an interrupted run never leaves a corrupt file.
+
+    :ivar path: str The path of the JSON file.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Initialize the FileSyncStateStore.
+
+        :param path: str The path of the JSON file. It is created on the first `set`.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, str]:
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._load().get(key)
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            marks = self._load()
+            marks[key] = value
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".sync-", suffix=".json")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as file:
+                    json.dump(marks, file, indent=2, sort_keys=True)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+
+class SQLiteSyncStateStore(SyncStateStore):
+    """
+    Sync state store backed by an SQLite database.
+
+    A new connection is opened per operation, so the store can be shared between threads and processes.
+
+    :ivar path: str The path of the SQLite database.
+    :ivar table: str The name of the table holding the marks.
+    """
+
+    def __init__(self, path: str, table: str = "crudclient_sync_state") -> None:
+        """
+        Initialize the SQLiteSyncStateStore and create its table if needed.
+
+        :param path: str The path of the SQLite database.
+        :param table: str The name of the table holding the marks.
+        """
+        self.path = path
+        self.table = table
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(f"CREATE TABLE IF NOT EXISTS {self.table} (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        finally:
+            connection.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key: str) -> Optional[str]:
+        connection = self._connect()
+        try:
+            row = connection.execute(f"SELECT value FROM {self.table} WHERE key = ?", (key,)).fetchone()  # nosec B608
+        finally:
+            connection.close()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str) -> None:
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(f"INSERT OR REPLACE INTO {self.table} (key, value) VALUES (?, ?)", (key, value))  # nosec B608
+        finally:
+            connection.close()
@@ -0,0 +1,377 @@
+"""
+Module `transport.py`
+=====================
+
+This module defines transports that replace the HTTP adapter of a `Client`, so that `Crud`
+workloads can be recorded once against a real API and then replayed offline, or sent straight
+into a local WSGI or ASGI app, for deterministic benchmarks and tests without network.
+
+Class `RecordingTransport`
+--------------------------
+
+The `RecordingTransport` class sends requests through a real adapter and appends every
+request/response pair to a JSON lines file.
+
+Class `ReplayTransport`
+-----------------------
+
+The `ReplayTransport` class loads a recording into memory and answers requests from it,
+matched on method, URL and body, optionally after an injected latency with jitter. Repeated
+requests are answered with the recorded responses in turn, cycling when they run out.
+
+Class `WSGITransport`
+---------------------
+
+The `WSGITransport` class calls a WSGI app in-process for every request, without sockets.
+
+Class `ASGITransport`
+---------------------
+
+The `ASGITransport` class runs an ASGI app in-process on an event loop in a background thread.
+Only the `http` scope is served; lifespan events are not sent.
+
+Example:
+    client = Client(FikenConfig(), transport=RecordingTransport("fiken.jsonl"))
+    run_workload(FikenAPI(client=client))
+
+    client = Client(FikenConfig(), transport=ReplayTransport("fiken.jsonl", latency=0.05, jitter=0.02, seed=1))
+    run_workload(FikenAPI(client=client))  # no network
+
+    client = Client(ClientConfig(hostname="http://testserver"), transport=WSGITransport(flask_app))
+
+Classes:
+    - RecordingTransport: Adapter recording request/response pairs to a file.
+    - ReplayTransport: Adapter replaying recorded responses from memory.
+    - WSGITransport: Adapter calling a WSGI app in-process.
+    - ASGITransport: Adapter calling an ASGI app in-process.
+"""
+
+import asyncio
+import base64
+import hashlib
+import io
+import json
+import random
+import sys
+import threading
+import time
+from http import HTTPStatus
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+RecordKey = Tuple[str, str, str]
+
+
+def _body_digest(body: Any) -> str:
+    """
+    Digest of a request body, used to match requests in a recording.
+    """
+    if body is None:
+        return ""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if not isinstance(body, bytes):
+        return "stream"
+    return hashlib.sha256(body).hexdigest()
+
+
+def _record_key(request: requests.PreparedRequest) -> RecordKey:
+    return (str(request.method).upper(), str(request.url), _body_digest(request.body))
+
+
+def _read_body(request: requests.PreparedRequest) -> bytes:
+    """
+    Read the body of a request into bytes, including streamed and file bodies.
+    """
+    body = request.body
+    if body is None:
+        return b""
+    if isinstance(body, str):
+        return body.encode("utf-8")
+    if isinstance(body, bytes):
+        return body
+    if hasattr(body, "read"):
+        return body.read()
+    return b"".join(chunk.encode("utf-8") if isinstance(chunk, str) else chunk for chunk in body)
+
+
+def _build_response(
+    adapter: BaseAdapter, request: requests.PreparedRequest, status: int, reason: str, headers: Iterable[Tuple[str, str]], content: bytes
+) -> requests.Response:
+    """
+    Build a response as returned by HTTPAdapter. Repeated headers are joined with commas.
+    """
+    response_headers: CaseInsensitiveDict = CaseInsensitiveDict()
+    for name, value in headers:
+        response_headers[name] = f"{response_headers[name]}, {value}" if name in response_headers else value
+
+    response = requests.Response()
+    response.status_code = status
+    response.reason = reason
+    response.headers = response_headers
+    response.encoding = get_encoding_from_headers(response_headers)
+    response._content = content
+    response._content_consumed = True  # type: ignore[attr-defined]
+    response.url = str(request.url)
+    response.request = request
+    response.connection = adapter  # type: ignore[assignment]
+    return response
+
+
+class RecordingTransport(BaseAdapter):
+    """
+    Transport sending requests through a real adapter and recording them to a JSON lines file.
+
+    :ivar path: str The path of the recording. New records are appended.
+    :ivar adapter: BaseAdapter The adapter sending the requests.
+    """
+
+    def __init__(self, path: str, adapter: Optional[BaseAdapter] = None) -> None:
+        """
+        Initialize the RecordingTransport.
+
+        :param path: str The path of the recording. New records are appended.
+        :param adapter: Optional[BaseAdapter] The adapter sending the requests. Defaults to a new HTTPAdapter.
+        """
+        super().__init__()
+        self.path = path
+        self.adapter: BaseAdapter = adapter or HTTPAdapter()
+        self._lock = threading.Lock()
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:  # type: ignore[override]
+        response = self.adapter.send(request, **kwargs)
+        method, url, body_digest = _record_key(request)
+        record = {
+            "method": method,
+            "url": url,
+            "body_sha256": body_digest,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+            "content": base64.b64encode(response.content).decode("ascii"),
+        }
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(json.dumps(record) + "\n")
+        return response
+
+    def close(self) -> None:
+        self.adapter.close()
+
+
+class ReplayTransport(BaseAdapter):
+    """
+    Transport answering requests from a recording made by `RecordingTransport`.
+
+    :ivar latency: float The injected latency per request in seconds.
+    :ivar jitter: float The maximum random deviation from the latency in seconds.
+    """
+
+    def __init__(self, path: str, latency: float = 0.0, jitter: float = 0.0, seed: Optional[int] = None) -> None:
+        """
+        Initialize the ReplayTransport and load the recording.
+
+        :param path: str The path of the recording.
+        :param latency: float The injected latency per request in seconds.
+        :param jitter: float The maximum random deviation from the latency in seconds.
+        :param seed: Optional[int] Seed of the jitter, for reproducible runs.
+        """
+        super().__init__()
+        self.latency = latency
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._records: Dict[RecordKey, List[Dict[str, Any]]] = {}
+        self._positions: Dict[RecordKey, int] = {}
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    record = json.loads(line)
+                    self._records.setdefault((record["method"], record["url"], record["body_sha256"]), []).append(record)
+
+    def _delay(self) -> float:
+        with self._lock:
+            deviation = self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+        return max(0.0, self.latency + deviation)
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:  # type: ignore[override]
+        key = _record_key(request)
+        with self._lock:
+            records = self._records.get(key)
+            if not records:
+                raise requests.ConnectionError(f"No recorded response for {key[0]} {key[1]}", request=request)
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+        record = records[position % len(records)]
+
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+
+        return _build_response(self, request, record["status"], record["reason"], record["headers"].items(), base64.b64decode(record["content"]))
+
+    def close(self) -> None:
+        pass
+
+
+class WSGITransport(BaseAdapter):
+    """
+    Transport calling a WSGI app in-process, without sockets.
+
+    :ivar app: Callable The WSGI app.
+    :ivar script_name: str The mount point of the app, removed from the start of request paths.
+    """
+
+    def __init__(self, app: Callable, script_name: str = "") -> None:
+        """
+        Initialize the WSGITransport.
+
+        :param app: Callable The WSGI app.
+        :param script_name: str The mount point of the app, removed from the start of request paths.
+        """
+        super().__init__()
+        self.app = app
+        self.script_name = script_name.rstrip("/")
+
+    def _environ(self, request: requests.PreparedRequest, body: bytes) -> Dict[str, Any]:
+        url = urlsplit(str(request.url))
+        path = unquote(url.path)
+        if self.script_name and path.startswith(self.script_name):
+            path = path[len(self.script_name) :]
+        environ: Dict[str, Any] = {
+            "REQUEST_METHOD": str(request.method).upper(),
+            "SCRIPT_NAME": self.script_name,
+            "PATH_INFO": path,
+            "QUERY_STRING": url.query,
+            "SERVER_NAME": url.hostname or "localhost",
+            "SERVER_PORT": str(url.port or (443 if url.scheme == "https" else 80)),
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "REMOTE_ADDR": "127.0.0.1",
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": url.scheme,
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        for name, value in request.headers.items():
+            key = name.upper().replace("-", "_")
+            if key == "CONTENT_TYPE":
+                environ["CONTENT_TYPE"] = value
+            elif key != "CONTENT_LENGTH":
+                environ[f"HTTP_{key}"] = value
+        return environ
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:  # type: ignore[override]
+        started: List[Any] = []
+
+        def start_response(status: str, headers: List[Tuple[str, str]], exc_info: Any = None) -> Callable[[bytes], None]:
+            if exc_info and started:
+                raise exc_info[1].with_traceback(exc_info[2])
+            started[:] = [status, headers]
+            return chunks.append
+
+        chunks: List[bytes] = []
+        result = self.app(self._environ(request, _read_body(request)), start_response)
+        try:
+            chunks.extend(result)
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+
+        status, headers = started
+        code, _, reason = status.partition(" ")
+        return _build_response(self, request, int(code), reason, headers, b"".join(chunks))
+
+    def close(self) -> None:
+        pass
+
+
+class ASGITransport(BaseAdapter):
+    """
+    Transport calling an ASGI app in-process, on an event loop in a background thread.
+
+    :ivar app: Callable The ASGI app.
+    :ivar root_path: str The mount point of the app.
+    """
+
+    def __init__(self, app: Callable, root_path: str = "") -> None:
+        """
+        Initialize the ASGITransport and start its event loop thread.
+
+        :param app: Callable The ASGI app.
+        :param root_path: str The mount point of the app.
+        """
+        super().__init__()
+        self.app = app
+        self.root_path = root_path.rstrip("/")
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="crudclient-asgi", daemon=True)
+        self._thread.start()
+
+    def _scope(self, request: requests.PreparedRequest) -> Dict[str, Any]:
+        url = urlsplit(str(request.url))
+        return {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": "1.1",
+            "method": str(request.method).upper(),
+            "scheme": url.scheme,
+            "path": unquote(url.path),
+            "raw_path": url.path.encode("ascii"),
+            "query_string": url.query.encode("ascii"),
+            "root_path": self.root_path,
+            "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in request.headers.items()],
+            "server": (url.hostname or "localhost", url.port or (443 if url.scheme == "https" else 80)),
+            "client": ("127.0.0.1", 0),
+        }
+
+    async def _call(self, request: requests.PreparedRequest, body: bytes) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        response_done = asyncio.Event()
+        request_sent = False
+        start: Dict[str, Any] = {}
+        chunks: List[bytes] = []
+
+        async def receive() -> Dict[str, Any]:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await response_done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_done.set()
+
+        await self.app(self._scope(request), receive, send)
+        response_done.set()
+        if "status" not in start:
+            raise RuntimeError("ASGI app returned without starting a response")
+        headers = [(name.decode("latin-1"), value.decode("latin-1")) for name, value in start.get("headers", [])]
+        return start["status"], headers, b"".join(chunks)
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:  # type: ignore[override]
+        future = asyncio.run_coroutine_threadsafe(self._call(request, _read_body(request)), self._loop)
+        status, headers, content = future.result(timeout=kwargs.get("timeout") if isinstance(kwargs.get("timeout"), (int, float)) else None)
+        try:
+            reason = HTTPStatus(status).phrase
+        except ValueError:
+            reason = ""
+        return _build_response(self, request, status, reason, headers, content)
+
+    def close(self) -> None:
+        if self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
@@ -1,6 +1,9 @@
-from typing import Any, Dict, List, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Union
+
+if TYPE_CHECKING:
+    from .spill import SpilledBody
 
 JSONDict = Dict[str, Any]
 JSONList = List[JSONDict]
-RawResponse = Union[JSONDict, JSONList, bytes, str]
-RawResponseSimple = Union[JSONDict, bytes, str]
+RawResponse = Union[JSONDict, JSONList, bytes, str, "SpilledBody"]
+RawResponseSimple = Union[JSONDict, bytes, str, "SpilledBody"]
@@ -0,0 +1,472 @@
+"""
+Module `upload.py`
+==================
+
+This module defines resumable uploads of large files: the file is split into parts that are
+uploaded in parallel, each part is retried on transient failures, and the progress is recorded
+in a checkpoint file so an interrupted upload continues where it stopped. Parts are retried by
+the upload only, never by the client's retry loop, so the attempts do not multiply.
+
+Class `ResumableUpload`
+-----------------------
+
+The `ResumableUpload` class drives one upload. It reads each part from disk only when it is
+sent, so at most `max_workers` parts are held in memory. With a `checkpoint` path, the upload
+state and the acknowledged parts are written to that file after every part; running the same
+upload again with the same checkpoint skips the acknowledged parts. The checkpoint is deleted
+when the upload completes, and ignored if the file, part size or endpoint changed.
+
+Class `UploadProtocol`
+----------------------
+
+The `UploadProtocol` class defines how an upload is started, how parts are sent and how the
+upload is completed. `MultipartUploadProtocol` implements S3-style multipart uploads with
+parallel parts; `TusUploadProtocol` implements the tus 1.0 resumable upload protocol, whose
+parts are sent in order. Subclass `UploadProtocol` for other APIs and set it as
+`_upload_protocol` on the `Crud` subclass.
+
+Example:
+    documents.upload("/data/scan.pdf", checkpoint="/tmp/scan.pdf.upload", max_workers=8)
+
+Classes:
+    - UploadPart: A part of an upload.
+    - UploadProtocol: Abstract base class for upload protocols.
+    - MultipartUploadProtocol: S3-style multipart uploads.
+    - TusUploadProtocol: tus 1.0 resumable uploads.
+    - ResumableUpload: Parallel, resumable upload of a file.
+"""
+
+import base64
+import json
+import logging
+import mimetypes
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional
+from urllib.parse import urljoin
+
+import requests
+
+from .types import JSONDict, RawResponse
+
+if TYPE_CHECKING:
+    from .client import Client
+    from .crud import Crud
+
+# Get a logger for this module
+logger = logging.getLogger(__name__)
+
+
+class UploadPart(NamedTuple):
+    """
+    A part of an upload.
+
+    :ivar number: int The 1-based number of the part.
+    :ivar offset: int The offset of the part in the file.
+    :ivar length: int The size of the part in bytes.
+    """
+
+    number: int
+    offset: int
+    length: int
+
+
+class UploadProtocol(ABC):
+    """
+    Abstract base class for upload protocols.
+
+    The state returned by `start` is stored in the checkpoint, so it must be JSON serializable,
+    as must the part results returned by `upload_part`.
+
+    :ivar parallel: bool Whether parts may be uploaded concurrently and out of order.
+
+    Methods:
+        endpoint: Return the endpoint of uploads for a resource.
+        start: Start an upload.
+        resume: Reconcile the acknowledged parts of a resumed upload with the server.
+        upload_part: Upload a part.
+        complete: Complete an upload.
+        abort: Abort an upload.
+    """
+
+    parallel: bool = True
+
+    def endpoint(self, crud: "Crud", parent_id: Optional[str] = None) -> str:
+        """
+        Return the endpoint of uploads. Defaults to the `uploads` action of the resource.
+
+        :param crud: Crud The resource receiving the upload.
+        :param parent_id: Optional[str] ID of the parent resource for nested resources.
+        :return: str The endpoint path.
+        """
+        return crud._get_endpoint(parent_id, "uploads")
+
+    @abstractmethod
+    def start(self, client: "Client", endpoint: str, size: int, part_size: int, metadata: Dict[str, str]) -> JSONDict:
+        """
+        Start an upload.
+
+        :param client: Client The client.
+        :param endpoint: str The endpoint of uploads.
+        :param size: int The size of the file in bytes.
+        :param part_size: int The size of the parts in bytes.
+        :param metadata: Dict[str, str] The filename and content type of the file.
+        :return: JSONDict The state of the upload, passed to the other methods.
+        """
+
+    def resume(self, client: "Client", state: JSONDict, completed: Dict[int, Any], parts: List[UploadPart]) -> Dict[int, Any]:
+        """
+        Reconcile the acknowledged parts of a resumed upload with the server. Returns them unchanged by default.
+
+        :param client: Client The client.
+        :param state: JSONDict The state of the upload.
+        :param completed: Dict[int, Any] The results of the acknowledged parts, by part number.
+        :param parts: List[UploadPart] All parts of the upload.
+        :return: Dict[int, Any] The results of the parts that need not be uploaded again.
+        """
+        return completed
+
+    @abstractmethod
+    def upload_part(self, client: "Client", state: JSONDict, part: UploadPart, data: bytes) -> Any:
+        """
+        Upload a part.
+
+        Parts are retried by `ResumableUpload`, so send them with `idempotent=False` to keep the
+        client from retrying them as well, which would multiply the attempts.
+
+        :param client: Client The client.
+        :param state: JSONDict The state of the upload.
+        :param part: UploadPart The part.
+        :param data: bytes The content of the part.
+        :return: Any The result of the part, passed to `complete`.
+        """
+
+    @abstractmethod
+    def complete(self, client: "Client", state: JSONDict, results: List[Any]) -> RawResponse:
+        """
+        Complete an upload.
+
+        :param client: Client The client.
+        :param state: JSONDict The state of the upload.
+        :param results: List[Any] The results of all parts, in order.
+        :return: RawResponse The response of the API, e.g. the created resource.
+        """
+
+    def abort(self, client: "Client", state: JSONDict) -> None:
+        """
+        Abort an upload, releasing its parts on the server. Does nothing by default.
+
+        :param client: Client The client.
+        :param state: JSONDict The state of the upload.
+        """
+
+
+class MultipartUploadProtocol(UploadProtocol):
+    """
+    S3-style multipart uploads with parallel parts:
+
+    - `POST {endpoint}` with `{"filename", "content_type", "size", "part_size"}` returns the upload ID under `id_field`,
+    - `PUT {endpoint}/{upload_id}/parts/{number}` uploads a part; its ETag is taken from the header or an `etag` field,
+    - `POST {endpoint}/{upload_id}/complete` with `{"parts": [{"number", "etag"}, ...]}` completes the upload,
+    - `DELETE {endpoint}/{upload_id}` aborts it.
+    """
+
+    def __init__(self, id_field: str = "upload_id", parts_path: str = "parts", complete_path: str = "complete") -> None:
+        """
+        Initialize the MultipartUploadProtocol.
+
+        :param id_field: str The response field holding the upload ID.
+        :param parts_path: str The path segment of parts.
+        :param complete_path: str The path segment of the complete action.
+        """
+        self.id_field = id_field
+        self.parts_path = parts_path
+        self.complete_path = complete_path
+
+    def start(self, client: "Client", endpoint: str, size: int, part_size: int, metadata: Dict[str, str]) -> JSONDict:
+        response = client._request("POST", endpoint, json={**metadata, "size": size, "part_size": part_size})
+        if not isinstance(response, dict) or self.id_field not in response:
+            raise ValueError(f"Expected an upload with {self.id_field!r}, got: {response!r}")
+        return {"endpoint": endpoint.rstrip("/"), "upload_id": str(response[self.id_field])}
+
+    def upload_part(self, client: "Client", state: JSONDict, part: UploadPart, data: bytes) -> Any:
+        endpoint = f"{state['endpoint']}/{state['upload_id']}/{self.parts_path}/{part.number}"
+        response = client._request("PUT", endpoint, idempotent=False, data=data, headers={"Content-Type": "application/octet-stream"})
+        last_response = client.last_response
+        etag = last_response.headers.get("ETag") if last_response is not None else None
+        if etag is None and isinstance(response, dict):
+            etag = response.get("etag")
+        return {"number": part.number, "etag": etag}
+
+    def complete(self, client: "Client", state: JSONDict, results: List[Any]) -> RawResponse:
+        return client._request("POST", f"{state['endpoint']}/{state['upload_id']}/{self.complete_path}", json={"parts": results})
+
+    def abort(self, client: "Client", state: JSONDict) -> None:
+        client._request("DELETE", f"{state['endpoint']}/{state['upload_id']}")
+
+
+class TusUploadProtocol(UploadProtocol):
+    """
+    tus 1.0 resumable uploads (core protocol and creation extension). Parts are sent in order
+    with `PATCH` requests to the upload URL; after a failure, the offset is read from the server
+    with `HEAD` and the upload continues from there. Completing returns the upload URL.
+    """
+
+    parallel = False
+    version = "1.0.0"
+
+    def _headers(self, **headers: str) -> Dict[str, str]:
+        return {"Tus-Resumable": self.version, **{name.replace("_", "-"): value for name, value in headers.items()}}
+
+    def _server_offset(self, client: "Client", state: JSONDict) -> int:
+        client._request("HEAD", url=state["url"], headers=self._headers())
+        assert client.last_response is not None  # for mypy
+        return int(client.last_response.headers["Upload-Offset"])
+
+    def start(self, client: "Client", endpoint: str, size: int, part_size: int, metadata: Dict[str, str]) -> JSONDict:
+        encoded = ",".join(f"{key} {base64.b64encode(value.encode('utf-8')).decode('ascii')}" for key, value in metadata.items() if value)
+        client._request("POST", endpoint, headers=self._headers(Upload_Length=str(size), Upload_Metadata=encoded))
+        response = client.last_response
+        if response is None or "Location" not in response.headers:
+            raise ValueError("The tus server did not return the upload URL")
+        return {"url": urljoin(response.url, response.headers["Location"]), "offset": 0}
+
+    def resume(self, client: "Client", state: JSONDict, completed: Dict[int, Any], parts: List[UploadPart]) -> Dict[int, Any]:
+        state["offset"] = self._server_offset(client, state)
+        return {part.number: {"offset": part.offset + part.length} for part in parts if part.offset + part.length <= state["offset"]}
+
+    def upload_part(self, client: "Client", state: JSONDict, part: UploadPart, data: bytes) -> Any:
+        if state.get("offset") is None:
+            state["offset"] = self._server_offset(client, state)
+        start = max(part.offset, state["offset"])
+        if start < part.offset + part.length:
+            headers = self._headers(Upload_Offset=str(start), Content_Type="application/offset+octet-stream")
+            try:
+                client._request("PATCH", url=state["url"], idempotent=False, data=data[start - part.offset :], headers=headers)
+            except requests.RequestException:
+                # The server may have stored part of the data; ask it on the next attempt
+                state["offset"] = None
+                raise
+            assert client.last_response is not None  # for mypy
+            state["offset"] = int(client.last_response.headers["Upload-Offset"])
+        return {"offset": state["offset"]}
+
+    def complete(self, client: "Client", state: JSONDict, results: List[Any]) -> RawResponse:
+        return state["url"]
+
+    def abort(self, client: "Client", state: JSONDict) -> None:
+        client._request("DELETE", url=state["url"], headers=self._headers())
+
+
+class ResumableUpload:
+    """
+    Parallel, resumable upload of a file.
+
+    :ivar client: Client The client.
+    :ivar endpoint: str The endpoint of uploads.
+    :ivar path: str The path of the file.
+    :ivar protocol: UploadProtocol The upload protocol.
+    :ivar part_size: int The size of the parts in bytes.
+    :ivar max_workers: int The maximum number of concurrent part uploads.
+    :ivar retries: int The number of retries of a part on transient failures. The client does not retry parts itself.
+    :ivar retry_backoff: float The base delay in seconds between retries, doubled on every attempt.
+    :ivar checkpoint: Optional[str] The path of the checkpoint file, or None to not persist progress.
+
+    Methods:
+        run: Upload the file, resuming from the checkpoint.
+        abort: Abort the upload and delete the checkpoint.
+    """
+
+    def __init__(
+        self,
+        client: "Client",
+        endpoint: str,
+        path: str | os.PathLike,
+        protocol: Optional[UploadProtocol] = None,
+        part_size: int = 8 * 1024 * 1024,
+        max_workers: int = 4,
+        retries: int = 3,
+        retry_backoff: float = 0.5,
+        checkpoint: Optional[str | os.PathLike] = None,
+        filename: Optional[str] = None,
+        content_type: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize the ResumableUpload.
+
+        :param client: Client The client.
+        :param endpoint: str The endpoint of uploads.
+        :param path: Union[str, os.PathLike] The path of the file.
+        :param protocol: Optional[UploadProtocol] The upload protocol. Defaults to MultipartUploadProtocol.
+        :param part_size: int The size of the parts in bytes.
+        :param max_workers: int The maximum number of concurrent part uploads. Ignored by sequential protocols.
+        :param retries: int The number of retries of a part on transient failures.
+        :param retry_backoff: float The base delay in seconds between retries, doubled on every attempt.
+        :param checkpoint: Optional[Union[str, os.PathLike]] The path of the checkpoint file, or None to not persist progress.
+        :param filename: Optional[str] The filename sent to the API. Defaults to the name of the file.
+        :param content_type: Optional[str] The content type sent to the API. Guessed from the filename by default.
+        :raises ValueError: If part_size or max_workers is smaller than 1.
+        """
+        if part_size < 1 or max_workers < 1:
+            raise ValueError("part_size and max_workers must be at least 1")
+
+        self.client = client
+        self.endpoint = endpoint
+        self.path = os.fspath(path)
+        self.protocol = protocol or MultipartUploadProtocol()
+        self.part_size = part_size
+        self.max_workers = max_workers
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.checkpoint = os.fspath(checkpoint) if checkpoint is not None else None
+        self.filename = filename or os.path.basename(self.path)
+        self.content_type = content_type or mimetypes.guess_type(self.filename)[0] or "application/octet-stream"
+
+        self._lock = threading.Lock()
+        self._failed = threading.Event()
+        self._state: Optional[JSONDict] = None
+        self._completed: Dict[int, Any] = {}
+
+    def _fingerprint(self) -> JSONDict:
+        """
+        Identify the file and settings of the upload, to detect stale checkpoints.
+        """
+        stat = os.stat(self.path)
+        return {
+            "path": os.path.abspath(self.path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "part_size": self.part_size,
+            "endpoint": self.endpoint,
+            "protocol": type(self.protocol).__name__,
+        }
+
+    def _load_checkpoint(self, fingerprint: JSONDict) -> Optional[JSONDict]:
+        if self.checkpoint is None or not os.path.exists(self.checkpoint):
+            return None
+        try:
+            with open(self.checkpoint, encoding="utf-8") as file:
+                checkpoint = json.load(file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable upload checkpoint {self.checkpoint}: {e}")
+            return None
+        if checkpoint.get("fingerprint") != fingerprint:
+            logger.warning(f"Ignoring upload checkpoint {self.checkpoint}, as the file or upload settings changed")
+            return None
+        return checkpoint
+
+    def _save_checkpoint(self, fingerprint: JSONDict) -> None:
+        """
+        Write the checkpoint atomically. Must be called with the lock held.
+        """
+        if self.checkpoint is None:
+            return
+        temporary = f"{self.checkpoint}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(
+                {"fingerprint": fingerprint, "state": self._state, "parts": {str(number): result for number, result in self._completed.items()}}, file
+            )
+        os.replace(temporary, self.checkpoint)
+
+    def _parts(self, size: int) -> List[UploadPart]:
+        offsets = range(0, size, self.part_size) if size else range(1)
+        return [UploadPart(number, offset, min(self.part_size, size - offset)) for number, offset in enumerate(offsets, start=1)]
+
+    def _read(self, part: UploadPart) -> bytes:
+        with open(self.path, "rb") as file:
+            file.seek(part.offset)
+            return file.read(part.length)
+
+    def _is_transient(self, error: Exception) -> bool:
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return True
+        response = getattr(error, "response", None)
+        return isinstance(error, requests.HTTPError) and response is not None and response.status_code in self.client._retry_status_codes
+
+    def _upload_part(self, part: UploadPart, fingerprint: JSONDict) -> None:
+        assert self._state is not None  # for mypy
+        if self._failed.is_set():
+            return
+        data = self._read(part)
+        for attempt in range(1, self.retries + 2):
+            try:
+                result = self.protocol.upload_part(self.client, self._state, part, data)
+            except Exception as e:
+                if attempt > self.retries or not self._is_transient(e):
+                    self._failed.set()
+                    raise
+                logger.warning(f"Retrying part {part.number} of {self.path} (attempt {attempt}/{self.retries}): {e}")
+                time.sleep(self.retry_backoff * 2 ** (attempt - 1))
+            else:
+                break
+        with self._lock:
+            self._completed[part.number] = result
+            self._save_checkpoint(fingerprint)
+
+    @property
+    def uploaded(self) -> int:
+        """The number of bytes in acknowledged parts."""
+        with self._lock:
+            completed = set(self._completed)
+        return sum(part.length for part in self._parts(os.path.getsize(self.path)) if part.number in completed)
+
+    def run(self) -> RawResponse:
+        """
+        Upload the file, skipping the parts acknowledged in the checkpoint.
+
+        If a part fails after its retries, the parts in flight are finished, the remaining ones are
+        cancelled and the error is raised; the checkpoint is kept, so running again resumes.
+
+        :return: RawResponse The response of the API to completing the upload.
+        """
+        fingerprint = self._fingerprint()
+        parts = self._parts(fingerprint["size"])
+
+        checkpoint = self._load_checkpoint(fingerprint)
+        if checkpoint is not None:
+            self._state = checkpoint["state"]
+            completed = {int(number): result for number, result in checkpoint["parts"].items()}
+            self._completed = self.protocol.resume(self.client, self._state, completed, parts)
+            logger.info(f"Resuming upload of {self.path} with {len(self._completed)} of {len(parts)} parts done")
+        else:
+            metadata = {"filename": self.filename, "content_type": self.content_type}
+            self._state = self.protocol.start(self.client, self.endpoint, fingerprint["size"], self.part_size, metadata)
+            self._completed = {}
+        with self._lock:
+            self._save_checkpoint(fingerprint)
+
+        self._failed.clear()
+        pending = [part for part in parts if part.number not in self._completed]
+        max_workers = self.max_workers if self.protocol.parallel else 1
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="crudclient-upload") as executor:
+            futures = [executor.submit(self._upload_part, part, fingerprint) for part in pending]
+            try:
+                for future in futures:
+                    future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        result = self.protocol.complete(self.client, self._state, [self._completed[part.number] for part in parts])
+        if self.checkpoint is not None and os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)
+        return result
+
+    def abort(self) -> None:
+        """
+        Abort the upload, started by `run` or recorded in the checkpoint, and delete the checkpoint.
+        """
+        state = self._state
+        if state is None and self.checkpoint is not None and os.path.exists(self.checkpoint):
+            with open(self.checkpoint, encoding="utf-8") as file:
+                state = json.load(file)["state"]
+        if state is not None:
+            self.protocol.abort(self.client, state)
+        if self.checkpoint is not None and os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)
+        self._state = None
+        self._completed = {}
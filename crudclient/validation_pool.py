@@ -0,0 +1,277 @@
+"""
+Module `validation_pool.py`
+===========================
+
+This module defines the ProcessValidationPool class, which decodes and validates large list
+responses into datamodel instances in worker processes, so that CPU-bound validation of big
+pages runs on several cores instead of holding the GIL of the fetching thread.
+
+Class `ProcessValidationPool`
+-----------------------------
+
+The `ProcessValidationPool` class takes the raw JSON body of a list response, which the main
+thread does not decode, and validates its items in chunks, one chunk per worker process of a
+`ProcessPoolExecutor`. The body is placed in shared memory once; every worker decodes it and
+validates its own slice of the items, so decoding, which is cheap next to validation, is done
+in every worker while validation is split among them. The validated items travel back as
+plain field values, from which the datamodel instances are rebuilt with `model_construct`,
+without validating them again. Bodies shorter than `min_bytes` are validated inline, as the
+round trip to the worker processes would cost more than it saves.
+
+The workers are started with the `spawn` start method by default, which is safe in threaded
+programs, so the datamodel must be importable by the worker processes, i.e. defined at module
+level.
+
+Example:
+    pool = ProcessValidationPool(max_workers=4)
+    api = FikenAPI(client_config=FikenConfig(), validation_pool=pool)
+    for contact in api.contacts.bind(company_slug="acme-as").iter_all():
+        ...  # every page is validated by four processes
+
+Classes:
+    - ProcessValidationPool: Process pool for decoding and validating list responses.
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel, TypeAdapter
+
+# Get a logger for this module
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(datamodel: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[datamodel])  # type: ignore[valid-type]
+
+
+class _PackedModel(NamedTuple):
+    """
+    The field values of a validated model, as sent back from the worker processes.
+    """
+
+    model: Type[BaseModel]
+    values: Dict[str, Any]
+    fields_set: FrozenSet[str]
+
+
+def _pack(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        values = {name: _pack(field_value) for name, field_value in value.__dict__.items()}
+        values.update({name: _pack(extra_value) for name, extra_value in (value.__pydantic_extra__ or {}).items()})
+        return _PackedModel(type(value), values, frozenset(value.model_fields_set))
+    if isinstance(value, list):
+        return [_pack(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _pack(item) for key, item in value.items()}
+    return value
+
+
+def _unpack(value: Any) -> Any:
+    if isinstance(value, _PackedModel):
+        values = {name: _unpack(field_value) for name, field_value in value.values.items()}
+        return value.model.model_construct(_fields_set=set(value.fields_set), **values)
+    if isinstance(value, list):
+        return [_unpack(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _unpack(item) for key, item in value.items()}
+    return value
+
+
+def _decode_page(content: bytes, list_keys: Sequence[str]) -> Tuple[List[Any], Optional[Dict[str, Any]]]:
+    """
+    Decode a list response into its items and, for an object, the other keys of the object.
+    """
+    data = json.loads(content)
+    if isinstance(data, list):
+        return data, None
+    if isinstance(data, dict):
+        for key in list_keys:
+            if key in data:
+                return data[key], {name: value for name, value in data.items() if name != key}
+    raise ValueError(f"Unexpected response format: {data}")
+
+
+def _validate_slice(
+    datamodel: Type[BaseModel], content: bytes, list_keys: Sequence[str], index: int, count: int
+) -> Tuple[Optional[Dict[str, Any]], List[BaseModel]]:
+    """
+    Decode a list response and validate slice `index` of `count` of its items.
+    """
+    items, envelope = _decode_page(content, list_keys)
+    start, stop = len(items) * index // count, len(items) * (index + 1) // count
+    return envelope if index == 0 else None, _list_adapter(datamodel).validate_python(items[start:stop])
+
+
+def _validate_shared_slice(
+    datamodel: Type[BaseModel], name: str, size: int, list_keys: Sequence[str], index: int, count: int
+) -> Tuple[Optional[Dict[str, Any]], List[_PackedModel]]:
+    """
+    Validate a slice of a list response held in shared memory, and pack the items. Runs in the worker processes.
+    """
+    shared = SharedMemory(name=name)
+    try:
+        assert shared.buf is not None  # for mypy
+        content = bytes(shared.buf[:size])
+    finally:
+        shared.close()
+    envelope, models = _validate_slice(datamodel, content, list_keys, index, count)
+    return envelope, [_pack(model) for model in models]
+
+
+def _release_when_done(shared: SharedMemory, futures: List[Future]) -> None:
+    """
+    Free the shared memory of a body once all chunks of it are validated.
+    """
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def done(_: Future) -> None:
+        with lock:
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        shared.close()
+        shared.unlink()
+
+    for future in futures:
+        future.add_done_callback(done)
+
+
+class ProcessValidationPool:
+    """
+    Process pool decoding and validating list responses into datamodel instances.
+
+    :ivar max_workers: Optional[int] The number of worker processes. Defaults to the number of CPUs.
+    :ivar min_bytes: int The size of the smallest response body sent to the worker processes.
+    :ivar mp_context: str The multiprocessing start method of the worker processes.
+
+    Methods:
+        submit: Start validating a list response in chunks.
+        envelope: Wait for the keys of the response object besides the items.
+        gather: Wait for the items validated by `submit`.
+        validate: Validate a list response.
+        close: Shut down the worker processes.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, min_bytes: int = 256 * 1024, mp_context: str = "spawn") -> None:
+        """
+        Initialize the ProcessValidationPool. The worker processes are started on first use.
+
+        :param max_workers: Optional[int] The number of worker processes, and of chunks per body. Defaults to the number of CPUs.
+        :param min_bytes: int The size of the smallest response body sent to the worker processes; smaller bodies are validated inline.
+        :param mp_context: str The multiprocessing start method, "spawn" or "forkserver". Forking a threaded program is unsafe.
+        :raises ValueError: If max_workers is smaller than 1 or the start method is not available.
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if mp_context not in multiprocessing.get_all_start_methods():
+            raise ValueError(f"Start method {mp_context!r} is not available on this platform")
+
+        self.max_workers = max_workers
+        self.min_bytes = min_bytes
+        self.mp_context = mp_context
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context(self.mp_context))
+        return self._executor
+
+    def submit(self, datamodel: Type[BaseModel], content: bytes, list_keys: Sequence[str] = ()) -> List[Future]:
+        """
+        Start validating a list response and return without waiting for the result.
+
+        The body is split into one chunk of items per worker process; the chunks are validated in parallel.
+
+        :param datamodel: Type[BaseModel] The module-level datamodel to validate into.
+        :param content: bytes The raw JSON body of the response.
+        :param list_keys: Sequence[str] The keys holding the items when the body is an object.
+        :return: List[Future] One future per chunk, in the order of the items, to be passed to `envelope` and `gather`.
+        """
+        if len(content) < self.min_bytes:
+            future: Future = Future()
+            try:
+                future.set_result(_validate_slice(datamodel, content, tuple(list_keys), 0, 1))
+            except Exception as e:
+                future.set_exception(e)
+            return [future]
+
+        count = self.max_workers or os.cpu_count() or 1
+        executor = self._get_executor()
+        shared = SharedMemory(create=True, size=len(content))
+        try:
+            assert shared.buf is not None  # for mypy
+            shared.buf[: len(content)] = content
+            futures = [
+                executor.submit(_validate_shared_slice, datamodel, shared.name, len(content), tuple(list_keys), index, count)
+                for index in range(count)
+            ]
+        except BaseException:
+            shared.close()
+            shared.unlink()
+            raise
+        logger.debug(f"Validating {len(content)} bytes of {datamodel.__name__} items in {count} chunks")
+        _release_when_done(shared, futures)
+        return futures
+
+    @staticmethod
+    def envelope(futures: List[Future]) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the first chunk of `submit` and return the keys of the response object besides the items,
+        e.g. its pagination links.
+
+        :param futures: List[Future] The futures returned by `submit`.
+        :return: Optional[Dict[str, Any]] The other keys, or None if the body is a list.
+        :raises ValueError: If the body is not a list or has none of the list keys.
+        """
+        return futures[0].result()[0]
+
+    @staticmethod
+    def gather(futures: List[Future]) -> List[BaseModel]:
+        """
+        Wait for the chunks of `submit` and rebuild the datamodel instances.
+
+        :param futures: List[Future] The futures returned by `submit`.
+        :return: List[BaseModel] The datamodel instances, in the order of the items.
+        :raises pydantic.ValidationError: If an item is invalid.
+        :raises ValueError: If the body is not a list or has none of the list keys.
+        """
+        return [_unpack(item) for future in futures for item in future.result()[1]]
+
+    def validate(self, datamodel: Type[BaseModel], content: bytes, list_keys: Sequence[str] = ()) -> List[BaseModel]:
+        """
+        Validate a list response.
+
+        :param datamodel: Type[BaseModel] The module-level datamodel to validate into.
+        :param content: bytes The raw JSON body of the response.
+        :param list_keys: Sequence[str] The keys holding the items when the body is an object.
+        :return: List[BaseModel] The datamodel instances, in the order of the items.
+        :raises pydantic.ValidationError: If an item is invalid.
+        :raises ValueError: If the body is not a list or has none of the list keys.
+        """
+        return self.gather(self.submit(datamodel, content, list_keys))
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Shut down the worker processes.
+
+        :param wait: bool Wait for running validations to finish.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def __enter__(self) -> "ProcessValidationPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,173 @@
+"""
+Module `write_behind.py`
+========================
+
+This module defines the WriteBehindQueue class, which decouples producers from API latency
+by queueing `Crud` writes and sending them from background worker threads.
+
+Class `WriteBehindQueue`
+------------------------
+
+The `WriteBehindQueue` class accepts `create`, `update`, `partial_update`, `destroy` and
+`custom_action` calls, returns a `concurrent.futures.Future` for each of them immediately and
+drains the queue with a pool of worker threads. The queue is bounded: when it is full,
+producers block until a worker frees a slot.
+
+Example:
+    with contacts_crud.write_behind(max_pending=500, workers=8) as writes:
+        futures = [writes.create(contact) for contact in incoming]
+    created = [future.result() for future in futures]
+
+Classes:
+    - WriteBehindQueue: Bounded background queue for Crud writes.
+"""
+
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .crud import Crud
+
+# Get a logger for this module
+logger = logging.getLogger(__name__)
+
+_WorkItem = Tuple[Future, Callable[..., Any], tuple, dict]
+
+
+class WriteBehindQueue:
+    """
+    Bounded queue of Crud writes drained by background worker threads.
+
+    The workers share the Crud client and its connection pool; keep `workers` at or below the
+    pool size of the client's HTTP adapter (10 by default) to avoid opening extra connections.
+
+    :ivar crud: Crud The resource the writes are sent to.
+    :ivar max_pending: int The maximum number of queued writes before producers block.
+    :ivar workers: int The number of worker threads.
+
+    Methods:
+        submit: Queue a call of a Crud method.
+        create: Queue a `create` call.
+        update: Queue an `update` call.
+        partial_update: Queue a `partial_update` call.
+        destroy: Queue a `destroy` call.
+        custom_action: Queue a `custom_action` call.
+        flush: Wait until every queued write has been sent.
+        close: Stop the worker threads.
+    """
+
+    def __init__(self, crud: "Crud", max_pending: int = 1000, workers: int = 4) -> None:
+        """
+        Initialize the WriteBehindQueue and start its worker threads.
+
+        :param crud: Crud The resource the writes are sent to.
+        :param max_pending: int The maximum number of queued writes before producers block.
+        :param workers: int The number of worker threads.
+        :raises ValueError: If max_pending or workers is smaller than 1.
+        """
+        if max_pending < 1 or workers < 1:
+            raise ValueError("max_pending and workers must be at least 1")
+
+        self.crud = crud
+        self.max_pending = max_pending
+        self.workers = workers
+        self._queue: "queue.Queue[Optional[_WorkItem]]" = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self._threads: List[threading.Thread] = []
+        for index in range(workers):
+            thread = threading.Thread(target=self._work, name=f"crudclient-write-behind-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self) -> None:
+        """
+        Worker loop: send queued writes until a stop sentinel is received.
+        """
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                future, func, args, kwargs = item
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(func(*args, **kwargs))
+                except BaseException as e:
+                    logger.warning(f"Write-behind call {getattr(func, '__name__', func)} failed: {e}")
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    def submit(self, method: str, *args: Any, **kwargs: Any) -> Future:
+        """
+        Queue a call of a Crud method, blocking while the queue is full.
+
+        :param method: str The name of the Crud method, e.g. "create".
+        :param args: Positional arguments for the method.
+        :param kwargs: Keyword arguments for the method.
+        :return: Future The future receiving the result of the call.
+        :raises RuntimeError: If the queue is closed.
+        :raises ValueError: If the method is not allowed on the resource.
+        """
+        if self._closed:
+            raise RuntimeError("Cannot submit to a closed write-behind queue")
+
+        func = getattr(self.crud, method, None)
+        if func is None:
+            raise ValueError(f"Method {method!r} is not allowed on {type(self.crud).__name__}")
+
+        future: Future = Future()
+        self._queue.put((future, func, args, kwargs))
+        return future
+
+    def create(self, *args: Any, **kwargs: Any) -> Future:
+        """Queue a `Crud.create` call."""
+        return self.submit("create", *args, **kwargs)
+
+    def update(self, *args: Any, **kwargs: Any) -> Future:
+        """Queue a `Crud.update` call."""
+        return self.submit("update", *args, **kwargs)
+
+    def partial_update(self, *args: Any, **kwargs: Any) -> Future:
+        """Queue a `Crud.partial_update` call."""
+        return self.submit("partial_update", *args, **kwargs)
+
+    def destroy(self, *args: Any, **kwargs: Any) -> Future:
+        """Queue a `Crud.destroy` call."""
+        return self.submit("destroy", *args, **kwargs)
+
+    def custom_action(self, *args: Any, **kwargs: Any) -> Future:
+        """Queue a `Crud.custom_action` call."""
+        return self.submit("custom_action", *args, **kwargs)
+
+    def flush(self) -> None:
+        """
+        Wait until every queued write has been sent and its future resolved.
+        """
+        self._queue.join()
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stop accepting writes and stop the worker threads once the queue is drained.
+
+        :param wait: bool Wait for the worker threads to finish.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def __enter__(self) -> "WriteBehindQueue":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.flush()
+        self.close()
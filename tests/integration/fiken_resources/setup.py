@@ -19,38 +19,26 @@ class FikenConfig(ClientConfig):
 
 
 class FikenCrud(Crud[T]):
-
-    _company_slug: str | None = None
-
-    def _endpoint_prefix(self) -> tuple[str | None] | list[str | None]:
-        return ["companies", self._company_slug]
-
-    def bind_company(self, company_slug: str):
-        self._company_slug = company_slug
-        return self
+    _endpoint_prefix_template: Optional[tuple[str, ...]] = ("companies", "{company_slug}")
 
 
 class FikenUser(FikenCrud[User]):
     _resource_path = "user"
     _datamodel = User
+    _endpoint_prefix_template = None
     allowed_actions = ["read"]
 
     def read(self, *args, **kwargs) -> User:
         response = super().custom_action(action="", method="get")
         return cast(User, response)
 
-    def _endpoint_prefix(self) -> tuple[str | None] | list[str | None]:
-        return [""]
-
 
 class FikenCompanies(FikenCrud[Company]):
     _resource_path = "companies"
     _datamodel = Company
+    _endpoint_prefix_template = None
     allowed_actions = ["list"]
 
-    def _endpoint_prefix(self) -> tuple[str | None] | list[str | None]:
-        return [""]
-
 
 class FikenContacts(FikenCrud[Contact]):
     _resource_path = "contacts"
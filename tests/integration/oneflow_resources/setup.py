@@ -2,9 +2,10 @@ import os
 from typing import Any, Dict, List, Optional
 
 from crudclient.api import API
+from crudclient.batch import BatchEncoder, BatchOperation
 from crudclient.client import Client, ClientConfig
 from crudclient.crud import Crud
-from crudclient.types import JSONDict
+from crudclient.types import JSONDict, RawResponse
 
 from .models import DataField, DataFieldsResponse, TemplateType, TemplateTypesResponse, User, UsersResponse
 
@@ -38,6 +39,26 @@ class OneflowTemplateTypes(Crud[TemplateType]):
     data_fields: "OneflowDataFields | None" = None
 
 
+class OneflowDataFieldsBatchEncoder(BatchEncoder):
+    """Data fields are updated in bulk by a PUT of `{"data_fields": [...]}` to the template type."""
+
+    method = "put"
+    operations = frozenset({"update"})
+
+    def endpoint(self, crud: Crud, parent_id: str | None = None) -> str:
+        if parent_id is None:
+            raise ValueError("Parent id is required for updating data fields")
+        return crud._get_endpoint(parent_args=(parent_id,))
+
+    def encode(self, operations: List[BatchOperation]) -> JSONDict:
+        return {"data_fields": [{**(operation.data or {}), "custom_id": operation.resource_id} for operation in operations]}
+
+    def decode(self, response: RawResponse, operations: List[BatchOperation]) -> List[Any]:
+        assert isinstance(response, dict)
+        by_custom_id = {item["custom_id"]: item for item in response["data_fields"]}
+        return [by_custom_id.get(operation.resource_id, ValueError("Invalid return from api")) for operation in operations]
+
+
 class OneflowDataFields(Crud[DataField]):
 
     _resource_path = "data_fields"
@@ -46,22 +67,19 @@ class OneflowDataFields(Crud[DataField]):
 
     _methods: List[str] = ["update", "destroy"]
     _parent_resource = OneflowTemplateTypes
+    _batch_encoder = OneflowDataFieldsBatchEncoder()
 
-    def update(self, resource_id: str, data: Dict[str, Any] | DataField, parent_id: str | None = None) -> DataField | JSONDict:
+    def update(
+        self, resource_id: str, data: Dict[str, Any] | DataField, parent_id: str | None = None, if_match: str | None = None
+    ) -> DataField | JSONDict:
         if parent_id is None:
             raise ValueError("Parent id is required for updating data fields")
+        if if_match is not None:
+            raise ValueError("Data fields are updated in batches, which do not support If-Match")
 
-        converted_data: JSONDict = self._dump_data(data)
-
-        converted_data["custom_id"] = resource_id
-        passable_data = {"data_fields": [converted_data]}
-        endpoint = self._get_endpoint(parent_args=(parent_id,))
-        response = self.client.put(endpoint, json=passable_data)
-        assert isinstance(response, dict)
-        for i in response["data_fields"]:
-            if i["custom_id"] == converted_data["custom_id"]:
-                return DataField.model_validate(i)
-        raise ValueError("Invalid return from api")
+        with self.batch(parent_id) as batch:
+            future = batch.update(resource_id, data)
+        return future.result()
 
 
 class OneflowAPI(API):
@@ -35,7 +35,7 @@ def test_list_companies(api):
 
 
 def test_list_contacts(api):
-    contacts = api.contacts.bind_company("fiken-demo-faktisk-plante-as2").list()
+    contacts = api.contacts.bind(company_slug="fiken-demo-faktisk-plante-as2").list()
     assert isinstance(contacts, list)
     assert len(contacts) > 0
     assert all(isinstance(contact, Contact) for contact in contacts)
@@ -4,6 +4,7 @@ import pytest
 import requests_mock
 
 from crudclient.api import API
+from crudclient.cache import EntityCache
 from crudclient.client import Client, ClientConfig
 from crudclient.crud import Crud
 from crudclient.exceptions import ClientInitializationError, InvalidClientError
@@ -191,3 +192,11 @@ class TestAPI:
         requests_mocker.post(f"{standard_data.get('full_url')}/4/activate", json={"status": "activated"})
         response = api.test_resource.custom_action("activate", resource_id="4")
         assert response == {"status": "activated"}
+
+    def test_entity_cache_shared_with_resources(self, mock_client_config):
+        # Test that the entity cache is passed to the registered resources through the client
+        cache = EntityCache()
+        api = MockAPI(client_config=mock_client_config, entity_cache=cache)
+        assert api.client.entity_cache is cache
+        assert api.test_resource.cache is cache
+        assert api.api_kwargs == {}
@@ -0,0 +1,100 @@
+import threading
+import time
+
+import pytest
+import requests
+import requests_mock
+
+from crudclient.auth import ClientCredentialsTokenProvider, OAuth2TokenProvider, RefreshTokenProvider
+from crudclient.client import Client
+
+from .test_config import MockClientConfig
+
+TOKEN_URL = "https://auth.example.com/token"
+
+
+class TestOAuth2TokenProvider:
+    @pytest.fixture
+    def mock_request(self):
+        with requests_mock.Mocker() as m:
+            yield m
+
+    def test_base_provider_is_abstract(self):
+        with pytest.raises(TypeError):
+            OAuth2TokenProvider(TOKEN_URL)  # type: ignore[abstract]
+
+    def test_token_is_cached(self, mock_request):
+        mock_request.post(TOKEN_URL, json={"access_token": "t1", "expires_in": 3600})
+        provider = ClientCredentialsTokenProvider(TOKEN_URL, "id", "secret", scope="read")
+
+        assert provider.token() == "t1"
+        assert provider.token() == "t1"
+        assert mock_request.call_count == 1
+        assert "grant_type=client_credentials" in mock_request.last_request.text
+        assert "scope=read" in mock_request.last_request.text
+        assert mock_request.last_request.headers["Authorization"].startswith("Basic ")
+
+    def test_single_flight_refresh(self, mock_request):
+        def slow_token(request, context):
+            time.sleep(0.05)
+            return {"access_token": "t1", "expires_in": 3600}
+
+        mock_request.post(TOKEN_URL, json=slow_token)
+        provider = ClientCredentialsTokenProvider(TOKEN_URL, "id", "secret")
+        tokens = []
+        threads = [threading.Thread(target=lambda: tokens.append(provider.token())) for _ in range(50)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert tokens == ["t1"] * 50
+        assert mock_request.call_count == 1
+
+    def test_proactive_refresh_within_margin(self, mock_request):
+        mock_request.post(TOKEN_URL, [{"json": {"access_token": "t1", "expires_in": 30}}, {"json": {"access_token": "t2", "expires_in": 3600}}])
+        provider = ClientCredentialsTokenProvider(TOKEN_URL, "id", "secret", refresh_margin=60)
+
+        assert provider.token() == "t1"
+        assert provider.token() == "t2"
+        assert mock_request.call_count == 2
+
+    def test_failed_proactive_refresh_keeps_valid_token(self, mock_request):
+        mock_request.post(TOKEN_URL, [{"json": {"access_token": "t1", "expires_in": 30}}, {"status_code": 500}])
+        provider = ClientCredentialsTokenProvider(TOKEN_URL, "id", "secret", refresh_margin=60)
+
+        assert provider.token() == "t1"
+        assert provider.token() == "t1"
+
+    def test_refresh_token_rotation(self, mock_request):
+        mock_request.post(TOKEN_URL, json={"access_token": "t1", "refresh_token": "r2"})
+        provider = RefreshTokenProvider(TOKEN_URL, "r1", client_id="public")
+
+        assert provider.token() == "t1"
+        assert "refresh_token=r1" in mock_request.last_request.text
+        assert "client_id=public" in mock_request.last_request.text
+        assert provider.refresh_token == "r2"
+
+    def test_client_retries_once_on_401(self, mock_request):
+        mock_request.post(TOKEN_URL, [{"json": {"access_token": "t1"}}, {"json": {"access_token": "t2"}}])
+        mock_request.get(
+            "https://api.example.com/v1/users", [{"status_code": 401}, {"json": {"ok": True}, "headers": {"Content-Type": "application/json"}}]
+        )
+        provider = ClientCredentialsTokenProvider(TOKEN_URL, "id", "secret")
+
+        class OAuthConfig(MockClientConfig):
+            def auth(self):
+                return provider
+
+        client = Client(OAuthConfig())
+        assert client.get("/users") == {"ok": True}
+        assert mock_request.last_request.headers["Authorization"] == "Bearer t2"
+
+    def test_persistent_401_is_raised(self, mock_request):
+        mock_request.post(TOKEN_URL, json={"access_token": "t1"})
+        mock_request.get("https://api.example.com/v1/users", status_code=401)
+        client = Client(MockClientConfig()).with_auth(ClientCredentialsTokenProvider(TOKEN_URL, "id", "secret"))
+
+        with pytest.raises(requests.HTTPError):
+            client.get("/users")
+        assert sum(request.url.endswith("/users") for request in mock_request.request_history) == 2
@@ -0,0 +1,61 @@
+import base64
+import json
+
+import pytest
+import requests_mock
+
+from crudclient.__main__ import main
+from crudclient.bench import BenchResult, run_bench
+from crudclient.client import Client
+from crudclient.crud import Crud
+
+from .test_config import MockClientConfig
+
+BASE_URL = "https://api.example.com/v1"
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class ItemsCrud(Crud[dict]):
+    _resource_path = "items"
+
+
+class TestBench:
+    def test_percentile(self):
+        latencies = [float(value) for value in range(1, 101)]
+        assert BenchResult.percentile(latencies, 50) == 50.0
+        assert BenchResult.percentile(latencies, 99) == 99.0
+        assert BenchResult.percentile([], 95) == 0.0
+
+    def test_run_bench_mixes_reads_and_writes(self):
+        with requests_mock.Mocker() as mock_request:
+            mock_request.get(f"{BASE_URL}/items", headers=JSON_HEADERS, json={"data": [], "next": "items?page=2"})
+            mock_request.get(f"{BASE_URL}/items?page=2", headers=JSON_HEADERS, json={"data": [], "next": None})
+            mock_request.post(f"{BASE_URL}/items", status_code=500, headers=JSON_HEADERS, json={})
+
+            result = run_bench(ItemsCrud(Client(MockClientConfig())), concurrency=2, duration=0.2, write_ratio=0.5, pages=2, payload={}, seed=1)
+
+        assert result.latencies["read"]
+        assert result.errors[("write", "HTTPError")] > 0
+        assert result.total == len(result.latencies["read"]) + sum(result.errors.values())
+        assert "p99 ms" in result.report()
+
+    def test_writes_require_payload(self):
+        with pytest.raises(ValueError):
+            run_bench(ItemsCrud(Client(MockClientConfig())), write_ratio=0.5)
+
+    def test_cli_against_replayed_url(self, tmp_path, capsys):
+        path = tmp_path / "recording.jsonl"
+        record = {
+            "method": "GET",
+            "url": "http://localhost:8000/items",
+            "body_sha256": "",
+            "status": 200,
+            "reason": "OK",
+            "headers": JSON_HEADERS,
+            "content": base64.b64encode(json.dumps([{"id": 1}]).encode()).decode(),
+        }
+        path.write_text(json.dumps(record) + "\n")
+
+        exit_code = main(["bench", "http://localhost:8000/items", "--replay", str(path), "--duration", "0.1", "--concurrency", "2"])
+        assert exit_code == 0
+        assert "throughput" in capsys.readouterr().out
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+import pytest
+
+from crudclient.cache import EntityCache
+
+
+class TestEntityCache:
+    def test_get_and_set(self):
+        cache = EntityCache()
+        cache.set("/users/1", {"id": 1})
+        assert cache.get("/users/1") == {"id": 1}
+        assert "/users/1" in cache
+        assert cache.get("/users/2") is None
+
+    def test_lru_eviction(self):
+        cache = EntityCache(maxsize=2)
+        cache.set("/users/1", 1)
+        cache.set("/users/2", 2)
+        cache.get("/users/1")
+        cache.set("/users/3", 3)
+        assert cache.get("/users/2") is None
+        assert cache.get("/users/1") == 1
+        assert cache.get("/users/3") == 3
+        assert len(cache) == 2
+
+    def test_ttl_expiry(self):
+        cache = EntityCache(ttl=10)
+        with patch("crudclient.cache.time.monotonic", return_value=100.0):
+            cache.set("/users/1", 1)
+        with patch("crudclient.cache.time.monotonic", return_value=105.0):
+            assert cache.get("/users/1") == 1
+        with patch("crudclient.cache.time.monotonic", return_value=110.0):
+            assert cache.get("/users/1") is None
+        assert len(cache) == 0
+
+    def test_invalidate_and_clear(self):
+        cache = EntityCache()
+        cache.set("/users/1", 1)
+        cache.set("/users/2", 2)
+        cache.invalidate("/users/1")
+        assert cache.get("/users/1") is None
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_invalid_maxsize(self):
+        with pytest.raises(ValueError):
+            EntityCache(maxsize=0)
+
+    def test_etag_is_kept_with_entry(self):
+        cache = EntityCache()
+        cache.set("/users/1", {"id": 1}, etag='"v1"')
+        assert cache.get_etag("/users/1") == '"v1"'
+        cache.invalidate("/users/1")
+        assert cache.get_etag("/users/1") is None
@@ -1,7 +1,9 @@
 import pytest
+import requests
 import requests_mock
 
 from crudclient.client import Client
+from crudclient.spill import SpilledBody
 
 from .test_config import MockClientConfig
 
@@ -91,3 +93,76 @@ class TestClient:
         # Test the close method
         client.close()
         assert client.session.close() is None
+
+    def test_idempotent_post_is_retried(self, client, mock_request):
+        # Test that an idempotent POST is retried on transient failures with the same headers
+        client.config.retry_backoff = 0
+        url = f"{client.base_url}/users"
+        mock_request.post(url, [{"status_code": 503}, {"exc": requests.ConnectionError}, {"json": {"id": 1}, "status_code": 201}])
+
+        response = client.post("/users", json={"name": "John Doe"}, headers={"Idempotency-Key": "abc"}, idempotent=True)
+        assert response == '{"id": 1}'
+        assert mock_request.call_count == 3
+        assert {request.headers["Idempotency-Key"] for request in mock_request.request_history} == {"abc"}
+
+    def test_post_is_not_retried_by_default(self, client, mock_request):
+        # Test that a plain POST is sent only once
+        mock_request.post(f"{client.base_url}/users", status_code=503)
+
+        with pytest.raises(requests.HTTPError):
+            client.post("/users", json={"name": "John Doe"})
+        assert mock_request.call_count == 1
+
+    def test_with_auth_shares_session_and_replaces_credentials(self, client, mock_request):
+        mock_request.get(f"{client.base_url}/users", json={})
+        tenant = client.with_auth({"X-Tenant-Token": "tenant-a"}, headers={"X-Tenant": "a"})
+
+        tenant.get("/users")
+        headers = mock_request.last_request.headers
+        assert tenant.session is client.session
+        assert headers["X-Tenant-Token"] == "tenant-a"
+        assert headers["X-Tenant"] == "a"
+        assert "Authorization" not in headers
+
+        client.get("/users")
+        assert mock_request.last_request.headers["Authorization"] == "Bearer token"
+        assert "X-Tenant" not in mock_request.last_request.headers
+
+    def test_with_auth_basic_and_close(self, client, mock_request):
+        mock_request.get(f"{client.base_url}/users", json={})
+        tenant = client.with_auth(("user", "pass"))
+
+        tenant.get("/users")
+        assert mock_request.last_request.headers["Authorization"].startswith("Basic ")
+        tenant.close()
+        client.get("/users")
+        with pytest.raises(TypeError):
+            client.with_auth(lambda session: None)
+
+    def test_large_responses_are_spilled(self, client, mock_request):
+        client.config.spill_threshold = 16
+        payload = b"x" * 100
+        mock_request.get(f"{client.base_url}/export", content=payload, headers={"Content-Type": "application/octet-stream"})
+        mock_request.get(f"{client.base_url}/rows", json={"rows": list(range(20))}, headers={"Content-Type": "application/json"})
+        mock_request.get(f"{client.base_url}/small", content=b"tiny", headers={"Content-Type": "application/octet-stream"})
+
+        with client.get("/export") as export:
+            assert isinstance(export, SpilledBody)
+            assert bytes(export) == payload
+        assert client.get("/rows") == {"rows": list(range(20))}
+        assert client.get("/small") == b"tiny"
+        assert mock_request.last_request.stream
+
+    def test_files_are_streamed_with_boundary(self, client, mock_request):
+        mock_request.post(f"{client.base_url}/attachments", json={"id": 1}, headers={"Content-Type": "application/json"})
+        mock_request.put(f"{client.base_url}/attachments", json={"id": 1}, headers={"Content-Type": "application/json"})
+
+        client.post("/attachments", data={"name": "log"}, files={"file": ("log.txt", iter([b"a", b"b"]))}, headers={"X-Request": "1"})
+        request = mock_request.last_request
+        assert request.headers["Content-Type"] == request.body.content_type
+        assert request.headers["Transfer-Encoding"] == "chunked"
+        assert request.headers["X-Request"] == "1"
+        assert client.session.headers.get("Content-Type") != "multipart/form-data"
+
+        client.put("/attachments", files={"file": b"abc"})
+        assert int(mock_request.last_request.headers["Content-Length"]) == mock_request.last_request.body.len
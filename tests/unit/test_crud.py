@@ -0,0 +1,746 @@
+from datetime import date
+from typing import List, Optional
+
+import pytest
+import requests
+import requests_mock
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+from crudclient.cache import EntityCache
+from crudclient.client import Client
+from crudclient.columnar import Columns
+from crudclient.crud import Crud
+from crudclient.exceptions import BatchItemError, ConflictError
+from crudclient.store import SQLiteStore
+from crudclient.sync import MemorySyncStateStore, SQLiteSyncStateStore
+from crudclient.validation_pool import ProcessValidationPool
+
+from .test_config import MockClientConfig
+
+BASE_URL = "https://api.example.com/v1"
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+    price: Optional[float] = None
+    created: date = Field(..., alias="createdDate")
+
+
+class ItemsCrud(Crud[Item]):
+    _resource_path = "items"
+    _datamodel = Item
+
+
+class RawItemsCrud(Crud[dict]):
+    _resource_path = "items"
+
+
+class TaggedItem(BaseModel):
+    id: int = Field(..., gt=0)
+    code: str
+    tags: List[str] = Field(default_factory=list)
+
+    @field_validator("code")
+    @classmethod
+    def upper_code(cls, value: str) -> str:
+        return value.upper()
+
+
+class TaggedItemsCrud(Crud[TaggedItem]):
+    _resource_path = "items"
+    _datamodel = TaggedItem
+
+
+class ConstrainedItem(BaseModel):
+    id: int = Field(..., gt=0)
+
+
+class ConstrainedItemsCrud(Crud[ConstrainedItem]):
+    _resource_path = "items"
+    _datamodel = ConstrainedItem
+
+
+ITEMS = [
+    {"id": 1, "name": "first", "price": 1.5, "createdDate": "2024-01-01"},
+    {"id": 2, "name": "second", "createdDate": "2024-01-02"},
+]
+
+
+class TestCrudColumns:
+    @pytest.fixture
+    def client(self):
+        return Client(MockClientConfig())
+
+    @pytest.fixture
+    def mock_request(self):
+        with requests_mock.Mocker() as m:
+            yield m
+
+    def test_iter_all_follows_links(self, client, mock_request):
+        mock_request.get(
+            f"{BASE_URL}/items", headers=JSON_HEADERS, json={"data": ITEMS[:1], "_links": {"next": {"href": f"{BASE_URL}/items?page=2"}}}
+        )
+        mock_request.get(f"{BASE_URL}/items?page=2", headers=JSON_HEADERS, json={"data": ITEMS[1:], "_links": {"next": None}})
+
+        items = list(ItemsCrud(client).iter_all())
+        assert [item.id for item in items] == [1, 2]
+        assert all(isinstance(item, Item) for item in items)
+
+    def test_iter_all_relative_next(self, client, mock_request):
+        mock_request.get(f"{BASE_URL}/items", headers=JSON_HEADERS, json={"results": ITEMS[:1], "next": "items?page=2"})
+        mock_request.get(f"{BASE_URL}/items?page=2", headers=JSON_HEADERS, json={"results": ITEMS[1:], "next": None})
+
+        assert [item["id"] for item in RawItemsCrud(client).iter_all()] == [1, 2]
+
+    def test_list_columns_typed(self, client, mock_request):
+        mock_request.get(f"{BASE_URL}/items", headers=JSON_HEADERS, json={"data": ITEMS})
+
+        columns = ItemsCrud(client).list_columns()
+        assert isinstance(columns, Columns)
+        assert len(columns) == 2
+        assert list(columns) == ["id", "name", "price", "created"]
+        assert columns["id"] == [1, 2]
+        assert columns["price"] == [1.5, None]
+        assert columns["created"] == [date(2024, 1, 1), date(2024, 1, 2)]
+        assert columns.types["id"] is int
+
+    def test_list_columns_untyped(self, client, mock_request):
+        mock_request.get(f"{BASE_URL}/items", headers=JSON_HEADERS, json=ITEMS)
+
+        columns = RawItemsCrud(client).list_columns()
+        assert columns["price"] == [1.5, None]
+        assert columns["createdDate"] == ["2024-01-01", "2024-01-02"]
+
+    def test_iter_all_columns_concat(self, client, mock_request):
+        mock_request.get(f"{BASE_URL}/items", headers=JSON_HEADERS, json={"data": ITEMS[:1], "next": f"{BASE_URL}/items?page=2"})
+        mock_request.get(f"{BASE_URL}/items?page=2", headers=JSON_HEADERS, json={"data": ITEMS[1:]})
+
+        pages = list(ItemsCrud(client).iter_all_columns())
+        assert len(pages) == 2
+        assert Columns.concat(pages).to_dict()["name"] == ["first", "second"]
+
+    def test_list_columns_keeps_constraints_validators_and_defaults(self, client, mock_request):
+        mock_request.get(f"{BASE_URL}/items", headers=JSON_HEADERS, json=[{"id": 1, "code": "ab"}, {"id": 2, "code": "cd"}])
+
+        columns = TaggedItemsCrud(client).list_columns()
+        assert columns["tags"] == [[], []]
+        assert columns["tags"][0] is not columns["tags"][1]
+        assert columns["code"] == ["AB", "CD"]
+
+        mock_request.get(f"{BASE_URL}/items", headers=JSON_HEADERS, json=[{"id": 0, "code": "ab"}])
+        with pytest.raises(ValidationError):
+            TaggedItemsCrud(client).list_columns()
+        with pytest.raises(ValidationError):
+            ConstrainedItemsCrud(client).list_columns()
+
+    def test_columns_to_numpy(self):
+        numpy = pytest.importorskip("numpy")
+        columns = Columns({"id": [1, 2], "price": [1.5, None]}, {"id": int, "price": Optional[float]})
+        arrays = columns.to_numpy()
+        assert arrays["id"].dtype == numpy.int64
+        assert arrays["price"].dtype == object
+
+
+class TestCrudEntityCache:
+    @pytest.fixture
+    def client(self):
+        return Client(MockClientConfig())
+
+    @pytest.fixture
+    def mock_request(self):
+        with requests_mock.Mocker() as m:
+            yield m
+
+    def test_read_is_cached(self, client, mock_request):
+        mock_request.get(f"{BASE_URL}/items/1", headers=JSON_HEADERS, json=ITEMS[0])
+        crud = ItemsCrud(client, cache=EntityCache())
+
+        first = crud.read("1")
+        assert crud.read("1") is first
+        assert mock_request.call_count == 1
+
+    def test_list_and_create_fill_cache(self, client, mock_request):
+        mock_request.get(f"{BASE_URL}/items", headers=JSON_HEADERS, json={"data": ITEMS})
+        mock_request.post(f"{BASE_URL}/items", headers=JSON_HEADERS, json={**ITEMS[0], "id": 3})
+        crud = ItemsCrud(client, cache=EntityCache())
+
+        crud.list()
+        crud.create({"name": "third"})
+        assert crud.read("2").name == "second"
+        assert crud.read(3).id == 3
+        assert mock_request.call_count == 2
+
+    def test_writes_invalidate(self, client, mock_request):
+        mock_request.get(f"{BASE_URL}/items/1", headers=JSON_HEADERS, json=ITEMS[0])
+        mock_request.patch(f"{BASE_URL}/items/1", headers=JSON_HEADERS, json={**ITEMS[0], "name": "patched"})
+        mock_request.put(f"{BASE_URL}/items/1", headers=JSON_HEADERS, json={**ITEMS[0], "name": "updated"})
+        mock_request.delete(f"{BASE_URL}/items/1")
+        crud = ItemsCrud(client, cache=EntityCache())
+
+        crud.read("1")
+        crud.partial_update("1", {"name": "patched"})
+        crud.read("1")
+        assert mock_request.call_count == 3
+
+        crud.update("1", {"name": "updated"})
+        assert crud.read("1").name == "updated"
+        assert mock_request.call_count == 4
+
+        crud.destroy("1")
+        crud.read("1")
+        assert mock_request.call_count == 6
+
+    def test_client_cache_is_shared(self, client, mock_request):
+        mock_request.get(f"{BASE_URL}/items/1", headers=JSON_HEADERS, json=ITEMS[0])
+        client.entity_cache = EntityCache()
+
+        ItemsCrud(client).read("1")
+        ItemsCrud(client).read("1")
+        assert mock_request.call_count == 1
+
+
+class TestCrudPartialUpdateDiff:
+    @pytest.fixture
+    def client(self):
+        return Client(MockClientConfig())
+
+    @pytest.fixture
+    def mock_request(self):
+        with requests_mock.Mocker() as m:
+            yield m
+
+    def test_sends_only_changed_fields(self, client, mock_request):
+        mock_request.patch(f"{BASE_URL}/items/1", headers=JSON_HEADERS, json={**ITEMS[0], "name": "renamed"})
+        original = Item.model_validate(ITEMS[0])
+        modified = original.model_copy(update={"name": "renamed"})
+
+        result = ItemsCrud(client).partial_update("1", modified, original=original)
+        assert result.name == "renamed"
+        assert mock_request.last_request.json() == {"name": "renamed"}
+
+    def test_skips_request_without_changes(self, client, mock_request):
+        original = Item.model_validate(ITEMS[0])
+
+        result = ItemsCrud(client).partial_update("1", original.model_copy(), original=original)
+        assert result is original
+        assert mock_request.call_count == 0
+
+    def test_diff_against_dict(self, client, mock_request):
+        mock_request.patch(f"{BASE_URL}/items/1", headers=JSON_HEADERS, json={"id": 1, "price": 2.0})
+
+        RawItemsCrud(client).partial_update("1", {"id": 1, "price": 2.0}, original={"id": 1, "price": 1.5})
+        assert mock_request.last_request.json() == {"price": 2.0}
+
+    def test_exclude_unset(self, client, mock_request):
+        mock_request.patch(f"{BASE_URL}/items/1", headers=JSON_HEADERS, json=ITEMS[0])
+
+        ItemsCrud(client).partial_update("1", Item.model_construct(name="first"), exclude_unset=True)
+        assert mock_request.last_request.json() == {"name": "first"}
+
+
+class TestCrudFields:
+    @pytest.fixture
+    def client(self):
+        return Client(MockClientConfig())
+
+    @pytest.fixture
+    def mock_request(self):
+        with requests_mock.Mocker() as m:
+            yield m
+
+    def test_list_with_fields(self, client, mock_request):
+        mock_request.get(f"{BASE_URL}/items", headers=JSON_HEADERS, json={"data": [{"id": 1, "name": "first"}]})
+
+        items = ItemsCrud(client).list(fields=["id", "name"])
+        assert mock_request.last_request.qs == {"fields": ["id,name"]}
+        assert items[0].name == "first"
+        assert set(type(items[0]).model_fields) == {"id", "name"}
+
+    def test_read_with_fields_bypasses_cache(self, client, mock_request):
+        mock_request.get(f"{BASE_URL}/items/1", headers=JSON_HEADERS, json={"createdDate": "2024-01-01"})
+        crud = ItemsCrud(client, cache=EntityCache())
+
+        item = crud.read("1", fields=["createdDate"])
+        assert item.created == date(2024, 1, 1)
+        assert crud.cache is not None and len(crud.cache) == 0
+
+    def test_iter_all_with_fields(self, client, mock_request):
+        mock_request.get(f"{BASE_URL}/items", headers=JSON_HEADERS, json=[{"id": 1}, {"id": 2}])
+
+        assert [item.id for item in ItemsCrud(client).iter_all(params={"q": "x"}, fields=["id"])] == [1, 2]
+        assert mock_request.last_request.qs == {"q": ["x"], "fields": ["id"]}
+
+
+class TestCrudSync:
+    @pytest.fixture
+    def client(self):
+        return Client(MockClientConfig())
+
+    @pytest.fixture
+    def mock_request(self):
+        with requests_mock.Mocker() as m:
+            yield m
+
+    def test_sync_stores_and_sends_mark(self, client, mock_request):
+        store = MemorySyncStateStore()
+        crud = RawItemsCrud(client)
+        mock_request.get(
+            f"{BASE_URL}/items",
+            headers=JSON_HEADERS,
+            json=[{"id": 1, "updated_at": "2024-01-02T00:00:00"}, {"id": 2, "updated_at": "2024-01-03T00:00:00"}],
+        )
+
+        assert [item["id"] for item in crud.sync(store)] == [1, 2]
+        assert "updated_since" not in mock_request.last_request.qs
+        assert store.get("/items") == "2024-01-03T00:00:00"
+
+        mock_request.get(f"{BASE_URL}/items", headers=JSON_HEADERS, json=[])
+        assert list(crud.sync(store)) == []
+        assert mock_request.last_request.qs["updated_since"] == ["2024-01-03t00:00:00"]
+        assert store.get("/items") == "2024-01-03T00:00:00"
+
+    def test_sync_compares_marks_as_values(self, client):
+        crud = RawItemsCrud(client)
+        mark = None
+        for value in ["9", "10", "2"]:
+            mark = crud._sync_high_water_mark({"updated_at": value}, mark)
+        assert mark == "10"
+        mark = crud._sync_high_water_mark({"updated_at": "2024-01-02T01:00:00+02:00"}, "2024-01-01T23:30:00.500Z")
+        assert mark == "2024-01-01T23:30:00.500Z"
+
+    def test_sync_defaults_to_sqlite_store(self, client, mock_request, tmp_path):
+        client.config.sync_state_path = str(tmp_path / "state" / "sync.db")
+        mock_request.get(f"{BASE_URL}/items", headers=JSON_HEADERS, json=[{"id": 1, "updated_at": 5}])
+
+        assert len(list(RawItemsCrud(client).sync())) == 1
+        assert SQLiteSyncStateStore(client.config.sync_state_path).get(f"{BASE_URL}/items") == "5"
+
+
+class TestCrudPersistentStore:
+    @pytest.fixture
+    def store(self, tmp_path):
+        return SQLiteStore(str(tmp_path / "store.db"))
+
+    @pytest.fixture
+    def mock_request(self):
+        with requests_mock.Mocker() as m:
+            yield m
+
+    def test_read_survives_new_client(self, store, mock_request):
+        mock_request.get(f"{BASE_URL}/items/1", headers=JSON_HEADERS, json=ITEMS[0])
+
+        ItemsCrud(Client(MockClientConfig()), store=store).read("1")
+        item = ItemsCrud(Client(MockClientConfig()), store=store).read("1")
+        assert item.name == "first"
+        assert mock_request.call_count == 1
+
+    def test_list_is_stored_per_params(self, store, mock_request):
+        mock_request.get(f"{BASE_URL}/items", headers=JSON_HEADERS, json={"data": ITEMS})
+        crud = ItemsCrud(Client(MockClientConfig()), store=store)
+
+        crud.list(params={"page": 1})
+        assert [item.id for item in crud.list(params={"page": 1})] == [1, 2]
+        assert crud.read("2").name == "second"
+        assert mock_request.call_count == 1
+
+        crud.list(params={"page": 2})
+        assert mock_request.call_count == 2
+
+    def test_writes_invalidate_lists(self, store, mock_request):
+        mock_request.get(f"{BASE_URL}/items", headers=JSON_HEADERS, json={"data": ITEMS})
+        mock_request.delete(f"{BASE_URL}/items/1")
+        crud = ItemsCrud(Client(MockClientConfig()), store=store)
+
+        crud.list()
+        crud.destroy("1")
+        assert store.get("/items/1") is None
+        crud.list()
+        assert mock_request.call_count == 3
+
+
+class IdempotentItemsCrud(RawItemsCrud):
+    _idempotency_keys = True
+
+
+class TestCrudIdempotencyKeys:
+    @pytest.fixture
+    def client(self):
+        client = Client(MockClientConfig())
+        client.config.retry_backoff = 0
+        return client
+
+    @pytest.fixture
+    def mock_request(self):
+        with requests_mock.Mocker() as m:
+            yield m
+
+    def test_generated_key_is_stable_across_retries(self, client, mock_request):
+        mock_request.post(f"{BASE_URL}/items", [{"status_code": 502}, {"headers": JSON_HEADERS, "json": {"id": 1}}])
+
+        assert IdempotentItemsCrud(client).create({"name": "first"}) == {"id": 1}
+        keys = [request.headers["Idempotency-Key"] for request in mock_request.request_history]
+        assert len(keys) == 2 and keys[0] == keys[1]
+
+    def test_new_key_per_call(self, client, mock_request):
+        mock_request.post(f"{BASE_URL}/items", headers=JSON_HEADERS, json={"id": 1})
+        crud = IdempotentItemsCrud(client)
+
+        crud.create({"name": "first"})
+        crud.create({"name": "first"})
+        first, second = (request.headers["Idempotency-Key"] for request in mock_request.request_history)
+        assert first != second
+
+    def test_explicit_key_and_default_off(self, client, mock_request):
+        mock_request.post(f"{BASE_URL}/items", headers=JSON_HEADERS, json={"id": 1})
+        crud = RawItemsCrud(client)
+
+        crud.create({"name": "first"})
+        assert "Idempotency-Key" not in mock_request.last_request.headers
+        crud.create({"name": "first"}, idempotency_key="import-42")
+        assert mock_request.last_request.headers["Idempotency-Key"] == "import-42"
+
+    def test_custom_action_post(self, client, mock_request):
+        mock_request.post(f"{BASE_URL}/items/1/send", [{"status_code": 503}, {"headers": JSON_HEADERS, "json": {"sent": True}}])
+
+        assert IdempotentItemsCrud(client).custom_action("send", resource_id="1") == {"sent": True}
+        assert mock_request.call_count == 2
+
+
+class TestCrudOptimisticConcurrency:
+    @pytest.fixture
+    def client(self):
+        return Client(MockClientConfig())
+
+    @pytest.fixture
+    def mock_request(self):
+        with requests_mock.Mocker() as m:
+            yield m
+
+    def test_read_captures_etag_and_update_sends_it(self, client, mock_request):
+        mock_request.get(f"{BASE_URL}/items/1", headers={**JSON_HEADERS, "ETag": '"v1"'}, json={"id": 1})
+        mock_request.put(f"{BASE_URL}/items/1", headers={**JSON_HEADERS, "ETag": '"v2"'}, json={"id": 1})
+        crud = RawItemsCrud(client)
+
+        crud.read("1")
+        assert crud.get_etag("1") == '"v1"'
+        crud.update("1", {"name": "x"})
+        assert mock_request.last_request.headers["If-Match"] == '"v1"'
+        assert crud.get_etag("1") == '"v2"'
+
+    def test_conflict_on_412(self, client, mock_request):
+        mock_request.get(f"{BASE_URL}/items/1", headers={**JSON_HEADERS, "ETag": '"v1"'}, json={"id": 1})
+        mock_request.patch(f"{BASE_URL}/items/1", status_code=412, headers=JSON_HEADERS, json={"error": "stale"})
+        crud = RawItemsCrud(client)
+
+        crud.read("1")
+        with pytest.raises(ConflictError) as exc_info:
+            crud.partial_update("1", {"name": "x"})
+        assert exc_info.value.etag == '"v1"'
+        assert crud.get_etag("1") is None
+
+    def test_cached_and_stored_reads_restore_etag(self, client, mock_request, tmp_path):
+        mock_request.get(f"{BASE_URL}/items/1", headers={**JSON_HEADERS, "ETag": '"v1"'}, json={"id": 1})
+        mock_request.put(f"{BASE_URL}/items/1", headers=JSON_HEADERS, json={"id": 1})
+        cache, store = EntityCache(), SQLiteStore(str(tmp_path / "store.db"))
+        RawItemsCrud(client, cache=cache, store=store).read("1")
+
+        for crud in (RawItemsCrud(client, cache=cache), RawItemsCrud(client, store=store)):
+            crud.read("1")
+            crud.update("1", {"name": "x"})
+            assert mock_request.last_request.headers["If-Match"] == '"v1"'
+        assert mock_request.call_count == 3
+
+    def test_no_if_match_without_etag(self, client, mock_request):
+        mock_request.patch(f"{BASE_URL}/items/1", headers=JSON_HEADERS, json={"id": 1})
+
+        crud = RawItemsCrud(client)
+        crud.partial_update("1", {"name": "x"})
+        assert "If-Match" not in mock_request.last_request.headers
+        RawItemsCrud(client).partial_update("1", {"name": "x"}, if_match='"v9"')
+        assert mock_request.last_request.headers["If-Match"] == '"v9"'
+
+
+class Variant(BaseModel):
+    id: int
+    sku: str
+
+
+class Product(BaseModel):
+    id: int
+    name: str
+    variants: list[Variant] = []
+
+
+class ProductsCrud(Crud[Product]):
+    _resource_path = "products"
+    _datamodel = Product
+
+
+class VariantsCrud(Crud[Variant]):
+    _resource_path = "variants"
+    _datamodel = Variant
+    _parent_resource = ProductsCrud
+
+
+class RawProductsCrud(Crud[dict]):
+    _resource_path = "products"
+
+
+class RawVariantsCrud(Crud[dict]):
+    _resource_path = "variants"
+    _parent_resource = RawProductsCrud
+
+
+class ReadOnlyVariantsCrud(RawVariantsCrud):
+    _methods = ["read"]
+
+
+class TestCrudInclude:
+    @pytest.fixture
+    def client(self):
+        return Client(MockClientConfig())
+
+    @pytest.fixture
+    def mock_request(self):
+        with requests_mock.Mocker() as m:
+            yield m
+
+    def test_include_attaches_children_to_models(self, client, mock_request):
+        mock_request.get(f"{BASE_URL}/products", headers=JSON_HEADERS, json={"data": [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]})
+        mock_request.get(f"{BASE_URL}/products/1/variants", headers=JSON_HEADERS, json={"data": [{"id": 10, "sku": "a-1"}]})
+        mock_request.get(f"{BASE_URL}/products/2/variants", headers=JSON_HEADERS, json={"data": []})
+        products = ProductsCrud(client)
+        products.variants = VariantsCrud(client, parent=products)
+
+        result = products.list(include=["variants"])
+        assert [[variant.sku for variant in product.variants] for product in result] == [["a-1"], []]
+        assert mock_request.call_count == 3
+
+    def test_include_leaves_cached_items_unchanged_and_reuses_threads(self, client, mock_request):
+        mock_request.get(f"{BASE_URL}/products", headers=JSON_HEADERS, json=[{"id": 1, "name": "a"}])
+        mock_request.get(f"{BASE_URL}/products/1/variants", headers=JSON_HEADERS, json=[{"id": 10, "sku": "a-1"}])
+        products = ProductsCrud(client, cache=EntityCache())
+        products.variants = VariantsCrud(client, parent=products)
+
+        assert [variant.sku for variant in products.list(include=["variants"])[0].variants] == ["a-1"]
+        assert products.cache.get("/products/1").variants == []
+        executor = client._thread_pool("include", products._include_max_workers)
+        products.list(include=["variants"])
+        assert client._thread_pools == {f"include-{products._include_max_workers}": executor}
+
+    def test_include_attaches_children_to_dicts(self, client, mock_request):
+        mock_request.get(f"{BASE_URL}/products", headers=JSON_HEADERS, json=[{"id": 1}])
+        mock_request.get(f"{BASE_URL}/products/1/variants", headers=JSON_HEADERS, json=[{"id": 10}])
+        products = RawProductsCrud(client)
+        products.variants = RawVariantsCrud(client, parent=products)
+
+        assert products.list(include=["variants"]) == [{"id": 1, "variants": [{"id": 10}]}]
+
+    def test_include_uses_child_cache_and_store(self, client, mock_request, tmp_path):
+        mock_request.get(f"{BASE_URL}/products", headers=JSON_HEADERS, json=[{"id": 1}])
+        mock_request.get(f"{BASE_URL}/products/1/variants", headers=JSON_HEADERS, json=[{"id": 10}])
+        products = RawProductsCrud(client)
+        products.variants = RawVariantsCrud(client, parent=products, cache=EntityCache(), store=SQLiteStore(str(tmp_path / "store.db")))
+
+        products.list(include=["variants"])
+        products.list(include=["variants"])
+        assert [request.path for request in mock_request.request_history].count("/v1/products/1/variants") == 1
+        assert products.variants.cache.get("/products/1/variants/10") == {"id": 10}
+
+    def test_include_rejects_unknown_and_disallowed(self, client, mock_request):
+        products = RawProductsCrud(client)
+        products.variants = ReadOnlyVariantsCrud(client, parent=products)
+
+        with pytest.raises(ValueError, match="not a child resource"):
+            products.list(include=["missing"])
+        with pytest.raises(ValueError, match="does not allow list"):
+            products.list(include=["variants"])
+        assert mock_request.call_count == 0
+
+
+class TestCrudClassMetadata:
+    def test_disallowed_methods_resolved_per_class(self):
+        assert ReadOnlyVariantsCrud.list is None
+        assert ReadOnlyVariantsCrud.read is Crud.read
+        assert "list" not in vars(ReadOnlyVariantsCrud(Client(MockClientConfig()), parent=RawProductsCrud(Client(MockClientConfig()))))
+
+    def test_subclass_can_allow_methods_again(self):
+        class AllVariantsCrud(ReadOnlyVariantsCrud):
+            _methods = ["*"]
+
+        class CustomListCrud(ReadOnlyVariantsCrud):
+            _methods = ["list"]
+
+            def list(self, *args, **kwargs):
+                return "custom"
+
+        assert AllVariantsCrud.list is Crud.list
+        assert AllVariantsCrud._allowed_methods == frozenset(["list", "create", "read", "update", "partial_update", "destroy"])
+        assert CustomListCrud.list is vars(CustomListCrud)["list"]
+        assert CustomListCrud.read is None
+
+    def test_compiled_list_metadata(self):
+        assert ItemsCrud._list_keys == ("data", "results", "items")
+        assert ItemsCrud._list_adapter is not None
+        assert RawItemsCrud._list_adapter is None
+        items = ItemsCrud(Client(MockClientConfig()))._convert_to_list_model(ITEMS)
+        assert [item.created for item in items] == [date(2024, 1, 1), date(2024, 1, 2)]
+
+
+class TenantItemsCrud(RawItemsCrud):
+    _endpoint_prefix_template = ("companies", "{company}")
+
+
+class TenantNotesCrud(RawItemsCrud):
+    _resource_path = "notes"
+    _parent_resource = TenantItemsCrud
+
+
+class TestCrudBind:
+    @pytest.fixture
+    def client(self):
+        return Client(MockClientConfig())
+
+    @pytest.fixture
+    def mock_request(self):
+        with requests_mock.Mocker() as m:
+            yield m
+
+    def test_bound_views_are_independent(self, client, mock_request):
+        mock_request.get(f"{BASE_URL}/companies/a/items/1", headers=JSON_HEADERS, json={"id": 1, "tenant": "a"})
+        mock_request.get(f"{BASE_URL}/companies/b/items/1", headers=JSON_HEADERS, json={"id": 1, "tenant": "b"})
+        crud = TenantItemsCrud(client)
+
+        view_a = crud.bind(company="a")
+        view_b = crud.bind(company="b")
+        assert view_a.read("1")["tenant"] == "a"
+        assert view_b.read("1")["tenant"] == "b"
+        assert view_a.client is crud.client
+        assert crud._bindings == {}
+
+    def test_views_share_etags(self, client, mock_request):
+        mock_request.get(f"{BASE_URL}/companies/a/items/1", headers={**JSON_HEADERS, "ETag": '"v1"'}, json={"id": 1})
+        mock_request.put(f"{BASE_URL}/companies/a/items/1", headers=JSON_HEADERS, json={"id": 1})
+        crud = TenantItemsCrud(client)
+        reader, writer = crud.bind(company="a"), crud.bind(company="a")
+
+        reader.read("1")
+        writer.update("1", {"name": "x"})
+        assert mock_request.last_request.headers["If-Match"] == '"v1"'
+
+    def test_binding_a_child_binds_its_parents(self, client):
+        items = TenantItemsCrud(client)
+        notes = TenantNotesCrud(client, parent=items)
+
+        view = notes.bind(company="a")
+        assert view._get_endpoint(parent_args=("1",)) == "/companies/a/items/1/notes"
+        assert items._bindings == {}
+
+    def test_include_through_bound_view(self, client, mock_request):
+        mock_request.get(f"{BASE_URL}/companies/a/items", headers=JSON_HEADERS, json=[{"id": 1}])
+        mock_request.get(f"{BASE_URL}/companies/a/items/1/notes", headers=JSON_HEADERS, json=[{"id": 5}])
+        items = TenantItemsCrud(client)
+        items.notes = TenantNotesCrud(client, parent=items)
+
+        view = items.bind(company="a")
+        assert view.list(include=["notes"]) == [{"id": 1, "notes": [{"id": 5}]}]
+        assert items.notes._parent is items
+        notes_view = items.notes.bind(company="a")
+        assert notes_view._parent.notes is notes_view
+
+    def test_unbound_and_unknown_variables(self, client):
+        crud = TenantItemsCrud(client)
+
+        with pytest.raises(ValueError, match="not bound to 'company'"):
+            crud._get_endpoint()
+        with pytest.raises(ValueError, match="no endpoint prefix variables"):
+            crud.bind(account="x")
+        with pytest.raises(TypeError):
+            crud.bind(company="a")._bindings["company"] = "b"
+
+
+class TestCrudValidationPool:
+    @pytest.fixture
+    def client(self):
+        return Client(MockClientConfig())
+
+    @pytest.fixture
+    def mock_request(self):
+        with requests_mock.Mocker() as m:
+            yield m
+
+    def test_iter_all_and_list_use_pool(self, client, mock_request):
+        mock_request.get(f"{BASE_URL}/items", headers=JSON_HEADERS, json={"data": ITEMS, "_links": {"next": {"href": f"{BASE_URL}/items?page=2"}}})
+        mock_request.get(f"{BASE_URL}/items?page=2", headers=JSON_HEADERS, json={"data": ITEMS, "_links": {"next": None}})
+        cache = EntityCache()
+
+        with ProcessValidationPool(max_workers=1, min_bytes=1) as pool:
+            crud = ItemsCrud(client, cache=cache, validation_pool=pool)
+            items = list(crud.iter_all())
+            assert [item.id for item in items] == [1, 2, 1, 2]
+            assert cache.get("/items/2").created == date(2024, 1, 2)
+            assert [item.name for item in crud.list()] == ["first", "second"]
+
+
+class TestCrudBatch:
+    @pytest.fixture
+    def client(self):
+        return Client(MockClientConfig())
+
+    @pytest.fixture
+    def mock_request(self):
+        with requests_mock.Mocker() as m:
+            yield m
+
+    def test_operations_are_packed_and_mapped_back(self, client, mock_request):
+        def batch_response(request, context):
+            return {"results": [{"id": index, **(operation.get("data") or {})} for index, operation in enumerate(request.json()["operations"])]}
+
+        mock_request.post(f"{BASE_URL}/items/batch", headers=JSON_HEADERS, json=batch_response)
+
+        with RawItemsCrud(client).batch(max_size=2) as batch:
+            futures = [batch.create({"name": name}) for name in ["a", "b", "c"]]
+            destroyed = batch.destroy("9")
+
+        assert [future.result()["name"] for future in futures] == ["a", "b", "c"]
+        assert destroyed.result() == {"id": 1}
+        assert mock_request.call_count == 2
+        assert mock_request.request_history[1].json() == {"operations": [{"op": "create", "data": {"name": "c"}}, {"op": "destroy", "id": "9"}]}
+
+    def test_item_errors_and_request_errors(self, client, mock_request):
+        mock_request.post(
+            f"{BASE_URL}/items/batch",
+            [
+                {"headers": JSON_HEADERS, "json": [{"error": "duplicate"}, ITEMS[1]]},
+                {"status_code": 500, "headers": JSON_HEADERS, "json": {}},
+            ],
+        )
+        cache = EntityCache()
+
+        batch = ItemsCrud(client, cache=cache).batch()
+        failed, updated = batch.create({"name": "a"}), batch.update("2", ITEMS[1])
+        batch.flush()
+        lost = batch.create({"name": "b"})
+        batch.flush()
+
+        with pytest.raises(BatchItemError, match="duplicate"):
+            failed.result()
+        assert updated.result().name == "second"
+        assert cache.get("/items/2").name == "second"
+        with pytest.raises(requests.HTTPError):
+            lost.result()
+
+    def test_exception_in_block_cancels_pending(self, client, mock_request):
+        with pytest.raises(RuntimeError):
+            with RawItemsCrud(client).batch() as batch:
+                future = batch.create({"name": "a"})
+                raise RuntimeError("abort")
+        assert future.cancelled()
+        assert mock_request.call_count == 0
+
+    def test_zero_max_size_is_rejected(self, client):
+        assert RawItemsCrud(client).batch().max_size == RawItemsCrud._batch_size
+        with pytest.raises(ValueError, match="max_size must be at least 1"):
+            RawItemsCrud(client).batch(max_size=0)
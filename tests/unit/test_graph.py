@@ -0,0 +1,96 @@
+import json
+import threading
+import time
+
+import pytest
+import requests_mock
+
+from crudclient.client import Client
+from crudclient.crud import Crud
+from crudclient.exceptions import OperationGraphError
+from crudclient.graph import OperationGraph
+from crudclient.transport import WSGITransport
+
+from .test_config import MockClientConfig
+
+BASE_URL = "https://api.example.com/v1"
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class CompaniesCrud(Crud[dict]):
+    _resource_path = "companies"
+
+
+class ContactsCrud(Crud[dict]):
+    _resource_path = "contacts"
+
+
+class TestOperationGraph:
+    @pytest.fixture
+    def client(self):
+        return Client(MockClientConfig())
+
+    @pytest.fixture
+    def mock_request(self):
+        with requests_mock.Mocker() as m:
+            yield m
+
+    def test_dependents_receive_results_and_run_concurrently(self):
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def app(environ, start_response):
+            # requests_mock serializes requests, so an in-process WSGI app stands in for the API
+            method, path = environ["REQUEST_METHOD"], environ["PATH_INFO"]
+            body = json.loads(environ["wsgi.input"].read(int(environ["CONTENT_LENGTH"] or 0)) or b"{}")
+            if path == "/v1/contacts/7":
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.05)
+                with lock:
+                    active[0] -= 1
+                result = {"id": body["name"]}
+            else:
+                result = {"id": 7, **body} if method == "PATCH" else {"id": 7}
+            start_response("200 OK", [("Content-Type", "application/json")])
+            return [json.dumps(result).encode()]
+
+        client = Client(MockClientConfig(), transport=WSGITransport(app))
+        companies, contacts = CompaniesCrud(client), ContactsCrud(client)
+
+        graph = OperationGraph(max_workers=4)
+        company = graph.add(companies, "create", {"name": "acme"})
+        created = [graph.add(contacts, "create", {"name": f"c{i}"}, parent_id=company.ref("id")) for i in range(4)]
+        ready = graph.add(companies, "partial_update", company.ref("id"), {"ready": True}, after=created)
+        results = graph.run()
+
+        assert results[0] == {"id": 7}
+        assert [operation.result()["id"] for operation in created] == ["c0", "c1", "c2", "c3"]
+        assert ready.result() == {"id": 7, "ready": True}
+        assert peak[0] > 1
+
+    def test_failure_skips_dependents(self, client, mock_request):
+        mock_request.post(f"{BASE_URL}/companies", status_code=500, headers=JSON_HEADERS, json={})
+        mock_request.get(f"{BASE_URL}/companies", headers=JSON_HEADERS, json=[])
+        companies = CompaniesCrud(client)
+
+        graph = OperationGraph()
+        company = graph.add(companies, "create", {"name": "acme"})
+        dependent = graph.add(companies, "read", company.ref("id"))
+        independent = graph.add(companies, "list")
+
+        with pytest.raises(OperationGraphError) as exc_info:
+            graph.run()
+        assert set(exc_info.value.failures) == {company, dependent}
+        assert independent.result() == []
+        with pytest.raises(OperationGraphError, match="skipped"):
+            dependent.result()
+
+    def test_add_validates_method_and_graph(self, client):
+        graph, other = OperationGraph(), OperationGraph()
+        foreign = other.add(CompaniesCrud(client), "list")
+
+        with pytest.raises(ValueError, match="does not belong"):
+            graph.add(CompaniesCrud(client), "read", foreign.ref("id"))
+        with pytest.raises(ValueError, match="not allowed"):
+            graph.add(CompaniesCrud(client), "missing")
@@ -0,0 +1,49 @@
+import subprocess
+import sys
+
+import crudclient
+
+
+def _run(code):
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.strip()
+
+
+class TestLazyImports:
+    def test_config_does_not_import_heavy_dependencies(self):
+        output = _run(
+            "import sys\n"
+            "from crudclient import ClientConfig\n"
+            "print(sorted(name for name in ('requests', 'pydantic', 'crudclient.client', 'crudclient.crud') if name in sys.modules))"
+        )
+        assert output == "[]"
+
+    def test_import_time_stays_small(self):
+        # Guards against eager imports creeping back: `python -X importtime` lists every module imported
+        stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import crudclient"], capture_output=True, text=True, check=True).stderr
+        imported = {line.rsplit("|", 1)[-1].strip() for line in stderr.splitlines()[1:]}
+        assert not {"requests", "pydantic", "urllib3"} & imported
+
+    def test_client_import_skips_optional_features(self):
+        # The store, validation pool, uploads and spilling are imported when they are used, not with the client
+        stderr = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import crudclient.client"], capture_output=True, text=True, check=True
+        ).stderr
+        imported = {line.rsplit("|", 1)[-1].strip() for line in stderr.splitlines()[1:]}
+        assert "crudclient.client" in imported
+        optional = {
+            "pydantic",
+            "sqlite3",
+            "multiprocessing",
+            "crudclient.spill",
+            "crudclient.store",
+            "crudclient.upload",
+            "crudclient.validation_pool",
+        }
+        assert not optional & imported
+
+    def test_all_names_resolve(self):
+        for name in crudclient.__all__:
+            assert getattr(crudclient, name) is not None
+        assert set(crudclient.__all__) <= set(dir(crudclient))
+        assert sorted(crudclient.__all__) == sorted(crudclient._LAZY_ATTRIBUTES)
+        assert crudclient.Crud is __import__("crudclient.crud", fromlist=["Crud"]).Crud
@@ -0,0 +1,67 @@
+from typing import Optional
+
+import pytest
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from crudclient.models import RoleBasedModel, partial_model
+
+
+class Contact(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: int
+    name: str
+    email: Optional[str] = None
+    customer_number: int = Field(..., alias="customerNumber")
+
+
+class TestPartialModel:
+    def test_keeps_only_requested_fields(self):
+        model = partial_model(Contact, ("id", "name"))
+        assert list(model.model_fields) == ["id", "name"]
+        assert model(id=1, name="Acme").name == "Acme"
+
+    def test_accepts_aliases(self):
+        model = partial_model(Contact, ("customerNumber",))
+        assert model.model_validate({"customerNumber": 10}).customer_number == 10
+        assert model.model_config.get("populate_by_name") is True
+
+    def test_is_cached(self):
+        assert partial_model(Contact, ("id",)) is partial_model(Contact, ("id",))
+
+    def test_unknown_field(self):
+        with pytest.raises(ValueError):
+            partial_model(Contact, ("id", "missing"))
+
+
+class RoleContact(RoleBasedModel):
+    id: Optional[int] = Field(None, json_schema_extra={"methods": {"create": "unallowed", "update": "required"}})
+    name: Optional[str] = Field(None, alias="fullName", json_schema_extra={"methods": {"create": "required"}})
+    email: Optional[str] = None
+
+
+class TestRoleBasedModel:
+    def test_rules_are_compiled_per_role(self):
+        assert set(RoleContact._role_rules) == {"create", "update"}
+        assert [name for _, name, _ in RoleContact._role_rules["create"]] == ["id", "name"]
+
+    def test_required_and_unallowed(self):
+        with pytest.raises(ValidationError, match="'id' is not allowed in 'create'"):
+            RoleContact.model_validate({"_role": "create", "id": 1, "fullName": "Acme"})
+        with pytest.raises(ValidationError, match="'name' is required for 'create'"):
+            RoleContact.model_validate({"_role": "create", "fullName": None})
+        with pytest.raises(ValidationError, match="'id' is required for 'update'"):
+            RoleContact.model_validate({"_role": "update", "id": None})
+
+    def test_valid_and_roleless_input(self):
+        assert RoleContact.model_validate({"_role": "create", "fullName": "Acme"}).name == "Acme"
+        assert RoleContact.model_validate({"id": 1, "fullName": None}).id == 1
+        data = {"_role": "update", "id": 2}
+        RoleContact.model_validate(data)
+        assert data == {"_role": "update", "id": 2}
+
+    def test_invalid_rule_is_rejected(self):
+        with pytest.raises(TypeError, match="must be 'required' or 'unallowed'"):
+
+            class BadContact(RoleBasedModel):
+                id: Optional[int] = Field(None, json_schema_extra={"methods": {"create": "forbidden"}})
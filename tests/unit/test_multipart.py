@@ -0,0 +1,51 @@
+import io
+from email.parser import BytesParser
+from email.policy import HTTP
+
+import pytest
+
+from crudclient.multipart import MultipartEncoder
+
+
+def parse(encoder):
+    message = BytesParser(policy=HTTP).parsebytes(f"Content-Type: {encoder.content_type}\r\n\r\n".encode() + encoder.to_bytes())
+    return [
+        (part.get_param("name", header="content-disposition"), part.get_filename(), part.get_content_type(), part.get_payload(decode=True))
+        for part in message.iter_parts()
+    ]
+
+
+def test_encodes_fields_paths_and_file_objects_with_length(tmp_path):
+    path = tmp_path / "report.pdf"
+    path.write_bytes(b"%PDF" * 1000)
+    file = io.BytesIO(b"skipped header|csv,data")
+    file.seek(15)
+
+    encoder = MultipartEncoder(
+        files={"report": path, "table": ("table.csv", file), "raw": ("raw.bin", b"\x00\x01", "application/x-raw")},
+        data={"description": "Q1", "tags": ["a", "b"]},
+        chunk_size=1024,
+    )
+
+    body = encoder.to_bytes()
+    assert encoder.len == len(body)
+    assert all(len(chunk) <= 1024 * 2 for chunk in encoder)
+    assert parse(encoder) == [
+        ("description", None, "text/plain", b"Q1"),
+        ("tags", None, "text/plain", b"a"),
+        ("tags", None, "text/plain", b"b"),
+        ("report", "report.pdf", "application/pdf", b"%PDF" * 1000),
+        ("table", "table.csv", "text/csv", b"csv,data"),
+        ("raw", "raw.bin", "application/x-raw", b"\x00\x01"),
+    ]
+    # Seekable contents can be sent again, e.g. on a retry
+    assert encoder.to_bytes() == body
+
+
+def test_generators_have_no_length_and_are_single_use():
+    encoder = MultipartEncoder(files={"log": ("log.txt", (line for line in [b"one\n", "two\n"]))})
+
+    assert encoder.len is None
+    assert parse(encoder)[0][3] == b"one\ntwo\n"
+    with pytest.raises(RuntimeError):
+        encoder.to_bytes()
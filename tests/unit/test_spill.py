@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from crudclient.spill import SpilledBody, _JSONStream
+
+
+def test_spilled_body_gives_mapped_access(tmp_path):
+    body = SpilledBody.from_chunks([b'{"items": ', b"[1, 2, 3]}"], directory=str(tmp_path), content_type="application/json", encoding="utf-8")
+
+    assert len(body) == 20
+    assert bytes(body) == b'{"items": [1, 2, 3]}'
+    assert body.json() == {"items": [1, 2, 3]}
+    assert body.text() == '{"items": [1, 2, 3]}'
+    assert b"".join(body.iter_chunks(4)) == bytes(body)
+    view = body.buffer()
+    assert bytes(view[:9]) == b'{"items":'
+    view.release()
+
+    target = tmp_path / "saved.json"
+    body.save(str(target))
+    assert target.read_bytes() == bytes(body)
+
+    body.close()
+    assert "closed" in repr(body)
+    with pytest.raises(ValueError):
+        bytes(body)
+
+
+def test_from_chunks_closes_file_on_error(tmp_path):
+    def chunks():
+        yield b"partial"
+        raise ConnectionError("reset")
+
+    with pytest.raises(ConnectionError):
+        SpilledBody.from_chunks(chunks(), directory=str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        {"data": [{"id": 1, "name": "æøå €"}, {"id": 2, "price": 12345.678, "tags": []}], "next": None, "count": 1234567},
+        [1, -0.5, "x" * 50, {"nested": [True, False, None]}, [], {}],
+        {},
+        [],
+        "text",
+        1234567890,
+    ],
+)
+def test_json_is_parsed_incrementally(tmp_path, document):
+    raw = json.dumps(document, ensure_ascii=False, indent=1).encode("utf-8")
+    body = SpilledBody.from_chunks([raw], directory=str(tmp_path), encoding="utf-8")
+
+    with body:
+        for chunk_size in (1, 3, 7, 1024):
+            assert body.json(chunk_size=chunk_size) == document
+
+
+def test_json_buffer_stays_bounded_for_nested_lists(tmp_path, monkeypatch):
+    document = {"data": [{"id": i, "name": f"row {i}", "tags": [f"tag {i}"]} for i in range(5000)], "meta": {"count": 5000}}
+    raw = json.dumps(document).encode("utf-8")
+    sizes = []
+    fill = _JSONStream._fill
+
+    def recording_fill(self, size):
+        fill(self, size)
+        sizes.append(len(self._buffer))
+
+    monkeypatch.setattr(_JSONStream, "_fill", recording_fill)
+    with SpilledBody.from_chunks([raw], directory=str(tmp_path)) as body:
+        assert body.json(chunk_size=1024) == document
+    assert len(raw) > 200 * 1024
+    assert max(sizes) < 4 * 1024
+
+
+@pytest.mark.parametrize("raw", [b'{"a": 1,}', b"[1 2]", b'{"a" 1}', b"[1, 2", b"[1] 2", b"{1: 2}"])
+def test_invalid_json_is_rejected(tmp_path, raw):
+    with SpilledBody.from_chunks([raw], directory=str(tmp_path)) as body:
+        with pytest.raises(json.JSONDecodeError):
+            body.json(chunk_size=2)
@@ -0,0 +1,61 @@
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from crudclient.store import SQLiteStore
+
+
+class TestSQLiteStore:
+    @pytest.fixture
+    def store(self, tmp_path):
+        return SQLiteStore(str(tmp_path / "store.db"), ttl=60)
+
+    def test_get_and_set(self, store):
+        store.set("/users/1", {"id": 1, "name": "Ada"})
+        assert store.get("/users/1") == {"id": 1, "name": "Ada"}
+        assert store.get("/users/2") is None
+
+    def test_ttl_expiry(self, store):
+        with patch("crudclient.store.time.time", return_value=1000.0):
+            store.set("/users/1", {"id": 1})
+            store.set("/users/2", {"id": 2}, ttl=300)
+        with patch("crudclient.store.time.time", return_value=1100.0):
+            assert store.get("/users/1") is None
+            assert store.get("/users/2") == {"id": 2}
+            store.purge_expired()
+        with patch("crudclient.store.time.time", return_value=0.0):
+            assert store.get("/users/1") is None
+
+    def test_invalidate_prefix(self, store):
+        store.set("/users?", [{"id": 1}])
+        store.set("/users?page=2", [{"id": 2}])
+        store.set("/users/1", {"id": 1})
+        store.set("/users_archive?", [])
+        store.invalidate_prefix("/users?")
+        assert store.get("/users?") is None
+        assert store.get("/users?page=2") is None
+        assert store.get("/users/1") == {"id": 1}
+        assert store.get("/users_archive?") == []
+
+    def test_shared_between_instances(self, tmp_path):
+        path = str(tmp_path / "store.db")
+        SQLiteStore(path).set("/users/1", {"id": 1})
+        other = SQLiteStore(path)
+        assert other.get("/users/1") == {"id": 1}
+        other.invalidate("/users/1")
+        other.clear()
+        assert SQLiteStore(path).get("/users/1") is None
+
+    def test_etag_and_old_table_migration(self, tmp_path):
+        path = str(tmp_path / "store.db")
+        connection = sqlite3.connect(path)
+        with connection:
+            connection.execute("CREATE TABLE crudclient_store (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)")
+        connection.close()
+
+        store = SQLiteStore(path)
+        store.set("/users/1", {"id": 1}, etag='"v1"')
+        store.set("/users/2", {"id": 2})
+        assert store.get_etag("/users/1") == '"v1"'
+        assert store.get_etag("/users/2") is None
@@ -0,0 +1,33 @@
+import pytest
+
+from crudclient.sync import FileSyncStateStore, MemorySyncStateStore, SQLiteSyncStateStore
+
+
+class TestSyncStateStores:
+    @pytest.fixture(params=["memory", "file", "sqlite"])
+    def store(self, request, tmp_path):
+        if request.param == "memory":
+            return MemorySyncStateStore()
+        if request.param == "file":
+            return FileSyncStateStore(str(tmp_path / "state.json"))
+        return SQLiteSyncStateStore(str(tmp_path / "state.db"))
+
+    def test_get_missing(self, store):
+        assert store.get("/contacts") is None
+
+    def test_set_and_overwrite(self, store):
+        store.set("/contacts", "2024-01-01T00:00:00")
+        store.set("/contacts", "2024-02-01T00:00:00")
+        store.set("/users", "cursor-1")
+        assert store.get("/contacts") == "2024-02-01T00:00:00"
+        assert store.get("/users") == "cursor-1"
+
+    def test_file_store_persists(self, tmp_path):
+        path = str(tmp_path / "state.json")
+        FileSyncStateStore(path).set("/contacts", "mark")
+        assert FileSyncStateStore(path).get("/contacts") == "mark"
+
+    def test_sqlite_store_persists(self, tmp_path):
+        path = str(tmp_path / "state.db")
+        SQLiteSyncStateStore(path).set("/contacts", "mark")
+        assert SQLiteSyncStateStore(path).get("/contacts") == "mark"
@@ -0,0 +1,131 @@
+import json
+import time
+
+import pytest
+import requests
+import requests_mock
+
+from crudclient.client import Client
+from crudclient.transport import ASGITransport, RecordingTransport, ReplayTransport, WSGITransport
+
+from .test_config import MockClientConfig
+
+BASE_URL = "https://api.example.com/v1"
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class TestTransport:
+    @pytest.fixture
+    def recording(self, tmp_path):
+        path = str(tmp_path / "recording.jsonl")
+        adapter = requests_mock.Adapter()
+        adapter.register_uri(
+            "GET", f"{BASE_URL}/items", [{"json": [{"id": 1}], "headers": JSON_HEADERS}, {"json": [{"id": 2}], "headers": JSON_HEADERS}]
+        )
+        adapter.register_uri("POST", f"{BASE_URL}/items", json={"id": 3}, status_code=201, headers=JSON_HEADERS)
+        adapter.register_uri("GET", f"{BASE_URL}/missing", status_code=404, text="not found")
+
+        client = Client(MockClientConfig(), transport=RecordingTransport(path, adapter=adapter))
+        assert client.get("items") == [{"id": 1}]
+        assert client.get("items") == [{"id": 2}]
+        assert client.post("items", json={"name": "x"}) == {"id": 3}
+        with pytest.raises(requests.HTTPError):
+            client.get("missing")
+        return path
+
+    def test_replay_serves_recorded_responses_in_turn(self, recording):
+        client = Client(MockClientConfig(), transport=ReplayTransport(recording))
+
+        assert client.get("items") == [{"id": 1}]
+        assert client.get("items") == [{"id": 2}]
+        assert client.get("items") == [{"id": 1}]
+        assert client.post("items", json={"name": "x"}) == {"id": 3}
+        with pytest.raises(requests.HTTPError):
+            client.get("missing")
+
+    def test_replay_matches_body_and_rejects_unknown_requests(self, recording):
+        client = Client(MockClientConfig(), transport=ReplayTransport(recording))
+
+        with pytest.raises(requests.ConnectionError, match="No recorded response"):
+            client.post("items", json={"name": "other"})
+        with pytest.raises(requests.ConnectionError):
+            client.get("unknown")
+
+    def test_replay_latency_and_seeded_jitter(self, recording):
+        first = ReplayTransport(recording, latency=0.01, jitter=0.005, seed=7)
+        second = ReplayTransport(recording, latency=0.01, jitter=0.005, seed=7)
+        assert [first._delay() for _ in range(5)] == [second._delay() for _ in range(5)]
+
+        client = Client(MockClientConfig(), transport=ReplayTransport(recording, latency=0.02))
+        start = time.perf_counter()
+        client.get("items")
+        assert time.perf_counter() - start >= 0.02
+
+
+def wsgi_app(environ, start_response):
+    body = environ["wsgi.input"].read(int(environ["CONTENT_LENGTH"] or 0))
+    payload = {
+        "method": environ["REQUEST_METHOD"],
+        "path": environ["PATH_INFO"],
+        "query": environ["QUERY_STRING"],
+        "auth": environ.get("HTTP_AUTHORIZATION"),
+        "content_type": environ.get("CONTENT_TYPE"),
+        "body": body.decode(),
+    }
+    status = "404 Not Found" if environ["PATH_INFO"].endswith("/missing") else "200 OK"
+    start_response(status, [("Content-Type", "application/json"), ("Set-Cookie", "a=1"), ("Set-Cookie", "b=2")])
+    return [json.dumps(payload).encode()]
+
+
+async def asgi_app(scope, receive, send):
+    message = await receive()
+    headers = dict(scope["headers"])
+    payload = {
+        "method": scope["method"],
+        "path": scope["path"],
+        "query": scope["query_string"].decode(),
+        "auth": headers.get(b"authorization", b"").decode(),
+        "body": message["body"].decode(),
+    }
+    status = 404 if scope["path"].endswith("/missing") else 201
+    await send({"type": "http.response.start", "status": status, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": json.dumps(payload).encode()[:5], "more_body": True})
+    await send({"type": "http.response.body", "body": json.dumps(payload).encode()[5:]})
+
+
+class TestInProcessTransports:
+    def test_wsgi_transport(self):
+        client = Client(MockClientConfig(), transport=WSGITransport(wsgi_app))
+
+        response = client.get("items", params={"page": 2})
+        assert response["method"] == "GET"
+        assert response["path"] == "/v1/items"
+        assert response["query"] == "page=2"
+        assert response["auth"] == "Bearer mykey"
+        assert client.last_response.headers["Set-Cookie"] == "a=1, b=2"
+
+        response = client.post("items", json={"name": "x"})
+        assert response["content_type"] == "application/json"
+        assert json.loads(response["body"]) == {"name": "x"}
+        with pytest.raises(requests.HTTPError):
+            client.get("missing")
+
+    def test_wsgi_transport_script_name(self):
+        client = Client(MockClientConfig(), transport=WSGITransport(wsgi_app, script_name="/v1"))
+        assert client.get("items")["path"] == "/items"
+
+    def test_asgi_transport(self):
+        transport = ASGITransport(asgi_app)
+        client = Client(MockClientConfig(), transport=transport)
+        try:
+            response = client.post("items", json={"name": "x"})
+            assert response["method"] == "POST"
+            assert response["path"] == "/v1/items"
+            assert response["auth"] == "Bearer mykey"
+            assert json.loads(response["body"]) == {"name": "x"}
+            assert client.last_response.status_code == 201
+            assert client.last_response.reason == "Created"
+            with pytest.raises(requests.HTTPError):
+                client.get("missing")
+        finally:
+            transport.close()
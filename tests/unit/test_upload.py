@@ -0,0 +1,149 @@
+import json
+import os
+import threading
+
+import pytest
+import requests
+
+from crudclient.client import Client
+from crudclient.crud import Crud
+from crudclient.transport import WSGITransport
+from crudclient.upload import TusUploadProtocol
+
+from .test_config import MockClientConfig
+
+
+class DocumentsCrud(Crud[dict]):
+    _resource_path = "documents"
+
+
+class TusDocumentsCrud(Crud[dict]):
+    _resource_path = "documents"
+    _upload_protocol = TusUploadProtocol()
+
+
+def respond(start_response, status, body=None, headers=()):
+    if body is None:
+        start_response(status, list(headers))
+        return []
+    start_response(status, [("Content-Type", "application/json"), *headers])
+    return [json.dumps(body).encode()]
+
+
+class MultipartServer:
+    """In-process multipart upload API; `failures` maps part numbers to statuses returned once each."""
+
+    def __init__(self, failures=None):
+        self.failures = failures or {}
+        self.parts = {}
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        method, path = environ["REQUEST_METHOD"], environ["PATH_INFO"].split("/")[2:]
+        body = environ["wsgi.input"].read(int(environ["CONTENT_LENGTH"] or 0))
+        with self.lock:
+            self.requests.append((method, "/".join(path)))
+        if method == "POST" and path == ["documents", "uploads"]:
+            return respond(start_response, "201 Created", {"upload_id": "u1", **json.loads(body)})
+        if method == "PUT" and path[3] == "parts":
+            number = int(path[4])
+            with self.lock:
+                statuses = self.failures.get(number)
+                status = statuses.pop(0) if statuses else None
+            if status:
+                return respond(start_response, status, {"error": "failed"})
+            self.parts[number] = body
+            return respond(start_response, "200 OK", {}, [("ETag", f'"etag-{number}"')])
+        if method == "POST" and path[3] == "complete":
+            parts = json.loads(body)["parts"]
+            assert [part["etag"] for part in parts] == [f'"etag-{number}"' for number in range(1, len(parts) + 1)]
+            content = b"".join(self.parts[part["number"]] for part in parts)
+            return respond(start_response, "201 Created", {"id": "d1", "size": len(content), "content": content.decode()})
+        return respond(start_response, "404 Not Found", {})
+
+
+class TusServer:
+    """In-process tus server that fails one PATCH with 503 after storing its first `limit` bytes."""
+
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.content = b""
+
+    def __call__(self, environ, start_response):
+        method = environ["REQUEST_METHOD"]
+        assert environ["HTTP_TUS_RESUMABLE"] == "1.0.0"
+        if method == "POST":
+            self.length = int(environ["HTTP_UPLOAD_LENGTH"])
+            return respond(start_response, "201 Created", headers=[("Location", "/files/abc")])
+        if method == "HEAD":
+            return respond(start_response, "200 OK", headers=[("Upload-Offset", str(len(self.content)))])
+        assert int(environ["HTTP_UPLOAD_OFFSET"]) == len(self.content)
+        body = environ["wsgi.input"].read(int(environ["CONTENT_LENGTH"]))
+        if self.limit is not None and len(body) > self.limit:
+            self.content += body[: self.limit]
+            self.limit = None
+            return respond(start_response, "503 Service Unavailable", {})
+        self.content += body
+        return respond(start_response, "204 No Content", headers=[("Upload-Offset", str(len(self.content)))])
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "scan.txt"
+    path.write_bytes(b"".join(bytes([65 + index]) * 10 for index in range(10)))
+    return path
+
+
+def test_multipart_upload_retries_parts_in_parallel(source):
+    server = MultipartServer(failures={2: ["503 Service Unavailable"]})
+    documents = DocumentsCrud(Client(MockClientConfig(), transport=WSGITransport(server)))
+
+    document = documents.upload(source, part_size=16, max_workers=4, retry_backoff=0)
+    assert document == {"id": "d1", "size": 100, "content": source.read_text()}
+    assert server.requests[0] == ("POST", "documents/uploads")
+    assert server.requests.count(("PUT", "documents/uploads/u1/parts/2")) == 2
+
+
+def test_interrupted_upload_resumes_from_checkpoint(source, tmp_path):
+    checkpoint = tmp_path / "scan.upload"
+    server = MultipartServer(failures={5: ["400 Bad Request"]})
+    client = Client(MockClientConfig(), transport=WSGITransport(server))
+
+    with pytest.raises(requests.HTTPError):
+        client.upload("documents/uploads", source, checkpoint=checkpoint, part_size=16, max_workers=1)
+    assert sorted(json.loads(checkpoint.read_text())["parts"]) == ["1", "2", "3", "4"]
+
+    server.requests.clear()
+    result = client.upload("documents/uploads", source, checkpoint=checkpoint, part_size=16, max_workers=1)
+    assert result["content"] == source.read_text()
+    assert [path for method, path in server.requests if method == "PUT"] == [f"documents/uploads/u1/parts/{number}" for number in (5, 6, 7)]
+    assert not os.path.exists(checkpoint)
+
+
+def test_stale_checkpoint_starts_over(source, tmp_path):
+    checkpoint = tmp_path / "scan.upload"
+    checkpoint.write_text(json.dumps({"fingerprint": {"size": 1}, "state": {}, "parts": {"1": {}}}))
+    server = MultipartServer()
+
+    Client(MockClientConfig(), transport=WSGITransport(server)).upload("documents/uploads", source, checkpoint=checkpoint, part_size=64)
+    assert server.requests[0] == ("POST", "documents/uploads")
+    assert len([method for method, _ in server.requests if method == "PUT"]) == 2
+
+
+def test_tus_upload_continues_from_server_offset(source):
+    server = TusServer(limit=5)
+    documents = TusDocumentsCrud(Client(MockClientConfig(), transport=WSGITransport(server)))
+
+    url = documents.upload(source, part_size=32, max_workers=4, retry_backoff=0)
+    assert url == "https://api.example.com/files/abc"
+    assert server.content == source.read_bytes()
+
+
+def test_parts_are_not_retried_by_the_client(source):
+    server = MultipartServer(failures={1: ["503 Service Unavailable"] * 3})
+    client = Client(MockClientConfig(), transport=WSGITransport(server))
+
+    with pytest.raises(requests.HTTPError):
+        client.upload("documents/uploads", source, part_size=64, max_workers=1, retries=1, retry_backoff=0)
+    assert server.requests.count(("PUT", "documents/uploads/u1/parts/1")) == 2
@@ -0,0 +1,58 @@
+import json
+from typing import List, Optional
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from crudclient.validation_pool import ProcessValidationPool
+
+
+class Tag(BaseModel):
+    label: str
+
+
+class Row(BaseModel):
+    id: int
+    name: str
+    note: Optional[str] = None
+    tags: List[Tag] = []
+
+
+ROWS = [{"id": i, "name": f"row {i}", "tags": [{"label": f"tag {i}"}]} for i in range(25)]
+CONTENT = json.dumps({"data": ROWS}).encode()
+
+
+class TestProcessValidationPool:
+    @pytest.fixture
+    def pool(self):
+        with ProcessValidationPool(max_workers=2, min_bytes=len(CONTENT)) as pool:
+            yield pool
+
+    def test_large_bodies_are_split_among_workers(self, pool):
+        futures = pool.submit(Row, CONTENT, ("data",))
+        assert len(futures) == 2
+        assert [len(future.result()[1]) for future in futures] == [12, 13]
+        assert pool.envelope(futures) == {}
+        assert [row.id for row in pool.gather(futures)] == list(range(25))
+
+    def test_validates_in_worker_processes_in_order(self, pool):
+        rows = pool.validate(Row, CONTENT, ("data",))
+        assert [row.id for row in rows] == list(range(25))
+        assert all(isinstance(row, Row) and isinstance(row.tags[0], Tag) for row in rows)
+        assert rows[3].tags[0].label == "tag 3"
+        assert rows[0].model_fields_set == {"id", "name", "tags"}
+        assert pool._executor is not None
+
+    def test_small_bodies_are_validated_inline(self, pool):
+        assert pool.validate(Row, json.dumps(ROWS[:5]).encode())[-1].name == "row 4"
+        assert pool._executor is None
+
+    def test_validation_errors_are_raised(self, pool):
+        with pytest.raises(ValidationError):
+            pool.validate(Row, json.dumps({"data": ROWS + [{"id": "x", "name": "bad"}]}).encode(), ("data",))
+        with pytest.raises(ValueError, match="Unexpected response format"):
+            pool.validate(Row, CONTENT, ("items",))
+
+    def test_rejects_unavailable_start_method(self):
+        with pytest.raises(ValueError, match="not available"):
+            ProcessValidationPool(mp_context="teleport")
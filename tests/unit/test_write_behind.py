@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+
+from crudclient.write_behind import WriteBehindQueue
+
+
+class FakeCrud:
+    update = None
+
+    def __init__(self):
+        self.created = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def create(self, data):
+        self.started.set()
+        self.release.wait(timeout=5)
+        if data.get("fail"):
+            raise ValueError("rejected")
+        self.created.append(data)
+        return {"id": len(self.created), **data}
+
+    def destroy(self, resource_id):
+        return None
+
+
+class TestWriteBehindQueue:
+    def test_results_and_flush(self):
+        crud = FakeCrud()
+        with WriteBehindQueue(crud, workers=3) as writes:
+            futures = [writes.create({"n": n}) for n in range(20)]
+        assert len(crud.created) == 20
+        assert sorted(future.result()["n"] for future in futures) == list(range(20))
+
+    def test_errors_are_set_on_future(self):
+        crud = FakeCrud()
+        with WriteBehindQueue(crud, workers=1) as writes:
+            failed = writes.create({"fail": True})
+            ok = writes.destroy("1")
+        with pytest.raises(ValueError):
+            failed.result()
+        assert ok.result() is None
+
+    def test_backpressure_blocks_producer(self):
+        crud = FakeCrud()
+        crud.release.clear()
+        writes = WriteBehindQueue(crud, max_pending=1, workers=1)
+        writes.create({"n": 1})
+        assert crud.started.wait(timeout=5)  # taken by the worker
+        writes.create({"n": 2})  # fills the queue
+
+        producer = threading.Thread(target=writes.create, args=({"n": 3},))
+        producer.start()
+        producer.join(timeout=0.2)
+        assert producer.is_alive()
+
+        crud.release.set()
+        producer.join(timeout=5)
+        writes.flush()
+        writes.close()
+        assert len(crud.created) == 3
+
+    def test_disallowed_method_and_closed_queue(self):
+        writes = WriteBehindQueue(FakeCrud(), workers=1)
+        with pytest.raises(ValueError):
+            writes.update("1", {})
+        writes.close()
+        with pytest.raises(RuntimeError):
+            writes.create({})